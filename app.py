@@ -1,8 +1,57 @@
 # app.py
 
+import importlib
+import os
+import time
 import streamlit as st
 from modules.common import config_manager
-from ui import conduct_summary_tab, profile_management_tab, ranked_hero_stats_tab, playstyle_stats_tab
+
+# Only the selected view is rendered, and its module is imported when it is first
+# selected. Unlike st.tabs, which runs every tab's body on each rerun, the first render
+# loads one view's dependencies and each rerun only does the work of the visible view.
+TAB_MODULES = [
+    ("📊 Behaviour Summary", "ui.conduct_summary_tab"),
+    ("🏆 Ranked Hero Stats", "ui.ranked_hero_stats_tab"),
+    ("🕹️ Playstyle Stats", "ui.playstyle_stats_tab"),
+    ("🩺 Diagnostics", "ui.diagnostics_tab"),
+    ("⚙️ Profile Management", "ui.profile_management_tab"),
+]
+
+# Set by run_app.py so the first render can be timed from the moment the launcher started
+LAUNCH_TIME_ENV = "DOTA2_ANALYTICS_LAUNCHED_AT"
+
+
+def _select_profile() -> str | None:
+    """Renders the sidebar profile selector shared by every view and returns the active profile, if there is one."""
+    config = config_manager.load_config()
+    profile_names = [p['profile_name'] for p in config.get('profiles', [])]
+    if not profile_names:
+        return None
+
+    st.sidebar.header("Dashboard Controls")
+    current_active_profile = config.get('active_profile')
+    try:
+        active_profile_index = profile_names.index(current_active_profile)
+    except ValueError:
+        active_profile_index = 0
+
+    selected_profile = st.sidebar.selectbox(
+        "Select Profile",
+        options=profile_names,
+        index=active_profile_index
+    )
+
+    if selected_profile != current_active_profile:
+        config['active_profile'] = selected_profile
+        config_manager.save_config(config)
+        st.rerun()
+    return selected_profile
+
+
+@st.cache_resource
+def _startup_report() -> dict:
+    """Process-wide record of whether the startup time has been reported (module globals reset on every rerun)."""
+    return {"reported": False}
 
 # --- Page Configuration (Global) ---
 st.set_page_config(
@@ -13,31 +62,19 @@ st.set_page_config(
 
 def main():
     """Main function to run the Streamlit application."""
+    started = time.perf_counter()
     st.title("📊 Dota 2 Analytics Hub")
     
     # Ensure config file exists before proceeding
     config_manager.initialize_config()
 
-    # Create the tabs
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "📊 Behaviour Summary",
-        "🏆 Ranked Hero Stats",
-        "🕹️ Playstyle Stats",
-        "⚙️ Profile Management"
-        ])
-
-    # Render each tab by calling its dedicated function
-    with tab1:
-        conduct_summary_tab.render()
-    
-    with tab2:
-        ranked_hero_stats_tab.render()
-    
-    with tab3:
-        playstyle_stats_tab.render()
-    
-    with tab4:
-        profile_management_tab.render()
+    # The profile selector lives here rather than in a view, so it is there whichever view is shown
+    profile_name = _select_profile()
+
+    # A tab-like view selector; only the selected view's module is imported and rendered
+    modules = dict(TAB_MODULES)
+    selected = st.radio("View", list(modules), horizontal=True, key="active_view", label_visibility="collapsed")
+    importlib.import_module(modules[selected]).render(profile_name)
 
     # --- Footer (Global) ---
     st.sidebar.markdown("---")
@@ -52,5 +89,14 @@ def main():
     "Copyright (C) 2025 Kocha."
     )
 
+    report = _startup_report()
+    if not report["reported"]:
+        report["reported"] = True
+        message = f"🕒 First render finished in {time.perf_counter() - started:.2f}s (including the first view's imports)"
+        launched_at = os.environ.get(LAUNCH_TIME_ENV)
+        if launched_at:
+            message += f", {time.time() - float(launched_at):.2f}s after launch"
+        print(message + ".")
+
 if __name__ == "__main__":
     main()
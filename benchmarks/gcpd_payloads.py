@@ -0,0 +1,170 @@
+# benchmarks/gcpd_payloads.py
+# Synthetic stand-ins for the pages Steam serves under /gcpd/570: the paged AJAX
+# responses of the MatchPlayerReportIncoming and PlayerPlaystyleStats tabs and the
+# GameHeroStandings HTML page. The markup mirrors what the processors see in real
+# downloads (a generic_kv_table with a header row, GMT timestamps, Yes/No flags),
+# and every generator is seeded, so the same arguments always give the same bytes.
+
+import html
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterator, List
+
+CONDUCT_HEADERS = [
+    "Match ID", "Summary Date", "Periodic", "Excessive Reports", "Excessive Abandons",
+    "Match Count", "Positive Matches", "Reported Matches", "Abandoned Matches", "Reports",
+    "Reporting Parties", "Comms Reports", "Comms Reporting Parties", "Commends", "Behavior Score",
+]
+PLAYSTYLE_HEADERS = [
+    "Match ID", "Time", "Hero", "Fight Score", "Farm Score", "Push Score", "Versatility",
+    "Kills", "Deaths", "Assists", "Last Hits", "Denies", "GPM", "XPPM", "Net Worth",
+    "Damage", "Heals",
+]
+HERO_STANDINGS_HEADERS = [
+    "Hero", "Wins", "Losses", "Current Win Streak", "Best Win Streak", "Avg Kills",
+    "Avg Deaths", "Avg Assists", "Avg GPM", "Avg XPM", "Best Kills", "Best GPM",
+]
+HEROES = [
+    "Abaddon", "Alchemist", "Ancient Apparition", "Anti-Mage", "Arc Warden", "Axe", "Bane",
+    "Batrider", "Beastmaster", "Bloodseeker", "Bounty Hunter", "Brewmaster", "Bristleback",
+    "Broodmother", "Centaur Warrunner", "Chaos Knight", "Chen", "Clinkz", "Clockwerk",
+    "Crystal Maiden", "Dark Seer", "Dark Willow", "Dawnbreaker", "Dazzle", "Death Prophet",
+    "Disruptor", "Doom", "Dragon Knight", "Drow Ranger", "Earth Spirit", "Earthshaker",
+    "Elder Titan", "Ember Spirit", "Enchantress", "Enigma", "Faceless Void", "Grimstroke",
+    "Gyrocopter", "Hoodwink", "Huskar", "Invoker", "Io", "Jakiro", "Juggernaut",
+    "Keeper of the Light", "Kunkka", "Legion Commander", "Leshrac", "Lich", "Lifestealer",
+    "Lina", "Lion", "Lone Druid", "Luna", "Lycan", "Magnus", "Marci", "Mars", "Medusa",
+    "Meepo", "Mirana", "Monkey King", "Morphling", "Muerta", "Naga Siren", "Nature's Prophet",
+    "Necrophos", "Night Stalker", "Nyx Assassin", "Ogre Magi", "Omniknight", "Oracle",
+    "Outworld Destroyer", "Pangolier", "Phantom Assassin", "Phantom Lancer", "Phoenix",
+    "Primal Beast", "Puck", "Pudge", "Pugna", "Queen of Pain", "Razor", "Riki", "Rubick",
+    "Sand King", "Shadow Demon", "Shadow Fiend", "Shadow Shaman", "Silencer", "Skywrath Mage",
+    "Slardar", "Slark", "Snapfire", "Sniper", "Spectre", "Spirit Breaker", "Storm Spirit",
+    "Sven", "Techies", "Templar Assassin", "Terrorblade", "Tidehunter", "Timbersaw", "Tinker",
+    "Tiny", "Treant Protector", "Troll Warlord", "Tusk", "Underlord", "Undying", "Ursa",
+    "Vengeful Spirit", "Venomancer", "Viper", "Visage", "Void Spirit", "Warlock", "Weaver",
+    "Windranger", "Winter Wyvern", "Witch Doctor", "Wraith King", "Zeus",
+]
+
+FIRST_MATCH_ID = 7_900_000_000
+LATEST_MATCH_TIME = datetime(2025, 9, 1, 18, 0, 0)
+
+# --- Helper functions ---
+
+def _table(headers: List[str], rows: List[List[Any]]) -> str:
+    """Renders a generic_kv_table with the whitespace and escaping of Steam's templates."""
+    parts = ['<table class="generic_kv_table">\n\t<tr>\n']
+    parts.extend(f"\t\t<th>{html.escape(h)}</th>\n" for h in headers)
+    parts.append("\t</tr>\n")
+    for row in rows:
+        parts.append("\t<tr>\n")
+        parts.extend(f"\t\t<td>{html.escape(str(cell))}</td>\n" for cell in row)
+        parts.append("\t</tr>\n")
+    parts.append("</table>\n")
+    return "".join(parts)
+
+
+def _gmt(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%d %H:%M:%S GMT")
+
+
+def _matches(count: int, start: int, seed: int) -> Iterator[tuple]:
+    """Yields (rng, match_id, played_at) for matches numbered from `start`, newest first."""
+    for n in range(start, start + count):
+        rng = random.Random(seed * 1_000_003 + n)
+        yield rng, FIRST_MATCH_ID - n * 17, LATEST_MATCH_TIME - timedelta(minutes=47 * n)
+
+
+def _page(table_html: str, continue_token: str | None) -> Dict[str, Any]:
+    page = {"success": True, "html": table_html}
+    if continue_token:
+        page["continue_token"] = continue_token
+    return page
+
+# --- Main public functions ---
+
+def conduct_rows(count: int, start: int = 0, seed: int = 0) -> List[List[Any]]:
+    """Returns conduct summary table rows for `count` consecutive matches, newest first."""
+    rows = []
+    for rng, match_id, played_at in _matches(count, start, seed):
+        reports = rng.choice([0, 0, 0, 0, 1, 2])
+        rows.append([
+            match_id, _gmt(played_at), rng.choice(["Yes", "No", "No", "No"]),
+            "Yes" if reports > 1 else "No", "Yes" if rng.random() < 0.02 else "No",
+            rng.randint(10, 30), rng.randint(5, 25), rng.randint(0, 4), rng.randint(0, 1),
+            reports, reports, rng.randint(0, 1), rng.randint(0, 1), rng.randint(0, 30),
+            rng.randint(7000, 12000),
+        ])
+    return rows
+
+
+def playstyle_rows(count: int, start: int = 0, seed: int = 0) -> List[List[Any]]:
+    """Returns playstyle table rows for `count` consecutive matches, newest first."""
+    rows = []
+    for rng, match_id, played_at in _matches(count, start, seed):
+        rows.append([
+            match_id, _gmt(played_at), rng.choice(HEROES),
+            round(rng.uniform(0, 10), 1), round(rng.uniform(0, 10), 1), round(rng.uniform(0, 10), 1),
+            round(rng.uniform(0, 10), 1), rng.randint(0, 25), rng.randint(0, 15), rng.randint(0, 35),
+            rng.randint(0, 600), rng.randint(0, 40), rng.randint(200, 900), rng.randint(250, 1000),
+            rng.randint(3000, 40000), rng.randint(2000, 60000), rng.randint(0, 15000),
+        ])
+    return rows
+
+
+def conduct_page(page_number: int, rows_per_page: int = 20, total_rows: int | None = None, seed: int = 0) -> Dict[str, Any]:
+    """
+    Returns one MatchPlayerReportIncoming AJAX response (0-based page number).
+    Pages continue until `total_rows` rows have been served; the last page has no continue_token.
+    """
+    start = page_number * rows_per_page
+    count = rows_per_page if total_rows is None else max(0, min(rows_per_page, total_rows - start))
+    has_more = total_rows is None or start + count < total_rows
+    token = f"{seed}_{page_number + 1}" if has_more and count else None
+    return _page(_table(CONDUCT_HEADERS, conduct_rows(count, start, seed)), token)
+
+
+def playstyle_page(page_number: int, rows_per_page: int = 10, total_rows: int | None = None, seed: int = 0) -> Dict[str, Any]:
+    """Returns one PlayerPlaystyleStats AJAX response; paging works like conduct_page()."""
+    start = page_number * rows_per_page
+    count = rows_per_page if total_rows is None else max(0, min(rows_per_page, total_rows - start))
+    has_more = total_rows is None or start + count < total_rows
+    token = f"{seed}_{page_number + 1}" if has_more and count else None
+    return _page(_table(PLAYSTYLE_HEADERS, playstyle_rows(count, start, seed)), token)
+
+
+def conduct_pages(total_rows: int, rows_per_page: int = 20, seed: int = 0) -> List[Dict[str, Any]]:
+    """Returns every page of a conduct summary history with `total_rows` matches."""
+    return [conduct_page(n, rows_per_page, total_rows, seed) for n in range(max(1, -(-total_rows // rows_per_page)))]
+
+
+def playstyle_pages(total_rows: int, rows_per_page: int = 10, seed: int = 0) -> List[Dict[str, Any]]:
+    """Returns every page of a playstyle history with `total_rows` matches."""
+    return [playstyle_page(n, rows_per_page, total_rows, seed) for n in range(max(1, -(-total_rows // rows_per_page)))]
+
+
+def hero_standings_page(hero_count: int = len(HEROES), seed: int = 0) -> str:
+    """
+    Returns a full GameHeroStandings HTML document: page chrome, inline scripts and the
+    standings table. Above the real roster size, heroes get numbered names.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for n in range(hero_count):
+        hero = HEROES[n] if n < len(HEROES) else f"{HEROES[n % len(HEROES)]} {n // len(HEROES) + 1}"
+        wins, losses = rng.randint(0, 300), rng.randint(0, 300)
+        rows.append([
+            hero, wins, losses, rng.randint(0, 5), rng.randint(1, 12),
+            round(rng.uniform(1, 15), 2), round(rng.uniform(1, 12), 2), round(rng.uniform(2, 20), 2),
+            round(rng.uniform(250, 750), 2), round(rng.uniform(300, 850), 2), rng.randint(5, 40), rng.randint(400, 1400),
+        ])
+    navigation = "".join(f'<a class="tab" href="?tab={t}">{t}</a>\n' for t in ("MatchPlayerReportIncoming", "PlayerPlaystyleStats", "GameHeroStandings"))
+    return (
+        "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>Steam Community :: Personal Game Data</title>\n"
+        "<link rel=\"stylesheet\" href=\"/public/css/globalv2.css\">\n"
+        f"<script type=\"text/javascript\">var g_sessionID = \"{rng.getrandbits(96):024x}\"; var rows = \"<tr><td>x</td></tr>\";</script>\n"
+        "</head>\n<body class=\"flat_page\">\n<div class=\"responsive_page_frame\">\n"
+        f"<div class=\"gcpd_tabs\">\n{navigation}</div>\n<div class=\"gcpd_content\">\n<h2>Hero Standings</h2>\n"
+        f"{_table(HERO_STANDINGS_HEADERS, rows)}"
+        "</div>\n</div>\n<!-- footer -->\n<div id=\"footer\">Valve Corporation. All rights reserved.</div>\n</body>\n</html>\n"
+    )
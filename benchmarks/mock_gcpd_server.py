@@ -0,0 +1,229 @@
+# benchmarks/mock_gcpd_server.py
+# A local stand-in for Steam's /gcpd/570 endpoints, serving the synthetic pages from
+# gcpd_payloads: paged AJAX responses with continue tokens for the conduct summary and
+# playstyle tabs, and the hero standings page with an ETag. Latency, throttling (429
+# with Retry-After), server errors and cookie checks can be injected to exercise the
+# downloaders' paging, backoff and auth handling without touching Steam.
+#
+# Usage: python -m benchmarks.mock_gcpd_server [--port 8765] [--conduct-rows 2000]
+#            [--latency 0.05] [--throttle-rate 0.05] [--error-rate 0.05] [--cookie SECRET]
+#
+# Then set "steam_base_url": "http://127.0.0.1:8765" in a config and sync as usual.
+# GET /_mock/stats returns request counts by tab and status plus the number of accepted
+# connections; /_mock/reset clears them. Connections are kept alive (HTTP/1.1), and bodies
+# are gzipped for clients that accept it, as Steam does.
+
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+from benchmarks import gcpd_payloads
+
+DEFAULT_OPTIONS: Dict[str, Any] = {
+    "conduct_rows": 2000,
+    "conduct_rows_per_page": 20,
+    "playstyle_rows": 50,
+    "playstyle_rows_per_page": 10,
+    "heroes": len(gcpd_payloads.HEROES),
+    "seed": 0,
+    "latency": 0.0,           # seconds added to every response
+    "jitter": 0.0,            # up to this many extra seconds, uniformly random
+    "throttle_rate": 0.0,     # share of requests answered with 429
+    "retry_after": 1,         # Retry-After seconds sent with 429s (0 to omit the header)
+    "error_rate": 0.0,        # share of requests answered with 500/502/503/504
+    "cookie": None,           # expected steamLoginSecure value; None disables the check
+}
+ERROR_STATUSES = (500, 502, 503, 504)
+MIN_GZIP_BYTES = 1024
+AJAX_TABS = {
+    "MatchPlayerReportIncoming": (gcpd_payloads.conduct_page, "conduct_rows", "conduct_rows_per_page"),
+    "PlayerPlaystyleStats": (gcpd_payloads.playstyle_page, "playstyle_rows", "playstyle_rows_per_page"),
+}
+
+
+class MockGcpdServer(ThreadingHTTPServer):
+    """HTTP server holding the mock's options, its random source and request statistics."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], options: Dict[str, Any] | None = None):
+        super().__init__(address, _Handler)
+        self.options = {**DEFAULT_OPTIONS, **(options or {})}
+        self.rng = random.Random(self.options["seed"])
+        self.stats: Counter = Counter()
+        self.lock = threading.Lock()
+        self.hero_page = gcpd_payloads.hero_standings_page(self.options["heroes"], self.options["seed"])
+        self.hero_etag = '"' + hashlib.sha256(self.hero_page.encode('utf-8')).hexdigest()[:16] + '"'
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, key: str):
+        with self.lock:
+            self.stats[key] += 1
+
+    def roll(self) -> float:
+        with self.lock:
+            return self.rng.random()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockGcpdServer
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.count("connections")
+
+    def log_message(self, format, *args):
+        # Per-request logging would dominate the run time under load
+        pass
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "application/json", headers: Dict[str, str] | None = None):
+        if len(body) >= MIN_GZIP_BYTES and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=5)
+            headers = {**(headers or {}), "Content-Encoding": "gzip"}
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        self._send(status, json.dumps(payload).encode('utf-8'))
+
+    def _inject_faults(self, tab: str) -> bool:
+        """Applies latency, auth checks, throttling and server errors. Returns True if a response was sent."""
+        options = self.server.options
+        delay = options["latency"] + (self.server.roll() * options["jitter"] if options["jitter"] else 0)
+        if delay:
+            time.sleep(delay)
+
+        if options["cookie"] is not None:
+            cookie = SimpleCookie(self.headers.get("Cookie", "")).get("steamLoginSecure")
+            if cookie is None:
+                self.server.count(f"{tab}:401")
+                self._send(401, b"Unauthorized", "text/plain")
+                return True
+            if cookie.value != options["cookie"]:
+                self.server.count(f"{tab}:403")
+                self._send(403, b"Forbidden", "text/plain")
+                return True
+
+        roll = self.server.roll()
+        if roll < options["throttle_rate"]:
+            self.server.count(f"{tab}:429")
+            headers = {"Retry-After": str(options["retry_after"])} if options["retry_after"] else {}
+            self._send(429, b"Too Many Requests", "text/plain", headers)
+            return True
+        if roll < options["throttle_rate"] + options["error_rate"]:
+            status = ERROR_STATUSES[int(self.server.roll() * len(ERROR_STATUSES))]
+            self.server.count(f"{tab}:{status}")
+            self._send(status, b"Server Error", "text/plain")
+            return True
+        return False
+
+    def _serve_ajax(self, tab: str, params: Dict[str, str]):
+        page_func, rows_key, per_page_key = AJAX_TABS[tab]
+        options = self.server.options
+        token = params.get("continue_token")
+        page_number = 0
+        if token:
+            seed, _, number = token.partition("_")
+            if seed != str(options["seed"]) or not number.isdigit():
+                self.server.count(f"{tab}:bad_token")
+                self._send_json(200, {"success": False})
+                return
+            page_number = int(number)
+        page = page_func(page_number, options[per_page_key], options[rows_key], options["seed"])
+        self.server.count(f"{tab}:200")
+        self._send_json(200, page)
+
+    def _serve_hero_standings(self):
+        if self.headers.get("If-None-Match") == self.server.hero_etag:
+            self.server.count("GameHeroStandings:304")
+            self._send(304, headers={"ETag": self.server.hero_etag})
+            return
+        self.server.count("GameHeroStandings:200")
+        self._send(200, self.server.hero_page.encode('utf-8'), "text/html; charset=utf-8", {"ETag": self.server.hero_etag})
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if url.path == "/_mock/stats":
+            with self.server.lock:
+                self._send_json(200, dict(self.server.stats))
+            return
+        if url.path == "/_mock/reset":
+            with self.server.lock:
+                self.server.stats.clear()
+            self._send_json(200, {"reset": True})
+            return
+
+        parts = url.path.strip("/").split("/")
+        if len(parts) != 4 or parts[0] != "id" or parts[2:] != ["gcpd", "570"]:
+            self.server.count("unknown:404")
+            self._send(404, b"Not Found", "text/plain")
+            return
+
+        tab = params.get("tab", "")
+        if params.get("ajax") == "1" and tab in AJAX_TABS:
+            if not self._inject_faults(tab):
+                self._serve_ajax(tab, params)
+        elif tab == "GameHeroStandings":
+            if not self._inject_faults(tab):
+                self._serve_hero_standings()
+        else:
+            self.server.count(f"{tab or 'unknown'}:404")
+            self._send(404, b"Not Found", "text/plain")
+
+# --- Main public functions ---
+
+def start(options: Dict[str, Any] | None = None, host: str = "127.0.0.1", port: int = 0) -> MockGcpdServer:
+    """Starts a mock server on a background thread (on a free port by default) and returns it."""
+    server = MockGcpdServer((host, port), options)
+    threading.Thread(target=server.serve_forever, name="mock-gcpd", daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve synthetic Steam gcpd pages with optional fault injection.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    for key, default in DEFAULT_OPTIONS.items():
+        if key == "cookie":
+            parser.add_argument("--cookie", help="Require this steamLoginSecure cookie (401 when missing, 403 when wrong).")
+        else:
+            parser.add_argument(f"--{key.replace('_', '-')}", type=type(default), default=default, help="(default: %(default)s)")
+    args = vars(parser.parse_args(argv))
+    host, port = args.pop("host"), args.pop("port")
+
+    server = MockGcpdServer((host, port), args)
+    print(f"🧪 Mock gcpd server listening on {server.base_url}")
+    print(f"   Set \"steam_base_url\": \"{server.base_url}\" in a config to point the downloaders at it.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n📊 Requests served: {json.dumps(dict(server.stats), sort_keys=True)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+# benchmarks/run_benchmarks.py
+# Times every processing stage over synthetic gcpd payloads and saves the numbers,
+# so a slowdown between versions shows up as a diff against an earlier result file.
+#
+# Usage: python -m benchmarks.run_benchmarks [--rows 10000] [--heroes 2000] [--repeat 3]
+#                                            [--stages NAME ...] [--baseline FILE] [--no-save]
+#
+# Each stage runs `--repeat` times for wall time, then once more under tracemalloc
+# for peak Python memory (tracemalloc slows code down, so that run is not timed).
+# Results go to benchmarks/results/<timestamp>_<commit>.json and are compared with
+# the most recent earlier file there, or with --baseline.
+
+import argparse
+import contextlib
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Tuple
+
+import pandas as pd
+
+from benchmarks import gcpd_payloads
+from modules.common import path_manager, segment_store, downsample
+from modules.process import conduct_summary as process_conduct
+from modules.process import conduct_rollups, conduct_pages
+from modules.process import playstyle_stats as process_playstyle
+from modules.process import playstyle_aggregates
+from modules.process import ranked_hero_stats as process_ranked
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+PROFILE_NAME = "benchmark"
+STAGES = [
+    "conduct.parse_html_table", "conduct.parse_pages", "conduct.clean", "conduct.process",
+    "conduct.rollups", "conduct.trend",
+    "playstyle.parse_pages", "playstyle.clean", "playstyle.process", "playstyle.aggregates",
+    "ranked.parse", "ranked.process",
+]
+
+# --- Helper functions ---
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(RESULTS_DIR), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _store_pages(raw_dir: str, pages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Writes payloads into a segment store the way the downloaders do and returns their index entries."""
+    return [segment_store.append_page(raw_dir, f"page_{n:05d}.json", json.dumps(page).encode('utf-8'))
+            for n, page in enumerate(pages)]
+
+
+def _prepare(rows: int, heroes: int) -> Dict[str, Any]:
+    """Generates the payloads and lays them out in the temporary data directory."""
+    print(f"🧪 Generating {rows} conduct rows, {rows} playstyle rows and {heroes} heroes...")
+    conduct_pages = gcpd_payloads.conduct_pages(rows)
+    playstyle_pages = gcpd_payloads.playstyle_pages(rows)
+    ranked_html = gcpd_payloads.hero_standings_page(heroes)
+
+    conduct_dir = path_manager.get_raw_conduct_summary_dir(PROFILE_NAME)
+    playstyle_dir = path_manager.get_raw_playstyle_stats_dir(PROFILE_NAME)
+    ranked_path = path_manager.get_raw_ranked_stats_path(PROFILE_NAME)
+    os.makedirs(os.path.dirname(ranked_path), exist_ok=True)
+    with open(ranked_path, 'w', encoding='utf-8') as f:
+        f.write(ranked_html)
+
+    data = {
+        "conduct_html": [page["html"] for page in conduct_pages],
+        "conduct_dir": conduct_dir,
+        "conduct_entries": _store_pages(conduct_dir, conduct_pages),
+        "playstyle_dir": playstyle_dir,
+        "playstyle_entries": _store_pages(playstyle_dir, playstyle_pages),
+        "ranked_html": ranked_html,
+        "heroes": heroes,
+    }
+    # Parsed records feed the cleaning stages, so those are measured on their own
+    data["conduct_records"] = process_conduct._parse_pages(conduct_dir, data["conduct_entries"], workers=1)
+    data["playstyle_records"] = [row for entry in data["playstyle_entries"]
+                                 for row in process_playstyle._parse_page(playstyle_dir, entry)]
+    # ...and the cleaned frames feed the derived datasets
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        data["conduct_df"], _ = process_conduct._merge(data["conduct_records"], None)
+        data["playstyle_df"], _ = process_playstyle._merge(data["playstyle_records"], None)
+    return data
+
+
+def _build_stages(data: Dict[str, Any], workers: int | None) -> Dict[str, Tuple[Callable[[], Any], int]]:
+    """Returns {stage name: (function, rows it handles)}."""
+    conduct_rows, playstyle_rows = len(data["conduct_records"]), len(data["playstyle_records"])
+    ranked_rows = data["heroes"]
+    return {
+        "conduct.parse_html_table": (lambda: [conduct_pages.parse_html_table(h) for h in data["conduct_html"]], conduct_rows),
+        "conduct.parse_pages": (lambda: process_conduct._parse_pages(data["conduct_dir"], data["conduct_entries"], workers=1), conduct_rows),
+        "conduct.clean": (lambda: process_conduct._merge(data["conduct_records"], None), conduct_rows),
+        "conduct.process": (lambda: process_conduct.process(PROFILE_NAME, incremental=False, workers=workers), conduct_rows),
+        "conduct.rollups": (lambda: conduct_rollups.build(data["conduct_df"]), conduct_rows),
+        "conduct.trend": (lambda: downsample.downsample(data["conduct_df"].set_index('SummaryDate')[['BehaviorScore']].iloc[::-1], 500), conduct_rows),
+        "playstyle.parse_pages": (lambda: [process_playstyle._parse_page(data["playstyle_dir"], e) for e in data["playstyle_entries"]], playstyle_rows),
+        "playstyle.clean": (lambda: process_playstyle._merge(data["playstyle_records"], None), playstyle_rows),
+        "playstyle.process": (lambda: process_playstyle.process(PROFILE_NAME, incremental=False), playstyle_rows),
+        "playstyle.aggregates": (lambda: playstyle_aggregates.build(data["playstyle_df"]), playstyle_rows),
+        "ranked.parse": (lambda: process_ranked._build_dataframe(data["ranked_html"]), ranked_rows),
+        "ranked.process": (lambda: process_ranked.process(PROFILE_NAME, incremental=False), ranked_rows),
+    }
+
+
+def _measure(func: Callable[[], Any], rows: int, repeat: int) -> Dict[str, Any]:
+    """Runs a stage `repeat` times for timing and once under tracemalloc for peak memory."""
+    timings = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        "rows": rows,
+        "wall_seconds_best": round(best, 6),
+        "wall_seconds_mean": round(sum(timings) / len(timings), 6),
+        "rows_per_second": round(rows / best, 1) if best > 0 else None,
+        "peak_memory_mb": round(peak / 1024 / 1024, 3),
+    }
+
+
+def _latest_result() -> str | None:
+    files = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")))
+    return files[-1] if files else None
+
+
+def _print_report(results: Dict[str, Any], baseline: Dict[str, Any] | None):
+    """Prints one line per stage, with the change in best wall time against the baseline."""
+    print(f"\n{'Stage':<26}{'Rows':>8}{'Best s':>11}{'Rows/s':>13}{'Peak MB':>10}{'vs base':>10}")
+    for name, stage in results["stages"].items():
+        change = ""
+        base = (baseline or {}).get("stages", {}).get(name)
+        if base and base.get("wall_seconds_best"):
+            change = f"{(stage['wall_seconds_best'] / base['wall_seconds_best'] - 1) * 100:+.1f}%"
+        rate = f"{stage['rows_per_second']:,.0f}" if stage["rows_per_second"] else "-"
+        print(f"{name:<26}{stage['rows']:>8}{stage['wall_seconds_best']:>11.4f}{rate:>13}{stage['peak_memory_mb']:>10.1f}{change:>10}")
+
+# --- Main public function ---
+
+def run(rows: int = 10000, heroes: int = 2000, repeat: int = 3, stages: List[str] | None = None,
+        workers: int | None = None) -> Dict[str, Any]:
+    """Runs the selected stages (all by default) in a throwaway data directory and returns the results."""
+    unknown = [name for name in stages or [] if name not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)}. Choose from {', '.join(STAGES)}.")
+
+    original_data_dir = path_manager.BASE_DATA_DIR
+    with tempfile.TemporaryDirectory(prefix="dota2_bench_") as data_dir:
+        path_manager.BASE_DATA_DIR = data_dir
+        try:
+            data = _prepare(rows, heroes)
+            available = _build_stages(data, workers)
+            measured = {}
+            for name in stages or STAGES:
+                func, stage_rows = available[name]
+                print(f"   > {name}...")
+                measured[name] = _measure(func, stage_rows, repeat)
+        finally:
+            path_manager.BASE_DATA_DIR = original_data_dir
+
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "params": {"rows": rows, "heroes": heroes, "repeat": repeat, "workers": workers},
+        "stages": measured,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the processing stages on synthetic gcpd payloads.")
+    parser.add_argument("--rows", type=int, default=10000, help="Matches per conduct and playstyle history (default: %(default)s).")
+    parser.add_argument("--heroes", type=int, default=2000, help="Rows in the hero standings table (default: %(default)s).")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage; the best one is reported (default: %(default)s).")
+    parser.add_argument("--workers", type=int, help="Parsing processes for conduct.process (default: one per CPU).")
+    parser.add_argument("--stages", nargs="+", metavar="NAME", help="Only run these stages.")
+    parser.add_argument("--baseline", help="Result file to compare against (default: the latest one in benchmarks/results).")
+    parser.add_argument("--no-save", action="store_true", help="Don't write a result file.")
+    args = parser.parse_args(argv)
+    if args.rows < 1 or args.heroes < 1 or args.repeat < 1:
+        parser.error("--rows, --heroes and --repeat must be at least 1")
+
+    try:
+        results = run(args.rows, args.heroes, args.repeat, args.stages, args.workers)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+    baseline_path = args.baseline or _latest_result()
+    baseline = None
+    if baseline_path:
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get("params", {}).get("rows") != args.rows:
+            print(f"⚠️ Baseline '{baseline_path}' used a different --rows; compare rows/s rather than wall time.")
+    _print_report(results, baseline)
+    if baseline_path:
+        print(f"\nCompared with {os.path.basename(baseline_path)} ({baseline.get('git_commit', 'unknown')}).")
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+        output_path = os.path.join(RESULTS_DIR, f"{stamp}_{results['git_commit']}.json")
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Results saved to:\n   {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+# migrate_raw_storage.py
+# Moves raw conduct summary and playstyle pages saved as one JSON file per page
+# into the compressed segment store. The app does this on its own the next time
+# a profile is synced or processed; this tool converts everything up front.
+#
+# Usage: python migrate_raw_storage.py [profile ...] [--keep-files]
+
+import argparse
+import os
+from modules.common import path_manager, segment_store
+
+
+def _dir_size(path: str) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file()) if os.path.isdir(path) else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate raw page files into compressed segment storage.")
+    parser.add_argument("profiles", nargs="*", help="Profile names to migrate (default: every profile under the data directory).")
+    parser.add_argument("--keep-files", action="store_true", help="Keep the original JSON files after migrating them, renamed to *.migrated.")
+    args = parser.parse_args()
+
+    profiles = args.profiles
+    if not profiles and os.path.isdir(path_manager.BASE_DATA_DIR):
+        profiles = sorted(d for d in os.listdir(path_manager.BASE_DATA_DIR) if os.path.isdir(path_manager.get_profile_dir(d)))
+    if not profiles:
+        print("No profiles found to migrate.")
+        return
+
+    for profile_name in profiles:
+        for raw_dir in (path_manager.get_raw_conduct_summary_dir(profile_name), path_manager.get_raw_playstyle_stats_dir(profile_name)):
+            size_before = _dir_size(raw_dir)
+            migrated = segment_store.migrate_directory(raw_dir, remove_files=not args.keep_files)
+            if migrated:
+                print(f"✅ {raw_dir}: {migrated} page(s), {size_before / 1e6:.1f} MB -> {_dir_size(raw_dir) / 1e6:.1f} MB")
+            else:
+                print(f"   {raw_dir}: nothing to migrate.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+# modules/common/analytics_store.py
+
+import os
+import sqlite3
+import pandas as pd
+import pyarrow as pa
+from contextlib import closing
+from typing import Dict, Any, List, Tuple
+
+from modules.common import path_manager, dataset_store, schemas
+
+# One SQLite database holds the processed rows of every profile and dataset, keyed by
+# profile and MatchID (Hero for ranked stats), so lookups and filtered reads hit an
+# index instead of loading whole files. Column layouts follow dataset_store.SCHEMAS.
+# Derived datasets such as the conduct rollups are small and stay in Parquet only.
+
+PRIMARY_KEYS: Dict[str, List[str]] = {
+    dataset_store.CONDUCT_SUMMARY: ["MatchID"],
+    dataset_store.PLAYSTYLE_STATS: ["MatchID"],
+    dataset_store.RANKED_HERO_STATS: ["Hero"],
+}
+DATE_COLUMNS: Dict[str, str] = {
+    dataset_store.CONDUCT_SUMMARY: "SummaryDate",
+    dataset_store.PLAYSTYLE_STATS: "Timestamp",
+}
+INDEXED_COLUMNS: Dict[str, List[str]] = {
+    dataset_store.CONDUCT_SUMMARY: ["SummaryDate"],
+    dataset_store.PLAYSTYLE_STATS: ["Timestamp", "Hero"],
+    dataset_store.RANKED_HERO_STATS: [],
+}
+# Columns a text search looks into
+SEARCH_COLUMNS: Dict[str, List[str]] = {
+    dataset_store.CONDUCT_SUMMARY: ["MatchID"],
+    dataset_store.PLAYSTYLE_STATS: ["MatchID", "Hero"],
+    dataset_store.RANKED_HERO_STATS: ["Hero"],
+}
+# Sort columns that are indexed and never NULL; pages sorted by them can continue after
+# the last row seen (keyset paging) instead of counting past every earlier row
+KEYSET_COLUMNS: Dict[str, List[str]] = {
+    dataset: [col for col in (DATE_COLUMNS.get(dataset), *PRIMARY_KEYS[dataset]) if col] for dataset in PRIMARY_KEYS
+}
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# --- Helper functions ---
+
+def _sql_type(data_type: pa.DataType) -> str:
+    if pa.types.is_integer(data_type) or pa.types.is_boolean(data_type):
+        return "INTEGER"
+    if pa.types.is_floating(data_type):
+        return "REAL"
+    return "TEXT"
+
+
+def _create_tables(conn: sqlite3.Connection):
+    """Creates the dataset tables and their indexes if they don't exist yet."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS loaded_datasets (
+            profile TEXT NOT NULL,
+            dataset TEXT NOT NULL,
+            PRIMARY KEY (profile, dataset)
+        ) WITHOUT ROWID
+    """)
+    for dataset in PRIMARY_KEYS:
+        columns = ", ".join(f'"{field.name}" {_sql_type(field.type)}' for field in dataset_store.SCHEMAS[dataset])
+        key = ", ".join(["profile"] + [f'"{col}"' for col in PRIMARY_KEYS[dataset]])
+        conn.execute(f'CREATE TABLE IF NOT EXISTS "{dataset}" (profile TEXT NOT NULL, {columns}, PRIMARY KEY ({key}))')
+        for col in INDEXED_COLUMNS[dataset]:
+            conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{dataset}_{col}" ON "{dataset}" (profile, "{col}")')
+
+
+def _connect() -> sqlite3.Connection:
+    """Opens the analytics database, creating it on first use."""
+    db_path = path_manager.get_analytics_db_path()
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    _create_tables(conn)
+    return conn
+
+
+def _table_columns(conn: sqlite3.Connection, dataset: str) -> List[str]:
+    return [row[1] for row in conn.execute(f'PRAGMA table_info("{dataset}")')]
+
+
+def _to_rows(df: pd.DataFrame) -> List[Tuple]:
+    """Converts a processed DataFrame into plain Python rows SQLite can bind."""
+    out = df.copy()
+    for col in out.columns:
+        if pd.api.types.is_datetime64_any_dtype(out[col]):
+            out[col] = out[col].dt.strftime(DATE_FORMAT)
+        elif pd.api.types.is_bool_dtype(out[col]):
+            out[col] = out[col].astype(int)
+        elif pd.api.types.is_float_dtype(out[col]):
+            # sqlite3 can't bind numpy float32 values
+            out[col] = out[col].astype('float64')
+    out = out.astype(object).where(out.notna(), None)
+    return list(out.itertuples(index=False, name=None))
+
+
+def _is_loaded(conn: sqlite3.Connection, profile_name: str, dataset: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM loaded_datasets WHERE profile = ? AND dataset = ?", (profile_name, dataset)
+    ).fetchone() is not None
+
+
+def _write(conn: sqlite3.Connection, profile_name: str, dataset: str, df: pd.DataFrame, replace: bool = True):
+    """
+    Writes a profile's rows of a dataset: all of them with `replace`, otherwise `df` only
+    holds new or changed rows, which are upserted by primary key. Caller owns the transaction.
+    """
+    existing = set(_table_columns(conn, dataset))
+    for col in df.columns:
+        if col not in existing:
+            # Ranked hero standings can grow new numeric columns
+            conn.execute(f'ALTER TABLE "{dataset}" ADD COLUMN "{col}" REAL')
+
+    if replace:
+        conn.execute(f'DELETE FROM "{dataset}" WHERE profile = ?', (profile_name,))
+    columns = ", ".join(["profile"] + [f'"{col}"' for col in df.columns])
+    placeholders = ", ".join("?" * (len(df.columns) + 1))
+    conn.executemany(
+        f'INSERT OR REPLACE INTO "{dataset}" ({columns}) VALUES ({placeholders})',
+        ((profile_name, *row) for row in _to_rows(df))
+    )
+    conn.execute("INSERT OR IGNORE INTO loaded_datasets (profile, dataset) VALUES (?, ?)", (profile_name, dataset))
+
+
+def _ensure_loaded(conn: sqlite3.Connection, profile_name: str, dataset: str):
+    """Backfills a profile's dataset from its Parquet file the first time it is queried."""
+    if _is_loaded(conn, profile_name, dataset):
+        return
+    df = dataset_store.read_dataset(profile_name, dataset)
+    if df is None:
+        return
+    with conn:
+        _write(conn, profile_name, dataset, df)
+
+
+def _build_where(dataset: str, profile_name: str, start=None, end=None, hero: str | None = None,
+                 search: str | None = None, filters: Dict[str, Tuple[Any, Any]] | None = None) -> Tuple[str, List[Any]]:
+    """Builds the WHERE clause shared by query() and count()."""
+    clauses, params = ["profile = ?"], [profile_name]
+    date_col = DATE_COLUMNS.get(dataset)
+    if date_col and start is not None:
+        clauses.append(f'"{date_col}" >= ?')
+        params.append(pd.Timestamp(start).strftime(DATE_FORMAT))
+    if date_col and end is not None:
+        clauses.append(f'"{date_col}" <= ?')
+        params.append(pd.Timestamp(end).strftime(DATE_FORMAT))
+    if hero is not None:
+        clauses.append('"Hero" = ?')
+        params.append(hero)
+    if search:
+        # Typed % and _ are meant literally, not as wildcards
+        term = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        matches = [f'CAST("{col}" AS TEXT) LIKE ? ESCAPE \'\\\'' for col in SEARCH_COLUMNS[dataset]]
+        clauses.append("(" + " OR ".join(matches) + ")")
+        params += [f"%{term}%"] * len(matches)
+    for col, (low, high) in (filters or {}).items():
+        if col not in dataset_store.SCHEMAS[dataset].names:
+            raise ValueError(f"Column '{col}' is not part of the '{dataset}' schema.")
+        if low is not None:
+            clauses.append(f'"{col}" >= ?')
+            params.append(low)
+        if high is not None:
+            clauses.append(f'"{col}" <= ?')
+            params.append(high)
+    return " AND ".join(clauses), params
+
+
+def _to_dataframe(dataset: str, rows: List[Tuple], columns: List[str]) -> pd.DataFrame:
+    """Turns query rows back into a DataFrame typed like the Parquet dataset."""
+    return schemas.convert(pd.DataFrame(rows, columns=columns), dataset)
+
+# --- Main public functions ---
+
+def write_dataset(profile_name: str, dataset: str, df: pd.DataFrame, changed: pd.DataFrame | None = None):
+    """
+    Stores a profile's rows of a dataset in a single transaction. `df` is the whole
+    dataset; if `changed` holds just the rows that are new or differ since the last
+    write, only those are upserted. The whole dataset is rewritten on first load, when
+    it brings new columns, or without `changed`.
+    """
+    with closing(_connect()) as conn, conn:
+        if changed is not None and _is_loaded(conn, profile_name, dataset) \
+                and set(df.columns) <= set(_table_columns(conn, dataset)):
+            _write(conn, profile_name, dataset, changed, replace=False)
+        else:
+            _write(conn, profile_name, dataset, df)
+
+
+def delete_profile(profile_name: str):
+    """Removes every row that belongs to a profile."""
+    with closing(_connect()) as conn, conn:
+        for dataset in PRIMARY_KEYS:
+            conn.execute(f'DELETE FROM "{dataset}" WHERE profile = ?', (profile_name,))
+        conn.execute("DELETE FROM loaded_datasets WHERE profile = ?", (profile_name,))
+
+
+def query(profile_name: str, dataset: str, columns: List[str] | None = None, start=None, end=None,
+          hero: str | None = None, search: str | None = None, order_by: str | None = None,
+          descending: bool = True, limit: int | None = None, offset: int = 0,
+          filters: Dict[str, Tuple[Any, Any]] | None = None) -> pd.DataFrame:
+    """
+    Returns a profile's rows of a dataset, filtered by date range, hero, a
+    MatchID/Hero substring search and inclusive (low, high) column ranges in
+    `filters` (None leaves a side open), sorted by `order_by` (newest first by
+    default). Ties keep a fixed order, so consecutive pages never overlap.
+    """
+    df, _ = page(profile_name, dataset, columns, start, end, hero, search, order_by, descending, limit, offset, filters)
+    return df
+
+
+def page(profile_name: str, dataset: str, columns: List[str] | None = None, start=None, end=None,
+         hero: str | None = None, search: str | None = None, order_by: str | None = None,
+         descending: bool = True, limit: int | None = None, offset: int = 0,
+         filters: Dict[str, Tuple[Any, Any]] | None = None,
+         after: Tuple[Any, int] | None = None) -> Tuple[pd.DataFrame, Tuple[Any, int] | None]:
+    """
+    Like query(), but also returns a cursor for the next page. For the columns in
+    KEYSET_COLUMNS, passing that cursor as `after` continues right behind the last
+    row through the index, however deep the page; `offset` is then ignored. For
+    other sort columns the cursor is None and pages are found by `offset`.
+    """
+    with closing(_connect()) as conn:
+        _ensure_loaded(conn, profile_name, dataset)
+        known = _table_columns(conn, dataset)[1:]
+        columns = [col for col in (columns or known) if col in known]
+        order_by = order_by if order_by in known else DATE_COLUMNS.get(dataset, PRIMARY_KEYS[dataset][0])
+        keyset = order_by in KEYSET_COLUMNS[dataset]
+
+        where, params = _build_where(dataset, profile_name, start, end, hero, search, filters)
+        direction = "DESC" if descending else "ASC"
+        if keyset and after is not None:
+            where += f' AND ("{order_by}", rowid) {"<" if descending else ">"} (?, ?)'
+            params += list(after)
+            offset = 0
+        select = ", ".join([f'"{col}"' for col in columns] + [f'"{order_by}"', "rowid"])
+        # rowid breaks ties; every index carries it, so index-backed sorts stay index-only
+        sql = f'SELECT {select} FROM "{dataset}" WHERE {where} ORDER BY "{order_by}" {direction}, rowid {direction}'
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        rows = conn.execute(sql, params).fetchall()
+
+    cursor = tuple(rows[-1][-2:]) if keyset and rows else None
+    return _to_dataframe(dataset, [row[:-2] for row in rows], columns), cursor
+
+
+def count(profile_name: str, dataset: str, start=None, end=None, hero: str | None = None, search: str | None = None,
+          filters: Dict[str, Tuple[Any, Any]] | None = None) -> int:
+    """Returns the number of rows query() would return without a limit."""
+    with closing(_connect()) as conn:
+        _ensure_loaded(conn, profile_name, dataset)
+        where, params = _build_where(dataset, profile_name, start, end, hero, search, filters)
+        return conn.execute(f'SELECT COUNT(*) FROM "{dataset}" WHERE {where}', params).fetchone()[0]
+
+
+def list_heroes(profile_name: str) -> List[str]:
+    """Returns the heroes that appear in a profile's playstyle matches."""
+    dataset = dataset_store.PLAYSTYLE_STATS
+    with closing(_connect()) as conn:
+        _ensure_loaded(conn, profile_name, dataset)
+        rows = conn.execute(f'SELECT DISTINCT "Hero" FROM "{dataset}" WHERE profile = ? ORDER BY "Hero"', (profile_name,))
+        return [row[0] for row in rows if row[0]]
+
+
+def get_match(profile_name: str, match_id: int) -> Dict[str, Dict[str, Any]]:
+    """Looks a MatchID up across the conduct and playstyle datasets. Returns {dataset: row} for each hit."""
+    found = {}
+    with closing(_connect()) as conn:
+        for dataset in (dataset_store.CONDUCT_SUMMARY, dataset_store.PLAYSTYLE_STATS):
+            _ensure_loaded(conn, profile_name, dataset)
+            cursor = conn.execute(f'SELECT * FROM "{dataset}" WHERE profile = ? AND "MatchID" = ?', (profile_name, int(match_id)))
+            row = cursor.fetchone()
+            if row:
+                columns = [d[0] for d in cursor.description]
+                found[dataset] = _to_dataframe(dataset, [row[1:]], columns[1:]).iloc[0].to_dict()
+    return found
@@ -1,11 +1,19 @@
 # modules/common/config_manager.py
 
+import copy
 import json
 import os
+import tempfile
+import threading
 from typing import Dict, Any
 
 CONFIG_PATH = "config.json"
 
+# The parsed config is cached and revalidated against the file's mtime and size, so a
+# Streamlit rerun (or a background sync) doesn't re-read and re-parse it every time.
+_cache: Dict[str, Any] = {}
+_cache_lock = threading.Lock()
+
 
 def initialize_config():
     """Creates a default config file if one doesn't exist."""
@@ -19,21 +27,93 @@ def initialize_config():
         save_config(default_config)
 
 
-def load_config(config_path: str = "config.json") -> Dict[str, Any]:
-    """Loads the main JSON configuration file."""
-    try:
-        with open(config_path, 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        raise FileNotFoundError(f"FATAL: Config file '{config_path}' not found.")
-    except json.JSONDecodeError:
-        raise ValueError(f"FATAL: Could not decode JSON from '{config_path}'.")
+def _file_version(config_path: str) -> tuple:
+    stat = os.stat(config_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _cache_config(config_path: str, version: tuple, config: Dict[str, Any]):
+    """Stores a parsed config together with an index of profile positions by name."""
+    positions = {p.get("profile_name"): i for i, p in enumerate(config.get("profiles", []))}
+    _cache.clear()
+    _cache.update(path=os.path.abspath(config_path), version=version, config=config, positions=positions)
+
 
+def load_config(config_path: str = CONFIG_PATH) -> Dict[str, Any]:
+    """
+    Loads the main JSON configuration file.
+    Returns a private copy, so callers can modify it before passing it to save_config().
+    """
+    with _cache_lock:
+        try:
+            version = _file_version(config_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"FATAL: Config file '{config_path}' not found.")
 
-def save_config(config_data: Dict[str, Any]):
-    """Saves the configuration data to the file."""
-    with open(CONFIG_PATH, 'w') as f:
-        json.dump(config_data, f, indent=2)
+        if _cache.get("path") != os.path.abspath(config_path) or _cache.get("version") != version:
+            try:
+                with open(config_path, 'r') as f:
+                    config = json.load(f)
+            except FileNotFoundError:
+                raise FileNotFoundError(f"FATAL: Config file '{config_path}' not found.")
+            except json.JSONDecodeError:
+                raise ValueError(f"FATAL: Could not decode JSON from '{config_path}'.")
+            _cache_config(config_path, version, config)
+
+        return copy.deepcopy(_cache["config"])
+
+
+def save_config(config_data: Dict[str, Any], config_path: str = CONFIG_PATH):
+    """
+    Saves the configuration data to the file.
+    The file is written to a temporary file and renamed into place, so readers never see a partial write.
+    """
+    with _cache_lock:
+        # A unique temporary file, so the app and the sync CLI saving at once can't clobber each other's
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(config_path) + ".", suffix=".tmp",
+                                        dir=os.path.dirname(os.path.abspath(config_path)))
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(config_data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, config_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        _cache_config(config_path, _file_version(config_path), copy.deepcopy(config_data))
+
+
+def _find_profile(config: Dict[str, Any], profile_name: str) -> Dict[str, Any] | None:
+    """
+    Returns the profile dictionary with the given name, or None.
+    Uses the position index of the cached config and only scans when the given config differs from it.
+    """
+    profiles = config.get("profiles", [])
+    with _cache_lock:
+        position = _cache.get("positions", {}).get(profile_name)
+    if position is not None and position < len(profiles) and profiles[position].get("profile_name") == profile_name:
+        return profiles[position]
+    for profile in profiles:
+        if profile.get("profile_name") == profile_name:
+            return profile
+    return None
+
+
+def _validate_profile(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Ensures a profile has been filled in before it is used for downloads."""
+    if "YOUR_CUSTOM_URL" in profile.get("custom_url", ""):
+        raise ValueError(f"FATAL: Update 'custom_url' for profile '{profile.get('profile_name')}'.")
+    return profile
+
+
+def get_profile(config: Dict[str, Any], profile_name: str) -> Dict[str, Any]:
+    """Finds and returns a profile dictionary by name from the config."""
+    profile = _find_profile(config, profile_name)
+    if profile is None:
+        raise ValueError(f"FATAL: Profile '{profile_name}' not found.")
+    return _validate_profile(profile)
 
 
 def get_active_profile(config: Dict[str, Any]) -> Dict[str, Any]:
@@ -42,10 +122,7 @@ def get_active_profile(config: Dict[str, Any]) -> Dict[str, Any]:
     if not active_profile_name:
         raise ValueError("FATAL: 'active_profile' not found in config.json.")
 
-    for profile in config.get("profiles", []):
-        if profile.get("profile_name") == active_profile_name:
-            if "YOUR_CUSTOM_URL" in profile.get("custom_url", ""):
-                raise ValueError(f"FATAL: Update 'custom_url' for profile '{active_profile_name}'.")
-            return profile
-            
-    raise ValueError(f"FATAL: Active profile '{active_profile_name}' not found.")
+    profile = _find_profile(config, active_profile_name)
+    if profile is None:
+        raise ValueError(f"FATAL: Active profile '{active_profile_name}' not found.")
+    return _validate_profile(profile)
@@ -0,0 +1,101 @@
+# modules/common/dataset_store.py
+
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Dict, List, Callable, Tuple
+
+from modules.common import path_manager, schemas
+from modules.common.schemas import CONDUCT_SUMMARY, PLAYSTYLE_STATS, RANKED_HERO_STATS, CONDUCT_ROLLUPS, PLAYSTYLE_AGGREGATES
+
+# The Arrow schemas are derived from the column kinds in schemas.py
+SCHEMAS: Dict[str, pa.Schema] = {dataset: schemas.arrow_schema(dataset) for dataset in schemas.COLUMNS}
+
+DATASET_PATHS: Dict[str, Callable[[str], str]] = {
+    CONDUCT_SUMMARY: path_manager.get_processed_conduct_summary_path,
+    PLAYSTYLE_STATS: path_manager.get_processed_playstyle_stats_path,
+    RANKED_HERO_STATS: path_manager.get_processed_ranked_stats_path,
+    CONDUCT_ROLLUPS: path_manager.get_processed_conduct_rollups_path,
+    PLAYSTYLE_AGGREGATES: path_manager.get_processed_playstyle_aggregates_path,
+}
+
+# --- Helper functions ---
+
+def get_dataset_path(profile_name: str, dataset: str) -> str:
+    """Returns the Parquet file path of a processed dataset."""
+    return DATASET_PATHS[dataset](profile_name)
+
+# --- Main public functions ---
+
+def get_dataset_version(profile_name: str, dataset: str) -> Tuple[int, int] | None:
+    """
+    Returns a cheap version key for a processed dataset: the (mtime_ns, size) of its file.
+    Every write replaces the file, so the key changes whenever the data does. Returns None if there is no data.
+    """
+    if not profile_name:
+        return None
+    for path in (get_dataset_path(profile_name, dataset), path_manager.get_legacy_processed_csv_path(profile_name, dataset)):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        return stat.st_mtime_ns, stat.st_size
+    return None
+
+
+def write_dataset(profile_name: str, dataset: str, df: pd.DataFrame) -> str:
+    """
+    Writes a processed dataset to Parquet using its explicit schema.
+    The file is replaced atomically so readers never see a partial write.
+    """
+    output_path = get_dataset_path(profile_name, dataset)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    schema = schemas.arrow_schema(dataset, list(df.columns))
+    table = pa.Table.from_pandas(schemas.convert(df, dataset), schema=schema, preserve_index=False)
+
+    tmp_path = f"{output_path}.tmp"
+    pq.write_table(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def read_dataset(profile_name: str, dataset: str, columns: List[str] | None = None) -> pd.DataFrame | None:
+    """
+    Reads a processed dataset, optionally projecting only the given columns.
+    A legacy CSV is migrated to Parquet on first access, and columns stored with
+    the wider types of earlier versions come back in the current compact dtypes.
+    """
+    if not profile_name:
+        return None
+    path = get_dataset_path(profile_name, dataset)
+    if not os.path.exists(path) and not migrate_legacy_csv(profile_name, dataset):
+        return None
+    return schemas.convert(pq.read_table(path, columns=columns).to_pandas(), dataset)
+
+
+def migrate_legacy_csv(profile_name: str, dataset: str) -> bool:
+    """
+    One-time migration of a processed CSV written by earlier versions to Parquet.
+    The CSV is removed once the Parquet file is in place, and so is a CSV that a
+    newer Parquet file already supersedes. Returns True if a file was migrated.
+    """
+    csv_path = path_manager.get_legacy_processed_csv_path(profile_name, dataset)
+    if not os.path.exists(csv_path):
+        return False
+    if os.path.exists(get_dataset_path(profile_name, dataset)):
+        # Left behind when the dataset was reprocessed before it was ever read
+        os.remove(csv_path)
+        return False
+
+    print(f"   > Migrating '{csv_path}' to Parquet...")
+    df = pd.read_csv(csv_path)
+    write_dataset(profile_name, dataset, df)
+    os.remove(csv_path)
+    return True
+
+
+def migrate_profile(profile_name: str) -> List[str]:
+    """Migrates every legacy CSV dataset of a profile and returns the migrated dataset names. Run at the start of every sync."""
+    return [dataset for dataset in SCHEMAS if migrate_legacy_csv(profile_name, dataset)]
@@ -0,0 +1,77 @@
+# modules/common/downsample.py
+
+import numpy as np
+import pandas as pd
+from typing import List
+
+# Largest-Triangle-Three-Buckets (Steinarsson, 2013). The points between the first and
+# the last are split into equal-count buckets, and each bucket keeps the point that forms
+# the largest triangle with the point kept before it and the average of the next bucket.
+# Unlike taking every n-th point or bucket means, spikes and dips survive, so a chart
+# of a few hundred points looks like the chart of the full history.
+
+DEFAULT_MAX_POINTS = 1000
+
+# --- Main public functions ---
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Returns the positions of the points LTTB keeps, in order, always including the
+    first and the last one. `x` must be ascending. Everything is kept if there are
+    no more than `max_points` points.
+    """
+    n = len(x)
+    if n <= max_points or max_points < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    # max_points - 2 buckets over the points between the first and the last
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+
+    kept = np.empty(max_points, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        if i == max_points - 3:
+            next_x, next_y = x[-1], y[-1]
+        else:
+            next_end = edges[i + 2]
+            next_x, next_y = x[end:next_end].mean(), y[end:next_end].mean()
+        # Twice the triangle areas; the factor doesn't change which one is largest
+        areas = np.abs((x[a] - next_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (next_y - y[a]))
+        a = start + int(areas.argmax())
+        kept[i + 1] = a
+    return kept
+
+
+def downsample(data: pd.Series | pd.DataFrame, max_points: int = DEFAULT_MAX_POINTS,
+               columns: List[str] | None = None) -> pd.Series | pd.DataFrame:
+    """
+    Downsamples a series or DataFrame with an ascending datetime or numeric index for
+    charting. For a DataFrame every column in `columns` (default: all) gets an equal
+    share of the points, and the rows picked for any of them are kept whole, so each
+    plotted line keeps its own spikes. Rows missing all those values are dropped first.
+    """
+    frame = data.to_frame() if isinstance(data, pd.Series) else data
+    columns = columns or list(frame.columns)
+    frame = frame.dropna(subset=columns, how='all')
+
+    if len(frame) > max_points:
+        index = frame.index
+        if isinstance(index, pd.DatetimeIndex):
+            # Seconds since the first point keep the areas well within float precision
+            x = (index - index[0]).total_seconds().to_numpy()
+        else:
+            x = index.to_numpy(dtype='float64')
+
+        share = max(3, max_points // len(columns))
+        kept = np.zeros(len(frame), dtype=bool)
+        for col in columns:
+            present = frame[col].notna().to_numpy()
+            y = frame[col].to_numpy(dtype='float64', na_value=np.nan)
+            kept[np.flatnonzero(present)[lttb_indices(x[present], y[present], share)]] = True
+        frame = frame[kept]
+
+    return frame.iloc[:, 0].rename(data.name) if isinstance(data, pd.Series) else frame
@@ -0,0 +1,219 @@
+# modules/common/html_table.py
+
+import html
+import re
+from collections import deque
+from typing import Iterator, List, Tuple
+
+# Streaming extractor for the `generic_kv_table` tables Steam embeds in its gcpd pages.
+# Instead of building a BeautifulSoup tree for the whole page it jumps to the target
+# table and walks its tags with a regex tokenizer, emitting one tuple of cell texts
+# per row. Nesting follows BeautifulSoup's "html.parser" builder: end tags close the
+# most recent matching open tag, unmatched end tags are ignored, void elements never
+# open, comments split strings and script/style contents are not text.
+
+DEFAULT_TABLE_CLASS = "generic_kv_table"
+
+_TOKEN_RE = re.compile(
+    r"""<!--.*?-->|<![^>]*>|<\?[^>]*>|<(/?)([a-zA-Z][^\t\n\r\f />\x00]*)((?:[^>"']|"[^"]*"|'[^']*')*)>""",
+    re.S,
+)
+_TABLE_START_RE = re.compile(r"""<table(?=[\t\n\r\f />])((?:[^>"']|"[^"]*"|'[^']*')*)>""", re.I)
+_CLASS_RE = re.compile(r"""(?:^|[\t\n\r\f /])class\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\t\n\r\f >]+))""", re.I)
+_RAW_TEXT_END_RE = {
+    "script": re.compile(r"</script\s*>", re.I),
+    "style": re.compile(r"</style\s*>", re.I),
+}
+_ASCII_SPACES = " \n\t\x0c\r"
+_VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link", "menuitem",
+    "meta", "param", "source", "track", "wbr", "basefont", "bgsound", "command", "frame",
+    "image", "isindex", "nextid", "spacer",
+})
+
+
+def _has_class(attrs: str, table_class: str) -> bool:
+    """Checks whether a raw attribute string carries the given CSS class."""
+    match = _CLASS_RE.search(attrs)
+    if not match:
+        return False
+    value = next(group for group in match.groups() if group is not None)
+    return value == table_class or table_class in html.unescape(value).split()
+
+
+def _find_table(html_content: str, table_class: str) -> re.Match | None:
+    """Finds the start tag of the first table with the given class."""
+    for match in _TABLE_START_RE.finditer(html_content):
+        if _has_class(match.group(1), table_class):
+            return match
+    return None
+
+
+def _string(raw_text: List[str]) -> str:
+    """
+    Turns the raw text between two string-splitting tags into one string,
+    collapsing whitespace-only strings the way BeautifulSoup does.
+    """
+    text = "".join(raw_text)
+    if "&" in text:
+        text = html.unescape(text)
+    if not text.strip(_ASCII_SPACES):
+        return "\n" if "\n" in text else " "
+    return text
+
+
+def _cell_text(pieces: List[str], strip_strings: bool) -> str:
+    """Joins the strings of a cell like Tag.text.strip() or Tag.get_text(strip=True)."""
+    if strip_strings:
+        return "".join(piece for piece in (p.strip() for p in pieces) if piece)
+    return "".join(pieces).strip()
+
+
+def _emit(row: dict, strip_strings: bool) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Converts a finished row into its (th_texts, td_texts) pair."""
+    return (tuple(_cell_text(p, strip_strings) for p in row["th"]),
+            tuple(_cell_text(p, strip_strings) for p in row["td"]))
+
+
+def _walk_table(html_content: str, pos: int, strip_strings: bool) -> Iterator[Tuple[Tuple[str, ...], Tuple[str, ...]]]:
+    """Tokenizes the markup after a table start tag and yields its rows as they complete."""
+    stack = ["table"]
+    open_rows: List[dict] = []    # rows whose </tr> has not been seen yet
+    open_cells: List[list] = []   # text pieces of every open <td>/<th>
+    pending = deque()             # rows in start order, waiting to be emitted
+    closed_voids: List[str] = []  # void tags whose redundant end tag is swallowed
+    text: List[str] = []          # text since the last tag that split strings
+
+    while True:
+        match = _TOKEN_RE.search(html_content, pos)
+        if not match:
+            break
+        if match.start() > pos:
+            text.append(html_content[pos:match.start()])
+        pos = match.end()
+
+        name = match.group(2)
+        is_end = bool(match.group(1))
+        if name is not None:
+            name = name.lower()
+            if is_end and name in closed_voids:
+                # "<br>...</br>": the end tag neither closes anything nor splits the text
+                closed_voids.remove(name)
+                continue
+
+        if text:
+            if open_cells:
+                string = _string(text)
+                for pieces in open_cells:
+                    pieces.append(string)
+            text.clear()
+
+        if name is None:
+            # Comments and declarations only split the surrounding text
+            continue
+
+        if not is_end:
+            self_closing = match.group(3).endswith("/")
+            if name in _VOID_TAGS:
+                if not self_closing:
+                    closed_voids.append(name)
+                elif name in closed_voids:
+                    # BeautifulSoup lets "<br/>" consume a pending "<br>" close and leaves it open
+                    closed_voids.remove(name)
+                    stack.append(name)
+                continue
+            if self_closing:
+                # Self-closing tags open and close immediately
+                if name == "tr":
+                    pending.append({"td": [], "th": [], "closed": True})
+                elif name in ("td", "th"):
+                    for row in open_rows:
+                        row[name].append([])
+                continue
+            if name in _RAW_TEXT_END_RE:
+                end = _RAW_TEXT_END_RE[name].search(html_content, pos)
+                if not end:
+                    pos = len(html_content)
+                    break
+                pos = end.end()
+                continue
+            stack.append(name)
+            if name == "tr":
+                row = {"td": [], "th": [], "closed": False}
+                open_rows.append(row)
+                pending.append(row)
+            elif name in ("td", "th"):
+                pieces = []
+                for row in open_rows:
+                    row[name].append(pieces)
+                open_cells.append(pieces)
+            continue
+
+        if name not in stack:
+            continue
+        while stack:
+            closed = stack.pop()
+            if closed == "tr":
+                open_rows.pop()["closed"] = True
+            elif closed in ("td", "th"):
+                open_cells.pop()
+            if closed == name:
+                break
+        while pending and pending[0]["closed"]:
+            yield _emit(pending.popleft(), strip_strings)
+        if not stack:
+            return
+
+    if pos < len(html_content):
+        text.append(html_content[pos:])
+    if text and open_cells:
+        string = _string(text)
+        for pieces in open_cells:
+            pieces.append(string)
+
+    # Unterminated table: everything still open is closed by the end of the document
+    for row in pending:
+        yield _emit(row, strip_strings)
+
+
+def iter_rows(html_content: str, table_class: str = DEFAULT_TABLE_CLASS,
+              strip_strings: bool = False) -> Iterator[Tuple[Tuple[str, ...], Tuple[str, ...]]]:
+    """
+    Streams the rows of the first table with the given class.
+    Yields a (th_texts, td_texts) pair for every <tr>, in document order.
+    With strip_strings=True each text fragment is stripped before joining,
+    matching BeautifulSoup's get_text(strip=True); otherwise the joined cell
+    text is stripped, matching .text.strip().
+    """
+    table_match = _find_table(html_content, table_class)
+    if table_match:
+        yield from _walk_table(html_content, table_match.end(), strip_strings)
+
+
+def extract_rows(html_content: str, table_class: str = DEFAULT_TABLE_CLASS,
+                 strip_strings: bool = False) -> List[Tuple[str, ...]] | None:
+    """
+    Returns the <td> texts of every row after the header row.
+    Returns None if the page has no matching table.
+    """
+    table_match = _find_table(html_content, table_class)
+    if not table_match:
+        return None
+    rows = _walk_table(html_content, table_match.end(), strip_strings)
+    next(rows, None)
+    return [td for _, td in rows]
+
+
+def extract_table(html_content: str, table_class: str = DEFAULT_TABLE_CLASS,
+                  strip_strings: bool = True) -> Tuple[Tuple[str, ...], List[Tuple[str, ...]]] | None:
+    """
+    Returns the header (<th> texts of the first row) and the <td> texts of the remaining rows.
+    Returns None if the page has no matching table.
+    """
+    table_match = _find_table(html_content, table_class)
+    if not table_match:
+        return None
+    rows = _walk_table(html_content, table_match.end(), strip_strings)
+    first = next(rows, None)
+    header = first[0] if first else ()
+    return header, [td for _, td in rows]
@@ -0,0 +1,93 @@
+# modules/common/match_index.py
+
+import os
+import sqlite3
+from contextlib import closing
+from typing import Iterable, Set, Tuple
+
+from modules.common import path_manager
+
+# Every dataset that pages through matches keeps its own namespace in the index
+CONDUCT_SUMMARY = "conduct_summary"
+PLAYSTYLE_STATS = "playstyle_stats"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    dataset    TEXT    NOT NULL,
+    match_id   INTEGER NOT NULL,
+    match_date TEXT,
+    PRIMARY KEY (dataset, match_id)
+) WITHOUT ROWID
+"""
+
+# --- Helper functions ---
+
+def _connect(profile_name: str) -> sqlite3.Connection:
+    """Opens the profile's index, creating it on first use."""
+    index_path = path_manager.get_match_index_path(profile_name)
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    conn = sqlite3.connect(index_path, timeout=30)
+    conn.execute(_SCHEMA)
+    return conn
+
+
+def _to_match_id(value) -> int | None:
+    """Converts a MatchID cell to an integer, ignoring anything that isn't one."""
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+# --- Main public functions ---
+
+def is_empty(profile_name: str, dataset: str) -> bool:
+    """Returns True if no MatchIDs have been recorded for the dataset yet."""
+    with closing(_connect(profile_name)) as conn:
+        return conn.execute("SELECT 1 FROM matches WHERE dataset = ? LIMIT 1", (dataset,)).fetchone() is None
+
+
+def latest(profile_name: str, dataset: str) -> Tuple[int, str | None] | None:
+    """Returns the highest known (MatchID, date) pair for the dataset, or None."""
+    with closing(_connect(profile_name)) as conn:
+        return conn.execute(
+            "SELECT match_id, match_date FROM matches WHERE dataset = ? ORDER BY match_id DESC LIMIT 1",
+            (dataset,)
+        ).fetchone()
+
+
+def find_known(profile_name: str, dataset: str, match_ids: Iterable) -> Set[str]:
+    """Returns the subset of the given MatchIDs (as passed in) that are already indexed."""
+    candidates = {}
+    for value in match_ids:
+        match_id = _to_match_id(value)
+        if match_id is not None:
+            candidates[match_id] = value
+    if not candidates:
+        return set()
+
+    known = set()
+    keys = list(candidates)
+    with closing(_connect(profile_name)) as conn:
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT match_id FROM matches WHERE dataset = ? AND match_id IN ({placeholders})",
+                [dataset, *chunk]
+            )
+            known.update(candidates[row[0]] for row in rows)
+    return known
+
+
+def add(profile_name: str, dataset: str, entries: Iterable[Tuple]):
+    """Records (MatchID, date) pairs; already known MatchIDs are left untouched."""
+    values = [(dataset, match_id, date) for match_id, date in
+              ((_to_match_id(entry[0]), entry[1] if len(entry) > 1 else None) for entry in entries)
+              if match_id is not None]
+    if not values:
+        return
+    with closing(_connect(profile_name)) as conn, conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO matches (dataset, match_id, match_date) VALUES (?, ?, ?)", values
+        )
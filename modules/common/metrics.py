@@ -0,0 +1,153 @@
+# modules/common/metrics.py
+
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Iterator, List
+
+from modules.common import path_manager
+
+# Lightweight instrumentation for syncs. record_run() makes a RunMetrics the current
+# one for the calling context; timer() and incr() anywhere below it (HTTP layer,
+# downloaders, processors) add to it and do nothing when no run is active. Work handed
+# to another thread keeps recording only if it runs in a copy of the context, see
+# wrap(). Finished runs are appended to a rolling JSON-lines history per profile.
+
+MAX_HISTORY_RUNS = 200
+
+_current: contextvars.ContextVar["RunMetrics | None"] = contextvars.ContextVar("current_run_metrics", default=None)
+_history_lock = threading.Lock()
+
+
+class RunMetrics:
+    """Timings and counters collected while one dataset of one profile is synced."""
+
+    def __init__(self, profile_name: str, dataset: str):
+        self.profile_name = profile_name
+        self.dataset = dataset
+        self.started_at = datetime.now()
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, float] = {}
+        self.result: Dict[str, Any] = {}
+        self.lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float):
+        """Adds one duration to a timer's count, total and maximum."""
+        with self.lock:
+            timing = self.timings.setdefault(name, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            timing["count"] += 1
+            timing["total_seconds"] += seconds
+            timing["max_seconds"] = max(timing["max_seconds"], seconds)
+
+    def incr(self, name: str, value: float = 1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_record(self, seconds: float) -> Dict[str, Any]:
+        """Returns the run as a JSON-serializable history record."""
+        with self.lock:
+            return {
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "profile_name": self.profile_name,
+                "dataset": self.dataset,
+                "seconds": round(seconds, 3),
+                "result": dict(self.result),
+                "timings": {name: {"count": t["count"], "total_seconds": round(t["total_seconds"], 4),
+                                   "max_seconds": round(t["max_seconds"], 4)}
+                            for name, t in self.timings.items()},
+                "counters": dict(self.counters),
+            }
+
+# --- Helper functions ---
+
+def _append_history(profile_name: str, record: Dict[str, Any]):
+    """Appends a run to the profile's history, keeping only the newest MAX_HISTORY_RUNS."""
+    history_path = path_manager.get_metrics_history_path(profile_name)
+    os.makedirs(os.path.dirname(history_path), exist_ok=True)
+    with _history_lock:
+        lines = []
+        if os.path.exists(history_path):
+            with open(history_path, 'r', encoding='utf-8') as f:
+                lines = [line for line in f if line.strip()]
+        lines.append(json.dumps(record, separators=(',', ':'), default=str) + "\n")
+        tmp_path = history_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(lines[-MAX_HISTORY_RUNS:])
+        os.replace(tmp_path, history_path)
+
+# --- Main public functions ---
+
+def current_run() -> RunMetrics | None:
+    return _current.get()
+
+
+@contextlib.contextmanager
+def timer(name: str) -> Iterator[None]:
+    """Times the enclosed block into the current run."""
+    run = _current.get()
+    if run is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        run.observe(name, time.perf_counter() - started)
+
+
+def incr(name: str, value: float = 1):
+    """Adds to a counter of the current run."""
+    run = _current.get()
+    if run is not None:
+        run.incr(name, value)
+
+
+def wrap(func):
+    """
+    Binds a callable to a copy of the current context, so it records into the current
+    run from another thread. Wrap once per submission; a context can't run twice at once.
+    """
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(func, *args, **kwargs)
+
+
+@contextlib.contextmanager
+def record_run(profile_name: str, dataset: str, save: bool = True) -> Iterator[RunMetrics]:
+    """
+    Collects everything timed or counted inside the block into a new run and, unless
+    `save` is False, appends it to the profile's history when the block exits.
+    Store the sync's outcome (status, rows, ...) in `run.result` to keep it with the timings.
+    """
+    run = RunMetrics(profile_name, dataset)
+    token = _current.set(run)
+    started = time.perf_counter()
+    try:
+        yield run
+    finally:
+        _current.reset(token)
+        if save:
+            try:
+                _append_history(profile_name, run.to_record(time.perf_counter() - started))
+            except OSError as e:
+                print(f"⚠️ Warning: Could not save sync metrics for '{profile_name}'. Error: {e}")
+
+
+def load_history(profile_name: str, dataset: str | None = None) -> List[Dict[str, Any]]:
+    """Returns the profile's recorded runs, oldest first, optionally for one dataset only."""
+    history_path = path_manager.get_metrics_history_path(profile_name)
+    if not os.path.exists(history_path):
+        return []
+    runs = []
+    with open(history_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                run = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if dataset is None or run.get("dataset") == dataset:
+                runs.append(run)
+    return runs
@@ -0,0 +1,83 @@
+# modules/common/page_manifest.py
+
+import hashlib
+import json
+import os
+from typing import Dict, Any, List, Tuple
+
+MANIFEST_VERSION = 1
+
+
+def load_manifest(manifest_path: str) -> Dict[str, Dict[str, Any]]:
+    """Loads the processed-page manifest, returning an empty one if it is missing or unreadable."""
+    if not os.path.exists(manifest_path):
+        return {}
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (IOError, json.JSONDecodeError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("pages", {})
+
+
+def save_manifest(manifest_path: str, pages: Dict[str, Dict[str, Any]]):
+    """Saves the processed-page manifest next to the processed dataset."""
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": MANIFEST_VERSION, "pages": pages}, f)
+    os.replace(tmp_path, manifest_path)
+
+
+def fingerprint_file(file_path: str, previous: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """
+    Returns the name/size/hash entry for a raw page.
+    The file is only re-hashed when its size or mtime differ from the previous entry.
+    """
+    stat = os.stat(file_path)
+    if previous and previous.get("size") == stat.st_size and previous.get("mtime_ns") == stat.st_mtime_ns:
+        return previous
+
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest()}
+
+
+def fingerprint_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns the manifest entry for a page in the segment store, taken from its index entry."""
+    return {"size": entry["size"], "sha256": entry["sha256"]}
+
+
+def diff_pages(raw_dir: str, file_names: List[str], manifest: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, Any]], List[str], List[str]]:
+    """
+    Compares the raw pages on disk against the manifest.
+    Returns the current entries, the names of new or changed pages and the names of removed pages.
+    """
+    current, changed = {}, []
+    for file_name in file_names:
+        previous = manifest.get(file_name)
+        entry = fingerprint_file(os.path.join(raw_dir, file_name), previous)
+        current[file_name] = entry
+        if not previous or previous.get("size") != entry["size"] or previous.get("sha256") != entry["sha256"]:
+            changed.append(file_name)
+    removed = [name for name in manifest if name not in current]
+    return current, changed, removed
+
+
+def diff_entries(entries: Dict[str, Dict[str, Any]], manifest: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, Any]], List[str], List[str]]:
+    """
+    Compares the pages of a segment store index against the manifest, without reading any page.
+    Returns the current entries, the names of new or changed pages and the names of removed pages.
+    """
+    current, changed = {}, []
+    for name, entry in entries.items():
+        current[name] = fingerprint_entry(entry)
+        previous = manifest.get(name)
+        if not previous or previous.get("size") != entry["size"] or previous.get("sha256") != entry["sha256"]:
+            changed.append(name)
+    removed = [name for name in manifest if name not in current]
+    return current, changed, removed
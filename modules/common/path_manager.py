@@ -11,8 +11,13 @@ def get_profile_dir(profile_name: str) -> str:
     return os.path.join(BASE_DATA_DIR, profile_name)
 
 
+def get_analytics_db_path() -> str:
+    """Returns the path for the SQLite analytics store shared by all profiles."""
+    return os.path.join(BASE_DATA_DIR, "analytics.sqlite")
+
+
 def get_raw_conduct_summary_dir(profile_name: str) -> str:
-    """Returns the path for raw conduct summary JSONs."""
+    """Returns the segment store directory for raw conduct summary pages."""
     return os.path.join(get_profile_dir(profile_name), "raw_conduct_summary")
 
 
@@ -21,6 +26,16 @@ def get_conduct_summary_state_path(profile_name: str) -> str:
     return os.path.join(get_profile_dir(profile_name), "conduct_summary_state.json")
 
 
+def get_match_index_path(profile_name: str) -> str:
+    """Returns the path for the profile's index of already downloaded MatchIDs."""
+    return os.path.join(get_profile_dir(profile_name), "match_index.sqlite")
+
+
+def get_metrics_history_path(profile_name: str) -> str:
+    """Returns the path for the profile's rolling history of sync run metrics."""
+    return os.path.join(get_profile_dir(profile_name), "metrics_history.jsonl")
+
+
 def get_raw_ranked_stats_path(profile_name: str) -> str:
     """Returns the file path for the raw ranked stats HTML."""
     profile_dir = get_profile_dir(profile_name)
@@ -28,8 +43,13 @@ def get_raw_ranked_stats_path(profile_name: str) -> str:
     return os.path.join(profile_dir, "raw_ranked_stats.html")
 
 
+def get_ranked_stats_state_path(profile_name: str) -> str:
+    """Returns the path for the ranked stats download state (validators and table fingerprint)."""
+    return os.path.join(get_profile_dir(profile_name), "ranked_stats_state.json")
+
+
 def get_raw_playstyle_stats_dir(profile_name: str) -> str:
-    """Returns the directory path for raw playstyle stats JSONs."""
+    """Returns the segment store directory for raw playstyle stats pages."""
     return os.path.join(get_profile_dir(profile_name), "raw_playstyle_stats")
 
 
@@ -42,8 +62,18 @@ def get_processed_dir(profile_name: str) -> str:
 
 
 def get_processed_conduct_summary_path(profile_name: str) -> str:
-    """Returns the full CSV file path for processed conduct summaries."""
-    return os.path.join(get_processed_dir(profile_name), "conduct_summary.csv")
+    """Returns the Parquet file path for processed conduct summaries."""
+    return os.path.join(get_processed_dir(profile_name), "conduct_summary.parquet")
+
+
+def get_conduct_summary_manifest_path(profile_name: str) -> str:
+    """Returns the path for the manifest of raw pages already in the processed conduct summary."""
+    return os.path.join(get_processed_dir(profile_name), "conduct_summary_manifest.json")
+
+
+def get_processed_conduct_rollups_path(profile_name: str) -> str:
+    """Returns the Parquet file path for the daily/weekly/monthly conduct summary rollups."""
+    return os.path.join(get_processed_dir(profile_name), "conduct_rollups.parquet")
 
 
 def delete_profile_data_dir(profile_name: str):
@@ -54,10 +84,30 @@ def delete_profile_data_dir(profile_name: str):
 
 
 def get_processed_ranked_stats_path(profile_name: str) -> str:
-    """Returns the CSV file path for processed ranked stats."""
-    return os.path.join(get_processed_dir(profile_name), "ranked_hero_stats.csv")
+    """Returns the Parquet file path for processed ranked stats."""
+    return os.path.join(get_processed_dir(profile_name), "ranked_hero_stats.parquet")
+
+
+def get_ranked_stats_manifest_path(profile_name: str) -> str:
+    """Returns the path for the manifest of the raw ranked stats page already in the processed dataset."""
+    return os.path.join(get_processed_dir(profile_name), "ranked_hero_stats_manifest.json")
 
 
 def get_processed_playstyle_stats_path(profile_name: str) -> str:
-    """Returns the CSV file path for processed playstyle stats."""
-    return os.path.join(get_processed_dir(profile_name), "playstyle_stats.csv")
+    """Returns the Parquet file path for processed playstyle stats."""
+    return os.path.join(get_processed_dir(profile_name), "playstyle_stats.parquet")
+
+
+def get_playstyle_stats_manifest_path(profile_name: str) -> str:
+    """Returns the path for the manifest of raw pages already in the processed playstyle stats."""
+    return os.path.join(get_processed_dir(profile_name), "playstyle_stats_manifest.json")
+
+
+def get_processed_playstyle_aggregates_path(profile_name: str) -> str:
+    """Returns the Parquet file path for the per-hero, per-window playstyle aggregates."""
+    return os.path.join(get_processed_dir(profile_name), "playstyle_aggregates.parquet")
+
+
+def get_legacy_processed_csv_path(profile_name: str, dataset: str) -> str:
+    """Returns the pre-Parquet CSV file path for a processed dataset."""
+    return os.path.join(get_processed_dir(profile_name), f"{dataset}.csv")
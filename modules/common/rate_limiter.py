@@ -0,0 +1,172 @@
+# modules/common/rate_limiter.py
+
+import random
+import threading
+import time
+import requests
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any
+from urllib.parse import urlsplit
+
+from modules.common import metrics
+
+# Starting pace matches the old fixed 2-second delay; the bucket speeds up while
+# Steam answers normally and halves its rate whenever it pushes back.
+DEFAULT_REQUESTS_PER_SECOND = 0.5
+DEFAULT_MIN_REQUESTS_PER_SECOND = 0.05
+DEFAULT_MAX_REQUESTS_PER_SECOND = 2.0
+SUCCESSES_BEFORE_SPEEDUP = 10
+SPEEDUP_STEP = 0.1
+MAX_BACKOFF_SECONDS = 120
+
+THROTTLE_STATUSES = (429, 503)
+RETRY_STATUSES = (408, 429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with additive-increase / multiplicative-decrease pacing.
+    One bucket is shared by every downloader and profile talking to the same host.
+    """
+
+    def __init__(self, rate: float, min_rate: float, max_rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.successes = 0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self):
+        """Blocks until a request may be sent."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def record_success(self):
+        """Speeds up a little after a run of healthy responses."""
+        with self.lock:
+            self.successes += 1
+            if self.successes >= SUCCESSES_BEFORE_SPEEDUP:
+                self.rate = min(self.max_rate, self.rate + SPEEDUP_STEP)
+                self.successes = 0
+
+    def record_throttle(self, retry_after: float | None = None):
+        """Halves the rate and, if the server said so, pauses the host until Retry-After has passed."""
+        with self.lock:
+            now = time.monotonic()
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.successes = 0
+            self.tokens = 0
+            self.updated_at = now
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+# --- Helper functions ---
+
+def get_bucket(url: str, config: Dict[str, Any] | None = None) -> TokenBucket:
+    """Returns the shared bucket for the URL's host, creating it from the config on first use."""
+    host = urlsplit(url).netloc.lower()
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            config = config or {}
+            bucket = TokenBucket(
+                rate=config.get("requests_per_second", DEFAULT_REQUESTS_PER_SECOND),
+                min_rate=config.get("min_requests_per_second", DEFAULT_MIN_REQUESTS_PER_SECOND),
+                max_rate=config.get("max_requests_per_second", DEFAULT_MAX_REQUESTS_PER_SECOND),
+            )
+            _buckets[host] = bucket
+        return bucket
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parses a Retry-After header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def backoff_delay(attempt: int, initial_backoff: float) -> float:
+    """Exponential backoff with jitter, so parallel downloaders don't retry in lockstep."""
+    ceiling = min(MAX_BACKOFF_SECONDS, initial_backoff * (2 ** attempt))
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+# --- Main public function ---
+
+def get(session: requests.Session, url: str, config: Dict[str, Any] | None = None, **kwargs) -> requests.Response:
+    """
+    Sends a GET request paced by the host's shared token bucket.
+    Throttling and server errors are retried, honoring Retry-After on 429/503 and
+    using jittered exponential backoff otherwise. Returns the last response;
+    re-raises the last connection error if no response was ever received.
+    """
+    config = config or {}
+    retries = max(1, config.get("max_retries", 5))
+    initial_backoff = config.get("initial_backoff_seconds", 5)
+    bucket = get_bucket(url, config)
+    kwargs.setdefault("timeout", 30)
+
+    for attempt in range(retries):
+        if attempt:
+            metrics.incr("http.retries")
+        with metrics.timer("http.rate_limit_wait"):
+            bucket.acquire()
+        try:
+            with metrics.timer("http.request"):
+                response = session.get(url, **kwargs)
+        except requests.exceptions.RequestException as e:
+            metrics.incr("http.connection_errors")
+            if attempt == retries - 1:
+                raise
+            delay = backoff_delay(attempt, initial_backoff)
+            print(f"⚠️ An error occurred: {e}. Retrying in {delay:.1f}s...")
+            with metrics.timer("http.backoff"):
+                time.sleep(delay)
+            continue
+
+        metrics.incr("http.requests")
+        metrics.incr("http.bytes", len(response.content))
+        if response.status_code not in RETRY_STATUSES:
+            if 200 <= response.status_code < 300 or response.status_code == 304:
+                # Auth failures and other errors say nothing about how fast the host lets us go
+                bucket.record_success()
+            return response
+
+        metrics.incr(f"http.status_{response.status_code}")
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if response.status_code in THROTTLE_STATUSES:
+            bucket.record_throttle(retry_after)
+        if attempt == retries - 1:
+            return response
+        delay = retry_after if retry_after is not None else backoff_delay(attempt, initial_backoff)
+        print(f"⚠️ Warning: Received status {response.status_code}. Retrying in {delay:.1f}s...")
+        if response.status_code not in THROTTLE_STATUSES or retry_after is None:
+            with metrics.timer("http.backoff"):
+                time.sleep(delay)
+
+    return response
@@ -0,0 +1,235 @@
+# modules/common/schemas.py
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import Dict, List, Tuple, Callable
+
+# One declarative column list per dataset. Each column has a kind, and the kind decides
+# both the compact pandas dtype the processors produce and the Arrow type stored in
+# Parquet, so the conversion pass and the on-disk schema can't drift apart. convert()
+# accepts raw table text as well as already typed or older, wider columns, so it is
+# used for parsing, for conforming before a write and for upgrading older files.
+
+CONDUCT_SUMMARY = "conduct_summary"
+PLAYSTYLE_STATS = "playstyle_stats"
+RANKED_HERO_STATS = "ranked_hero_stats"
+CONDUCT_ROLLUPS = "conduct_rollups"
+PLAYSTYLE_AGGREGATES = "playstyle_aggregates"
+
+ID = "id"                # MatchIDs exceed int32
+TIMESTAMP = "timestamp"  # "YYYY-MM-DD HH:MM:SS GMT" in the raw tables
+FLAG = "flag"            # "Yes"/"No" in the raw tables
+COUNT = "count"          # whole numbers, nullable
+SCORE = "score"          # fractional numbers
+TOTAL = "total"          # running sums over many rows, kept at full precision
+CATEGORY = "category"    # short strings repeated across rows, e.g. hero names
+
+# As found in the raw tables, and as stored in SQLite and older CSVs
+TIMESTAMP_FORMATS = ("%Y-%m-%d %H:%M:%S GMT", "%Y-%m-%d %H:%M:%S")
+
+# Playstyle columns summed per hero and window in PLAYSTYLE_AGGREGATES
+PLAYSTYLE_AGGREGATE_METRICS = ("FightScore", "FarmScore", "PushScore", "Versatility", "Assists", "Heals", "GPM", "XPPM")
+
+COLUMNS: Dict[str, List[Tuple[str, str]]] = {
+    CONDUCT_SUMMARY: [
+        ("MatchID", ID),
+        ("SummaryDate", TIMESTAMP),
+        ("Periodic", FLAG),
+        ("ExcessiveReports", FLAG),
+        ("ExcessiveAbandons", FLAG),
+        ("MatchCount", COUNT),
+        ("PositiveMatches", COUNT),
+        ("ReportedMatches", COUNT),
+        ("AbandonedMatches", COUNT),
+        ("Reports", COUNT),
+        ("ReportingParties", COUNT),
+        ("CommsReports", COUNT),
+        ("CommsReportingParties", COUNT),
+        ("Commends", COUNT),
+        ("BehaviorScore", COUNT),
+    ],
+    PLAYSTYLE_STATS: [
+        ("MatchID", ID),
+        ("Timestamp", TIMESTAMP),
+        ("Hero", CATEGORY),
+        ("FightScore", SCORE),
+        ("FarmScore", SCORE),
+        ("PushScore", SCORE),
+        ("Versatility", SCORE),
+        ("Kills", COUNT),
+        ("Deaths", COUNT),
+        ("Assists", COUNT),
+        ("LastHits", COUNT),
+        ("Denies", COUNT),
+        ("GPM", SCORE),
+        ("XPPM", SCORE),
+        ("NetWorth", COUNT),
+        ("Damage", COUNT),
+        ("Heals", COUNT),
+    ],
+    # One row per day, week and month with conduct summaries, derived from CONDUCT_SUMMARY
+    CONDUCT_ROLLUPS: [
+        ("Period", CATEGORY),
+        ("PeriodStart", TIMESTAMP),
+        ("Summaries", COUNT),
+        ("BehaviorScore", SCORE),
+        ("BehaviorScoreMin", COUNT),
+        ("BehaviorScoreMax", COUNT),
+        ("BehaviorScoreLast", COUNT),
+        ("MatchCount", COUNT),
+        ("Commends", COUNT),
+        ("Reports", COUNT),
+        ("ReportedMatches", COUNT),
+        ("CommsReports", COUNT),
+    ],
+    # Sums and non-missing counts per window and hero, derived from PLAYSTYLE_STATS
+    PLAYSTYLE_AGGREGATES: [
+        ("Window", CATEGORY),
+        ("Hero", CATEGORY),
+        ("Matches", COUNT),
+        *[(f"{metric}{suffix}", kind) for metric in PLAYSTYLE_AGGREGATE_METRICS
+          for suffix, kind in (("Sum", TOTAL), ("Count", COUNT))],
+    ],
+    # The hero standings table can grow new columns; unknown ones are treated as scores.
+    RANKED_HERO_STATS: [
+        ("Hero", CATEGORY),
+        ("Wins", COUNT),
+        ("Losses", COUNT),
+        ("WinRate", SCORE),
+    ],
+}
+
+EXTRA_COLUMN_KIND: Dict[str, str] = {
+    RANKED_HERO_STATS: SCORE,
+}
+
+ARROW_TYPES: Dict[str, pa.DataType] = {
+    ID: pa.int64(),
+    TIMESTAMP: pa.timestamp("ns"),
+    FLAG: pa.bool_(),
+    COUNT: pa.int32(),
+    SCORE: pa.float32(),
+    TOTAL: pa.float64(),
+    CATEGORY: pa.dictionary(pa.int32(), pa.string()),
+}
+
+PANDAS_DTYPES: Dict[str, str] = {
+    ID: "Int64",
+    TIMESTAMP: "datetime64[ns]",
+    FLAG: "bool",
+    COUNT: "Int32",
+    SCORE: "float32",
+    TOTAL: "float64",
+    CATEGORY: "category",
+}
+
+# --- Helper functions ---
+
+def _from_arrow(array: pa.Array, like: pd.Series) -> pd.Series:
+    return pd.Series(array.to_numpy(zero_copy_only=False), index=like.index, name=like.name)
+
+
+def _as_arrow_strings(series: pd.Series) -> pa.Array | None:
+    """Returns the column as an Arrow string array, or None if it holds anything but text and missing values."""
+    if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+        return None
+    try:
+        return pa.array(series, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+
+
+def _to_number(series: pd.Series, arrow_type: pa.DataType) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series
+    text = _as_arrow_strings(series)
+    if text is not None:
+        # Arrow's cast is several times faster than to_numeric on text, but all-or-nothing;
+        # anything it rejects (blanks, stray characters) goes through to_numeric instead
+        try:
+            return _from_arrow(pc.cast(text, arrow_type), series)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            pass
+    return pd.to_numeric(series, errors='coerce')
+
+
+def _to_timestamp(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.astype("datetime64[ns]")
+    text = _as_arrow_strings(series)
+    if text is not None:
+        for fmt in TIMESTAMP_FORMATS:
+            parsed = pc.strptime(text, format=fmt, unit="ns", error_is_null=True)
+            if parsed.null_count == text.null_count:
+                return _from_arrow(parsed, series)
+    # Mixed or unexpected formats: let pandas work it out
+    text = series.astype("string").str.removesuffix(" GMT")
+    return pd.to_datetime(text, format="ISO8601", errors='coerce').astype("datetime64[ns]")
+
+
+def _to_flag(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_bool_dtype(series):
+        return series.astype(bool)
+    if pd.api.types.is_numeric_dtype(series):
+        # SQLite hands flags back as 0/1
+        return series.fillna(0).astype(bool)
+    return series.isin(["Yes", "True", True])
+
+
+def _to_category(series: pd.Series) -> pd.Series:
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Drop categories left over from filtering or merging so group-bys stay small
+        return series.cat.remove_unused_categories()
+    return series.astype("category")
+
+
+CONVERTERS: Dict[str, Callable[[pd.Series], pd.Series]] = {
+    ID: lambda s: _to_number(s, pa.int64()).astype("Int64"),
+    TIMESTAMP: _to_timestamp,
+    FLAG: _to_flag,
+    COUNT: lambda s: _to_number(s, pa.int32()).astype("Int32"),
+    SCORE: lambda s: _to_number(s, pa.float32()).astype("float32"),
+    TOTAL: lambda s: _to_number(s, pa.float64()).astype("float64"),
+    CATEGORY: _to_category,
+}
+
+# --- Main public functions ---
+
+def column_names(dataset: str) -> List[str]:
+    """Returns a dataset's declared columns in order."""
+    return [name for name, _ in COLUMNS[dataset]]
+
+
+def column_kind(dataset: str, column: str) -> str | None:
+    """Returns the kind of a column, the dataset's extra-column kind for undeclared ones, or None if it isn't allowed."""
+    for name, kind in COLUMNS[dataset]:
+        if name == column:
+            return kind
+    return EXTRA_COLUMN_KIND.get(dataset)
+
+
+def arrow_schema(dataset: str, columns: List[str] | None = None) -> pa.Schema:
+    """Returns the Arrow schema for a dataset, in the given column order (declared order by default)."""
+    fields = []
+    for col in columns or column_names(dataset):
+        kind = column_kind(dataset, col)
+        if kind is None:
+            raise ValueError(f"Column '{col}' is not part of the '{dataset}' schema.")
+        fields.append(pa.field(col, ARROW_TYPES[kind]))
+    return pa.schema(fields)
+
+
+def convert(df: pd.DataFrame, dataset: str) -> pd.DataFrame:
+    """
+    Converts every column of a DataFrame to the compact dtype of its kind, one
+    vectorized operation per column. Raw strings are parsed; unparseable values
+    become missing. Columns that already have the right dtype are left alone.
+    """
+    df = df.copy()
+    for col in df.columns:
+        kind = column_kind(dataset, col)
+        if kind is None or str(df[col].dtype) == PANDAS_DTYPES[kind] and kind != CATEGORY:
+            continue
+        df[col] = CONVERTERS[kind](df[col])
+    return df
@@ -0,0 +1,202 @@
+# modules/common/segment_store.py
+
+import contextlib
+import hashlib
+import json
+import os
+import threading
+import zlib
+from typing import Dict, Any, List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Raw pages are stored as independently compressed records appended to a few large
+# segment files. A JSON-lines index maps every page name to its segment, offset and
+# length, so a single page can be read with one seek and no directory scan. Writing
+# a page under an existing name appends a new record; the latest index entry wins.
+
+INDEX_FILE_NAME = "index.jsonl"
+SEGMENT_PREFIX = "segment_"
+SEGMENT_SUFFIX = ".seg"
+MIGRATED_SUFFIX = ".migrated"  # legacy page files kept after migration
+LOCK_FILE_NAME = "writer.lock"
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+COMPRESSION_LEVEL = 6
+
+_dir_locks: Dict[str, threading.Lock] = {}
+_dir_locks_lock = threading.Lock()
+
+# --- Helper functions ---
+
+def _lock_for(raw_dir: str) -> threading.Lock:
+    """Returns the lock that serializes the writer threads of one store."""
+    key = os.path.abspath(raw_dir)
+    with _dir_locks_lock:
+        return _dir_locks.setdefault(key, threading.Lock())
+
+
+def _lock_file(f):
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return
+    f.seek(0)
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:  # LK_LOCK gives up after ten seconds; keep waiting
+            continue
+
+
+def _unlock_file(f):
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextlib.contextmanager
+def _writer_lock(raw_dir: str):
+    """
+    Holds a store for a single writer. The thread lock covers writers in this process, and
+    an OS lock on the store's lock file covers other processes, e.g. the sync CLI running
+    next to the app, which would otherwise append to a segment at the same offset.
+    """
+    with _lock_for(raw_dir):
+        os.makedirs(raw_dir, exist_ok=True)
+        with open(os.path.join(raw_dir, LOCK_FILE_NAME), 'a+b') as f:
+            _lock_file(f)
+            try:
+                yield
+            finally:
+                _unlock_file(f)
+
+
+def _index_path(raw_dir: str) -> str:
+    return os.path.join(raw_dir, INDEX_FILE_NAME)
+
+
+def _segment_name(number: int) -> str:
+    return f"{SEGMENT_PREFIX}{number:05d}{SEGMENT_SUFFIX}"
+
+
+def _current_segment(raw_dir: str) -> str:
+    """Returns the segment new records go to, starting a new one once the last is full."""
+    segments = sorted(f for f in os.listdir(raw_dir) if f.startswith(SEGMENT_PREFIX) and f.endswith(SEGMENT_SUFFIX))
+    if not segments:
+        return _segment_name(1)
+    last = segments[-1]
+    if os.path.getsize(os.path.join(raw_dir, last)) < SEGMENT_MAX_BYTES:
+        return last
+    return _segment_name(int(last[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]) + 1)
+
+
+def _append_records(raw_dir: str, pages: List[Tuple[str, bytes]]) -> List[Dict[str, Any]]:
+    """Appends pages to the current segment and records them in the index. Caller holds the writer lock."""
+    entries = []
+    segment = _current_segment(raw_dir)
+    segment_path = os.path.join(raw_dir, segment)
+    with open(segment_path, 'ab') as f:
+        offset = f.tell()
+        for name, data in pages:
+            record = zlib.compress(data, COMPRESSION_LEVEL)
+            f.write(record)
+            entries.append({
+                "name": name, "segment": segment, "offset": offset, "length": len(record),
+                "size": len(data), "sha256": hashlib.sha256(data).hexdigest(),
+            })
+            offset += len(record)
+        f.flush()
+        os.fsync(f.fileno())
+
+    # The index is written after the data, so it never points at bytes that are not on disk
+    with open(_index_path(raw_dir), 'a', encoding='utf-8') as f:
+        for entry in entries:
+            f.write(json.dumps(entry, separators=(',', ':')) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    return entries
+
+# --- Main public functions ---
+
+def load_index(raw_dir: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Returns the latest index entry of every stored page, in the order the pages were first written.
+    A torn last line (from an interrupted write) is ignored.
+    """
+    index_path = _index_path(raw_dir)
+    if not os.path.exists(index_path):
+        return {}
+    entries: Dict[str, Dict[str, Any]] = {}
+    with open(index_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            entries[entry["name"]] = entry
+    return entries
+
+
+def has_pages(raw_dir: str) -> bool:
+    """Returns True if the store holds at least one page or still has legacy page files."""
+    if not os.path.isdir(raw_dir):
+        return False
+    return os.path.exists(_index_path(raw_dir)) or any(f.endswith('.json') for f in os.listdir(raw_dir))
+
+
+def append_page(raw_dir: str, name: str, data: bytes) -> Dict[str, Any]:
+    """Stores one page and returns its index entry."""
+    with _writer_lock(raw_dir):
+        return _append_records(raw_dir, [(name, data)])[0]
+
+
+def read_entry(raw_dir: str, entry: Dict[str, Any]) -> bytes:
+    """Reads the page an index entry points to."""
+    with open(os.path.join(raw_dir, entry["segment"]), 'rb') as f:
+        f.seek(entry["offset"])
+        return zlib.decompress(f.read(entry["length"]))
+
+
+def migrate_directory(raw_dir: str, remove_files: bool = True) -> int:
+    """
+    Moves legacy one-file-per-page JSONs into the segment store, oldest first. Once a
+    page is safely stored its file is deleted, or renamed to `*.migrated` with
+    remove_files=False, so the next run doesn't store it again. Pages whose name is
+    already in the index are not stored twice. Returns the number of migrated pages.
+    """
+    if not os.path.isdir(raw_dir) or not any(f.endswith('.json') for f in os.listdir(raw_dir)):
+        return 0
+
+    migrated = 0
+    with _writer_lock(raw_dir):
+        # Listed under the lock, since another process may have migrated them in the meantime
+        legacy_files = [f for f in os.listdir(raw_dir) if f.endswith('.json')]
+        if not legacy_files:
+            return 0
+        print(f"   > Migrating {len(legacy_files)} raw page file(s) in '{raw_dir}' into segment storage...")
+        legacy_paths = sorted((os.path.join(raw_dir, f) for f in legacy_files), key=lambda p: (os.path.getmtime(p), p))
+        # e.g. pages of a migration that was interrupted before it removed their files
+        stored = load_index(raw_dir)
+        # Append in batches so a huge directory never has to be held in memory at once
+        for start in range(0, len(legacy_paths), 500):
+            paths = legacy_paths[start:start + 500]
+            batch = []
+            for path in paths:
+                if os.path.basename(path) not in stored:
+                    with open(path, 'rb') as f:
+                        batch.append((os.path.basename(path), f.read()))
+            if batch:
+                _append_records(raw_dir, batch)
+                migrated += len(batch)
+            for path in paths:
+                if remove_files:
+                    os.remove(path)
+                else:
+                    os.replace(path, path + MIGRATED_SUFFIX)
+    return migrated
@@ -1,13 +1,106 @@
 # modules/common/session_manager.py
 
+import json
+import socket
+import threading
 import requests
-from typing import Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from typing import Dict, Any, Tuple
 
-def create_session(profile: Dict[str, Any]) -> requests.Session:
-    """Creates and configures a requests session with user cookies."""
+DEFAULT_STEAM_BASE_URL = "https://steamcommunity.com"
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36"
+
+# Sessions are pooled per profile and kept for the life of the process, so every tab
+# refresh, background job and dataset of a profile reuses the same keep-alive
+# connections instead of paying a TCP and TLS handshake per sync. A profile only ever
+# talks to one or two hosts, one dataset at a time, so the pools stay small.
+DEFAULT_POOL_SIZE = 4
+# The adapters don't retry anything themselves: connection errors, 429 and 5xx are all
+# retried by rate_limiter, which paces and backs off per host. A second retry layer down
+# here would multiply the attempts behind every one of its retries.
+
+_sessions: Dict[str, Tuple[str, requests.Session]] = {}
+_sessions_lock = threading.Lock()
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose sockets use TCP keep-alive, so idle pooled connections that died are noticed."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("socket_options", HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)])
+        super().init_poolmanager(*args, **kwargs)
+
+
+# --- Helper functions ---
+
+def _fingerprint(profile: Dict[str, Any], config: Dict[str, Any]) -> str:
+    """Everything a pooled session is built from; a change means the session has to be rebuilt."""
+    return json.dumps([
+        profile.get("cookies") or {},
+        config.get("http_pool_size", DEFAULT_POOL_SIZE),
+        config.get("http_compression", True),
+    ], sort_keys=True, default=str)
+
+# --- Main public functions ---
+
+def get_gcpd_url(config: Dict[str, Any] | None, custom_url: str) -> str:
+    """
+    Returns the Dota 2 personal game data (gcpd) URL of a profile. The host can be
+    pointed elsewhere, e.g. at the local mock server, with the `steam_base_url` config key.
+    """
+    base_url = ((config or {}).get("steam_base_url") or DEFAULT_STEAM_BASE_URL).rstrip("/")
+    return f"{base_url}/id/{custom_url}/gcpd/570"
+
+
+def create_session(profile: Dict[str, Any], config: Dict[str, Any] | None = None) -> requests.Session:
+    """
+    Creates and configures a requests session with user cookies and a small keep-alive
+    connection pool. Responses are compressed unless the
+    optional `http_compression` config key is false.
+    """
+    config = config or {}
     session = requests.Session()
-    session.headers.update({
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.0.0 Safari/537.36"
-    })
+    session.headers.update({"User-Agent": USER_AGENT})
+    if not config.get("http_compression", True):
+        session.headers["Accept-Encoding"] = "identity"
+    pool_size = max(1, config.get("http_pool_size", DEFAULT_POOL_SIZE))
+    adapter = KeepAliveAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
     session.cookies.update(profile["cookies"])
     return session
+
+
+def get_session(profile: Dict[str, Any], config: Dict[str, Any] | None = None) -> requests.Session:
+    """
+    Returns the profile's pooled session, creating it on first use. A new session
+    replaces it when the profile's cookies or the HTTP config keys change; the old
+    one is left open for any sync still using it and closes when it is garbage-collected.
+    """
+    config = config or {}
+    name = profile["profile_name"]
+    fingerprint = _fingerprint(profile, config)
+    with _sessions_lock:
+        pooled = _sessions.get(name)
+        if pooled and pooled[0] == fingerprint:
+            return pooled[1]
+        session = create_session(profile, config)
+        _sessions[name] = (fingerprint, session)
+    return session
+
+
+def discard_session(profile_name: str):
+    """Drops a profile's pooled session, e.g. when the profile is deleted. A sync still using it keeps it until it finishes."""
+    with _sessions_lock:
+        _sessions.pop(profile_name, None)
+
+
+def close_sessions():
+    """Closes every pooled session and its connections. Only for shutdown, when no sync is running."""
+    with _sessions_lock:
+        pooled = list(_sessions.values())
+        _sessions.clear()
+    for _, session in pooled:
+        session.close()
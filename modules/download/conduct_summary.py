@@ -3,17 +3,16 @@
 import requests
 import json
 import os
-import time
-from bs4 import BeautifulSoup
-from typing import Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Tuple
 
 # Import from our new common modules
-from modules.common import path_manager
+from modules.common import path_manager, html_table, rate_limiter, match_index, dataset_store, segment_store, session_manager, metrics
 
 # --- Helper functions (previously methods of the Downloader class) ---
 
-BASE_URL_TEMPLATE = "https://steamcommunity.com/id/{custom_url}/gcpd/570"
-
 def _load_state(state_file: str) -> str | None:
     if not os.path.exists(state_file): return None
     try:
@@ -26,47 +25,83 @@ def _save_state(state_file: str, token: str):
 def _clear_state(state_file: str):
     if os.path.exists(state_file): os.remove(state_file)
 
-def _get_latest_local_match_id(data_dir: str) -> str | None:
-    if not os.path.exists(data_dir) or not os.listdir(data_dir): return None
-    files = [os.path.join(data_dir, f) for f in os.listdir(data_dir) if f.endswith('.json')]
-    if not files: return None
-    latest_file = max(files, key=os.path.getctime)
+def _seed_match_index(profile_name: str, data_dir: str):
+    """
+    One-time fill of the MatchID index for profiles downloaded before it existed,
+    from the processed dataset if there is one, otherwise from the raw pages.
+    """
     try:
-        with open(latest_file, 'r', encoding='utf-8') as f: data = json.load(f)
-        soup = BeautifulSoup(data.get("html", ""), "html.parser")
-        first_row = soup.find("table").find("tr").find_next_sibling("tr")
-        return first_row.find("td").text.strip() if first_row else None
+        df = dataset_store.read_dataset(profile_name, dataset_store.CONDUCT_SUMMARY, columns=['MatchID', 'SummaryDate'])
     except Exception as e:
-        print(f"⚠️ Could not read last MatchID from '{latest_file}': {e}")
-        return None
-
-def _fetch_batch(session: requests.Session, custom_url: str, session_id: str, config: Dict[str, Any], continue_token: str = None) -> Dict | None:
-    base_url = BASE_URL_TEMPLATE.format(custom_url=custom_url)
+        print(f"⚠️ Could not read processed Conduct Summary: {e}")
+        df = None
+
+    if df is not None and not df.empty:
+        entries = zip(df['MatchID'].astype(str), df['SummaryDate'].dt.strftime('%Y-%m-%d %H:%M:%S GMT'))
+    else:
+        entries = []
+        for entry in segment_store.load_index(data_dir).values():
+            try:
+                data = json.loads(segment_store.read_entry(data_dir, entry))
+                entries.extend(html_table.extract_rows(data.get("html", "")) or [])
+            except Exception as e:
+                print(f"⚠️ Could not read MatchIDs from '{entry['name']}': {e}")
+    match_index.add(profile_name, match_index.CONDUCT_SUMMARY, entries)
+
+def _parse_date(value: str | None) -> datetime | None:
+    try: return datetime.strptime(value.replace(' GMT', '').strip(), '%Y-%m-%d %H:%M:%S')
+    except (AttributeError, ValueError): return None
+
+def _sync_fraction(newest: datetime | None, oldest: datetime | None, target: datetime | None) -> float | None:
+    """Estimates how far a sync has got by comparing the dates reached so far with the newest known date."""
+    if not (newest and oldest and target) or newest <= target: return None
+    return min(1.0, max(0.0, (newest - oldest) / (newest - target)))
+
+def _fetch_batch(session: requests.Session, custom_url: str, session_id: str, config: Dict[str, Any], continue_token: str = None) -> Tuple[Dict | None, int, str | None]:
+    """
+    Fetches one page. Returns the decoded JSON, the size of the response body and an error
+    message; on failure the JSON is None and the error says why, so it can't pass for the end of the data.
+    """
+    base_url = session_manager.get_gcpd_url(config, custom_url)
     params = {"ajax": 1, "tab": "MatchPlayerReportIncoming", "sessionid": session_id}
     if continue_token: params["continue_token"] = continue_token
-    
-    retries, backoff = config.get("max_retries", 5), config.get("initial_backoff_seconds", 5)
-    
-    for i in range(retries):
-        try:
-            time.sleep(2) # Be respectful to the API
-            response = session.get(base_url, params=params, timeout=30)
-            if response.status_code == 200: return response.json()
-            if response.status_code in [401, 403]: print("❌ FATAL: Authentication failed (401/403). Check cookies."); return None
-            print(f"⚠️ Warning: Received status {response.status_code}. Retrying...")
-        except requests.exceptions.RequestException as e:
-            print(f"⚠️ An error occurred: {e}. Retrying...")
-        time.sleep(backoff * (2 ** i))
-        
-    print(f"❌ FATAL: Failed to fetch data after {retries} retries.")
-    return None
+
+    try:
+        # Pacing, Retry-After and backoff are handled by the shared per-host rate limiter
+        response = rate_limiter.get(session, base_url, config, params=params, timeout=30)
+    except requests.exceptions.RequestException as e:
+        return None, 0, f"Failed to fetch data. Error: {e}"
+
+    size = len(response.content)
+    if response.status_code in [401, 403]: return None, size, f"Authentication failed ({response.status_code}). Check cookies."
+    if response.status_code != 200: return None, size, f"Failed to fetch data (status {response.status_code})."
+    try:
+        return response.json(), size, None
+    except ValueError as e:
+        # e.g. a login or interstitial page served with a 200
+        return None, size, f"Received a response that is not JSON. Error: {e}"
 
 # --- Main public function ---
 
-def fetch(session: requests.Session, profile: Dict[str, Any], config: Dict[str, Any]):
+def fetch(session: requests.Session, profile: Dict[str, Any], config: Dict[str, Any],
+          on_page: Callable[[str, Dict[str, Any], List[Tuple[str, ...]]], None] | None = None,
+          on_progress: Callable[..., None] | None = None, cancel_event: threading.Event | None = None) -> Dict[str, Any]:
     """
     Downloads all conduct summary data for a given profile.
     Handles historical, incremental, and resumed downloads.
+
+    Each page is parsed exactly once, as soon as it arrives. The request for the
+    next page is sent before the current one is saved, and `on_page(page_name,
+    index_entry, rows)` is called with the page's new rows while that
+    request is in flight. Already known MatchIDs are looked up in the profile's
+    MatchID index, which ends a sync and keeps duplicates out of `rows`.
+
+    `on_progress(pages=, rows=, fraction=)` is called after every page; the
+    fraction is only estimated in sync mode. Setting `cancel_event` stops the
+    download after the current page, keeping the resume state. Returns the
+    number of saved pages, bytes received, new rows, whether it was cancelled and
+    the error that stopped it early (None if it finished). A failed download keeps
+    its resume state, so the next run picks up at the page that failed.
     """
     profile_name = profile['profile_name']
     custom_url = profile['custom_url']
@@ -76,49 +111,97 @@ def fetch(session: requests.Session, profile: Dict[str, Any], config: Dict[str,
     data_dir = path_manager.get_raw_conduct_summary_dir(profile_name)
     state_file = path_manager.get_conduct_summary_state_path(profile_name)
     os.makedirs(data_dir, exist_ok=True)
+    segment_store.migrate_directory(data_dir)
+
+    if match_index.is_empty(profile_name, match_index.CONDUCT_SUMMARY) and segment_store.has_pages(data_dir):
+        print("   > Building the MatchID index from existing data (one-time)...")
+        _seed_match_index(profile_name, data_dir)
 
-    is_sync_mode = bool(os.listdir(data_dir))
-    stop_at_match_id = _get_latest_local_match_id(data_dir) if is_sync_mode else None
+    latest_known = match_index.latest(profile_name, match_index.CONDUCT_SUMMARY)
+    is_sync_mode = latest_known is not None
 
-    if is_sync_mode: print(f"\n🔄 Syncing Conduct Summary for '{profile_name}'. Will stop if MatchID '{stop_at_match_id}' is found.")
+    if is_sync_mode: print(f"\n🔄 Syncing Conduct Summary for '{profile_name}'. Will stop at the first already known MatchID (latest: '{latest_known[0]}').")
     else: print(f"\n🚀 Downloading historical Conduct Summary for '{profile_name}'.")
 
     continue_token = _load_state(state_file)
     if continue_token: print(f"   > Resuming download from a previous session.")
 
-    page_count, new_files_count = 0, 0
-    while True:
-        data = _fetch_batch(session, custom_url, session_id, config, continue_token)
+    page_count, new_files_count, new_rows_count, bytes_count = 0, 0, 0, 0
+    cancelled, error = False, None
+    target_date = _parse_date(latest_known[1]) if is_sync_mode else None
+    newest_date = None
+    prefetcher = ThreadPoolExecutor(max_workers=1)
+    next_batch = prefetcher.submit(metrics.wrap(_fetch_batch), session, custom_url, session_id, config, continue_token)
+    try:
+        while True:
+            # Time spent blocked here is network time the prefetch could not hide
+            with metrics.timer("download.wait_for_page"):
+                data, size, error = next_batch.result()
+            bytes_count += size
+            if error:
+                print(f"❌ FATAL: {error}")
+                break
 
-        if not data or not data.get("success") or not data.get("html", "").strip():
-            print("\n🏁 Reached the end of the data from the API.")
-            break
+            if not data or not data.get("success") or not data.get("html", "").strip():
+                print("\n🏁 Reached the end of the data from the API.")
+                break
 
-        page_count += 1
-        print(f"   > Fetched page {page_count}...")
+            page_count += 1
+            print(f"   > Fetched page {page_count}...")
 
-        if is_sync_mode and stop_at_match_id:
-            soup = BeautifulSoup(data.get("html", ""), "html.parser")
-            rows = soup.find("table").find_all("tr")[1:]
-            match_ids_on_page = {row.find("td").text.strip() for row in rows}
-            if stop_at_match_id in match_ids_on_page:
+            with metrics.timer("download.parse_page"):
+                rows = html_table.extract_rows(data["html"]) or []
+            with metrics.timer("download.match_index"):
+                known_ids = match_index.find_known(profile_name, match_index.CONDUCT_SUMMARY, (row[0] for row in rows if row)) if is_sync_mode else set()
+            new_rows = [row for row in rows if row and row[0] not in known_ids]
+            if known_ids and not new_rows:
                 print("   > Found last known MatchID. Sync is complete.")
                 break
 
-        new_continue_token = data.get("continue_token")
-        filepath = os.path.join(data_dir, f"{new_continue_token or 'final_page'}.json")
-        with open(filepath, 'w', encoding='utf-8') as f: json.dump(data, f, indent=2)
-        
-        new_files_count += 1
-        
-        if not new_continue_token:
-            print("\n🏁 No more continue_token found. Download complete.")
-            break
+            new_continue_token = data.get("continue_token")
+            reached_known = bool(known_ids)
+            if new_continue_token and not reached_known:
+                # Request the next page while this one is saved and processed
+                next_batch = prefetcher.submit(metrics.wrap(_fetch_batch), session, custom_url, session_id, config, new_continue_token)
+
+            page_name = f"{new_continue_token or 'final_page'}.json"
+            with metrics.timer("download.store_page"):
+                entry = segment_store.append_page(data_dir, page_name, json.dumps(data).encode('utf-8'))
+
+            new_files_count += 1
+            new_rows_count += len(new_rows)
+            if on_page: on_page(page_name, entry, new_rows)
+            with metrics.timer("download.match_index"):
+                match_index.add(profile_name, match_index.CONDUCT_SUMMARY, new_rows)
+            if on_progress:
+                dated = [row for row in rows if len(row) > 1]
+                if dated and newest_date is None: newest_date = _parse_date(dated[0][1])
+                oldest_date = _parse_date(dated[-1][1]) if dated else None
+                on_progress(pages=page_count, rows=new_rows_count, fraction=_sync_fraction(newest_date, oldest_date, target_date))
+
+            if reached_known:
+                print("   > Found last known MatchID. Sync is complete.")
+                break
+
+            if not new_continue_token:
+                print("\n🏁 No more continue_token found. Download complete.")
+                break
 
-        _save_state(state_file, new_continue_token)
-        continue_token = new_continue_token
+            _save_state(state_file, new_continue_token)
+            continue_token = new_continue_token
+
+            if cancel_event and cancel_event.is_set():
+                print("\n⏹️ Download cancelled. It will resume from here next time.")
+                cancelled = True
+                break
+    finally:
+        prefetcher.shutdown(wait=False, cancel_futures=True)
 
-    _clear_state(state_file)
+    if error:
+        print(f"\n⚠️ Conduct Summary download for '{profile_name}' stopped early after {new_files_count} page(s). It will resume from there next time.")
+        return {"pages": new_files_count, "bytes": bytes_count, "rows": new_rows_count, "cancelled": cancelled, "error": error}
+    if not cancelled: _clear_state(state_file)
     
-    if new_files_count > 0: print(f"\n✅ Success! Saved {new_files_count} new Conduct Summary file(s) for '{profile_name}'.")
-    else: print(f"\n✅ Conduct Summary for '{profile_name}' is already up to date.")
+    if new_files_count > 0: print(f"\n✅ Success! Saved {new_files_count} new Conduct Summary page(s) for '{profile_name}'.")
+    elif not cancelled: print(f"\n✅ Conduct Summary for '{profile_name}' is already up to date.")
+    return {"pages": new_files_count, "bytes": bytes_count, "rows": new_rows_count, "cancelled": cancelled, "error": None}
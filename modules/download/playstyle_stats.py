@@ -4,34 +4,73 @@ import requests
 import json
 import os
 import time
-import shutil
-from typing import Dict, Any
-from modules.common import path_manager
+import uuid
+from typing import Dict, Any, Callable
+from modules.common import path_manager, rate_limiter, html_table, match_index, dataset_store, segment_store, session_manager, metrics
 
-BASE_URL_TEMPLATE = "https://steamcommunity.com/id/{custom_url}/gcpd/570"
+# --- Helper functions ---
 
-def fetch(session: requests.Session, profile: Dict[str, Any]):
+def _seed_match_index(profile_name: str, data_dir: str):
     """
-    Downloads all playstyle stats data for a given profile by looping through the API.
+    One-time fill of the MatchID index for profiles archived before it existed,
+    from the processed dataset if there is one, otherwise from the raw pages.
+    """
+    try:
+        df = dataset_store.read_dataset(profile_name, dataset_store.PLAYSTYLE_STATS, columns=['MatchID', 'Timestamp'])
+    except Exception as e:
+        print(f"⚠️ Could not read processed Playstyle Stats: {e}")
+        df = None
+
+    if df is not None and not df.empty:
+        entries = zip(df['MatchID'].astype(str), df['Timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S GMT'))
+    else:
+        entries = []
+        for entry in segment_store.load_index(data_dir).values():
+            try:
+                data = json.loads(segment_store.read_entry(data_dir, entry))
+                entries.extend(html_table.extract_rows(data.get("html", "")) or [])
+            except Exception as e:
+                print(f"⚠️ Could not read MatchIDs from '{entry['name']}': {e}")
+    match_index.add(profile_name, match_index.PLAYSTYLE_STATS, entries)
+
+# --- Main public function ---
+
+def fetch(session: requests.Session, profile: Dict[str, Any], config: Dict[str, Any] | None = None,
+          incremental: bool = True, on_progress: Callable[..., None] | None = None) -> Dict[str, Any]:
+    """
+    Downloads playstyle stats for a given profile into its append-only raw archive.
+
+    Steam only serves the most recent matches, so pages are never deleted: every
+    run stores its pages under new names and the processor merges them into the
+    growing history. In incremental mode paging stops at the first page that
+    contains an already archived MatchID, which usually means a single request.
+    `on_progress(pages=, rows=)` is called after every stored page. There is no
+    cancellation: stopping half way would leave a gap the next sync can't see.
+    Returns the number of stored pages, bytes received and new matches.
     """
     profile_name = profile['profile_name']
     custom_url = profile['custom_url']
     session_id = profile['cookies'].get('sessionid')
-    
-    print(f"\n📥 Downloading Playstyle Stats for '{profile_name}'...")
 
     data_dir = path_manager.get_raw_playstyle_stats_dir(profile_name)
-    
-    # Clean up old data before fetching new data
-    if os.path.exists(data_dir):
-        shutil.rmtree(data_dir)
     os.makedirs(data_dir, exist_ok=True)
-    
+    segment_store.migrate_directory(data_dir)
+
+    if match_index.is_empty(profile_name, match_index.PLAYSTYLE_STATS) and segment_store.has_pages(data_dir):
+        print("   > Building the MatchID index from existing data (one-time)...")
+        _seed_match_index(profile_name, data_dir)
+
+    is_sync_mode = incremental and not match_index.is_empty(profile_name, match_index.PLAYSTYLE_STATS)
+    if is_sync_mode: print(f"\n🔄 Syncing Playstyle Stats for '{profile_name}'. Will stop at the first already archived MatchID.")
+    else: print(f"\n📥 Downloading Playstyle Stats for '{profile_name}'...")
+
+    # Pages of one run share a prefix so they sort together and never overwrite an earlier run;
+    # the random suffix keeps two runs started within the same second apart
+    run_prefix = f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}_{uuid.uuid4().hex[:8]}"
     continue_token = None
-    page_count = 0
-    
+    page_count, new_files_count, new_match_count, bytes_count = 0, 0, 0, 0
+
     while True:
-        page_count += 1
         params = {
             "ajax": 1,
             "tab": "PlayerPlaystyleStats",
@@ -41,33 +80,48 @@ def fetch(session: requests.Session, profile: Dict[str, Any]):
             params["continue_token"] = continue_token
 
         try:
-            time.sleep(1) # Be respectful to the API
-            response = session.get(BASE_URL_TEMPLATE.format(custom_url=custom_url), params=params, timeout=30)
+            response = rate_limiter.get(session, session_manager.get_gcpd_url(config, custom_url), config, params=params, timeout=30)
+            bytes_count += len(response.content)
             response.raise_for_status()
             data = response.json()
-
-            if not data or not data.get("success") or not data.get("html", "").strip():
-                print("🏁 No more data from the API.")
-                break
-            
-            print(f"   > Fetched page {page_count}...")
-            
-            new_continue_token = data.get("continue_token")
-            
-            # Save the file using the token as a unique name
-            filename = f"{new_continue_token or 'final_page'}.json"
-            filepath = os.path.join(data_dir, filename)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-
-            if not new_continue_token:
-                print("🏁 Reached the last page.")
-                break
-                
-            continue_token = new_continue_token
-
         except requests.exceptions.RequestException as e:
             print(f"❌ FATAL: Failed during download. Error: {e}")
             raise
-            
-    print(f"✅ Success! Saved {page_count} file(s) for Playstyle Stats.")
+
+        if not data or not data.get("success") or not data.get("html", "").strip():
+            print("🏁 No more data from the API.")
+            break
+
+        page_count += 1
+        print(f"   > Fetched page {page_count}...")
+
+        with metrics.timer("download.parse_page"):
+            rows = [row for row in html_table.extract_rows(data["html"]) or [] if row]
+        with metrics.timer("download.match_index"):
+            known_ids = match_index.find_known(profile_name, match_index.PLAYSTYLE_STATS, (row[0] for row in rows)) if is_sync_mode else set()
+        new_rows = [row for row in rows if row[0] not in known_ids]
+        if not new_rows:
+            print("   > No new matches on this page. Archive is up to date.")
+            break
+
+        with metrics.timer("download.store_page"):
+            segment_store.append_page(data_dir, f"{run_prefix}_{page_count:03d}.json", json.dumps(data).encode('utf-8'))
+        with metrics.timer("download.match_index"):
+            match_index.add(profile_name, match_index.PLAYSTYLE_STATS, new_rows)
+        new_files_count += 1
+        new_match_count += len(new_rows)
+        if on_progress: on_progress(pages=new_files_count, rows=new_match_count)
+
+        if known_ids:
+            print("   > Reached already archived matches. Sync is complete.")
+            break
+
+        new_continue_token = data.get("continue_token")
+        if not new_continue_token:
+            print("🏁 Reached the last page.")
+            break
+        continue_token = new_continue_token
+
+    if new_files_count > 0: print(f"✅ Success! Archived {new_match_count} new match(es) in {new_files_count} page(s) for Playstyle Stats.")
+    else: print(f"✅ Playstyle Stats for '{profile_name}' are already up to date.")
+    return {"pages": new_files_count, "bytes": bytes_count, "rows": new_match_count}
@@ -1,38 +1,93 @@
 # modules/download/ranked_hero_stats.py
 
 import requests
+import hashlib
+import json
 import os
 from typing import Dict, Any
-from modules.common import path_manager
+from modules.common import path_manager, rate_limiter, html_table, session_manager, metrics
 
-BASE_URL_TEMPLATE = "https://steamcommunity.com/id/{custom_url}/gcpd/570/?category=Stats&tab=GameHeroStandings"
+HERO_STANDINGS_QUERY = "/?category=Stats&tab=GameHeroStandings"
 
-def fetch(session: requests.Session, profile: Dict[str, Any]):
+# --- Helper functions ---
+
+def _load_state(state_file: str) -> Dict[str, Any]:
+    if not os.path.exists(state_file): return {}
+    try:
+        with open(state_file, 'r') as f: return json.load(f)
+    except (IOError, json.JSONDecodeError): return {}
+
+def _save_state(state_file: str, state: Dict[str, Any]):
+    with open(state_file, 'w') as f: json.dump(state, f)
+
+def _table_fingerprint(html_content: str) -> str | None:
+    """
+    Hashes the cell texts of the hero standings table. The rest of the page
+    (session tokens, timestamps, ads) changes on every request and is ignored.
+    """
+    digest = hashlib.sha256()
+    found = False
+    for th, td in html_table.iter_rows(html_content, strip_strings=True):
+        found = True
+        digest.update("\x1f".join(th + ("",) + td).encode('utf-8'))
+        digest.update(b"\x1e")
+    return digest.hexdigest() if found else None
+
+# --- Main public function ---
+
+def fetch(session: requests.Session, profile: Dict[str, Any], config: Dict[str, Any] | None = None) -> Dict[str, Any]:
     """
     Downloads the Ranked Hero Standings page for a given profile.
+
+    Validators from the previous download are sent as conditional headers, and
+    the raw file is only rewritten when the hero table itself has changed.
+    Returns the bytes received and whether new table content was saved.
     """
     profile_name = profile['profile_name']
     custom_url = profile['custom_url']
     
     print(f"\n📥 Downloading Ranked Hero Stats for '{profile_name}'...")
 
-    url = BASE_URL_TEMPLATE.format(custom_url=custom_url)
-    
-    try:
-        response = session.get(url, timeout=30)
-        response.raise_for_status()  # Raise an exception for bad status codes
-
-        # Get the path and ensure the directory exists
-        output_path = path_manager.get_raw_ranked_stats_path(profile_name)
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    url = session_manager.get_gcpd_url(config, custom_url) + HERO_STANDINGS_QUERY
+    output_path = path_manager.get_raw_ranked_stats_path(profile_name)
+    state_file = path_manager.get_ranked_stats_state_path(profile_name)
+    state = _load_state(state_file) if os.path.exists(output_path) else {}
 
-        # Save the HTML content
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(response.text)
-            
-        print(f"✅ Success! Raw HTML saved to:\n   {output_path}")
+    headers = {}
+    if state.get("etag"): headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"): headers["If-Modified-Since"] = state["last_modified"]
 
+    try:
+        response = rate_limiter.get(session, url, config, headers=headers, timeout=30)
+        if response.status_code == 304:
+            print("✅ Ranked Hero Stats are unchanged (not modified).")
+            return {"pages": 0, "bytes": 0, "changed": False}
+        response.raise_for_status()  # Raise an exception for bad status codes
     except requests.exceptions.RequestException as e:
         print(f"❌ FATAL: Failed to download ranked stats page. Error: {e}")
         # Raise the exception so the UI can catch it and display an error
         raise
+
+    with metrics.timer("download.fingerprint"):
+        fingerprint = _table_fingerprint(response.text)
+    new_state = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "table_sha256": fingerprint,
+    }
+
+    # Get the path and ensure the directory exists
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    if fingerprint is not None and fingerprint == state.get("table_sha256"):
+        _save_state(state_file, new_state)
+        print("✅ Ranked Hero Stats are unchanged. Keeping the existing raw file.")
+        return {"pages": 1, "bytes": len(response.content), "changed": False}
+
+    # Save the HTML content
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(response.text)
+    _save_state(state_file, new_state)
+
+    print(f"✅ Success! Raw HTML saved to:\n   {output_path}")
+    return {"pages": 1, "bytes": len(response.content), "changed": True}
@@ -0,0 +1,33 @@
+# modules/process/conduct_pages.py
+
+import json
+from typing import Dict, Any, List, Tuple
+
+from modules.common import html_table, segment_store
+
+# The per-page parsing that conduct summary processing hands to worker processes. Workers
+# are spawned, so each one imports the module of the function it runs; keeping it apart
+# from conduct_summary spares every worker the pandas and pyarrow imports.
+
+# --- Main public functions ---
+
+def parse_html_table(html_content: str) -> List[Tuple[str, ...]]:
+    """Parses the HTML table from a raw JSON file's content."""
+    try:
+        # Extract text from each cell in each row, skipping the header row
+        return html_table.extract_rows(html_content) or []
+    except Exception as e:
+        print(f"⚠️ Warning: Could not parse HTML. Error: {e}")
+        return []
+
+
+def parse_page(location: Tuple[str, Dict[str, Any]]) -> List[Tuple[str, ...]]:
+    """Reads and parses a single raw JSON page from the segment store. Runs in worker processes in parallel mode."""
+    raw_data_dir, entry = location
+    try:
+        data = json.loads(segment_store.read_entry(raw_data_dir, entry))
+        if data.get("html"):
+            return parse_html_table(data["html"])
+    except Exception as e:
+        print(f"⚠️ Warning: Could not process page '{entry['name']}'. Error: {e}")
+    return []
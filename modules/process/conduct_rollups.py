@@ -0,0 +1,61 @@
+# modules/process/conduct_rollups.py
+
+import pandas as pd
+from typing import Dict
+
+from modules.common import dataset_store, schemas, metrics
+
+# Daily, weekly and monthly aggregates of the processed conduct summaries, stored as
+# their own small dataset so charts over long histories never touch every summary.
+# They are rebuilt from the full dataset whenever it is written; grouping even years
+# of summaries takes milliseconds, so there is no incremental bookkeeping to get wrong.
+
+DAY, WEEK, MONTH = "day", "week", "month"
+PERIODS: Dict[str, str] = {DAY: "D", WEEK: "W-SUN", MONTH: "M"}  # weeks run Monday to Sunday
+
+SUMMED_COLUMNS = ['MatchCount', 'Commends', 'Reports', 'ReportedMatches', 'CommsReports']
+
+# --- Helper functions ---
+
+def _rollup(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Aggregates summaries sorted newest first into one row per period."""
+    period_start = df['SummaryDate'].dt.to_period(PERIODS[period]).dt.start_time.rename('PeriodStart')
+    grouped = df.groupby(period_start, sort=True)
+    score = grouped['BehaviorScore']
+    out = pd.DataFrame({
+        'Summaries': grouped.size(),
+        'BehaviorScore': score.mean(),
+        'BehaviorScoreMin': score.min(),
+        'BehaviorScoreMax': score.max(),
+        'BehaviorScoreLast': score.first(),  # the newest summary of the period
+    })
+    out[SUMMED_COLUMNS] = grouped[SUMMED_COLUMNS].sum()
+    out.insert(0, 'Period', period)
+    return out.reset_index()
+
+# --- Main public functions ---
+
+def build(df: pd.DataFrame) -> pd.DataFrame:
+    """Returns the rollups of a processed conduct summary DataFrame, every period oldest first."""
+    if df.empty:
+        return schemas.convert(pd.DataFrame(columns=schemas.column_names(schemas.CONDUCT_ROLLUPS)), schemas.CONDUCT_ROLLUPS)
+    # The processed dataset is already sorted newest first
+    ordered = df if df['SummaryDate'].is_monotonic_decreasing else df.sort_values('SummaryDate', ascending=False)
+    rollups = pd.concat([_rollup(ordered, period) for period in PERIODS], ignore_index=True)
+    return schemas.convert(rollups[schemas.column_names(schemas.CONDUCT_ROLLUPS)], schemas.CONDUCT_ROLLUPS)
+
+
+def write(profile_name: str, df: pd.DataFrame) -> pd.DataFrame:
+    """Rebuilds and saves the rollups of a profile's processed conduct summaries."""
+    with metrics.timer("process.rollups"):
+        rollups = build(df)
+        dataset_store.write_dataset(profile_name, dataset_store.CONDUCT_ROLLUPS, rollups)
+    return rollups
+
+
+def read(profile_name: str, period: str) -> pd.DataFrame | None:
+    """Returns one period's rollups for a profile, oldest first, or None if there are none yet."""
+    rollups = dataset_store.read_dataset(profile_name, dataset_store.CONDUCT_ROLLUPS)
+    if rollups is None:
+        return None
+    return rollups[rollups['Period'] == period].drop(columns='Period').reset_index(drop=True)
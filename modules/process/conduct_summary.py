@@ -1,105 +1,204 @@
 # modules/process/conduct_summary.py
 
-import json
+import multiprocessing
 import os
 import pandas as pd
-from bs4 import BeautifulSoup
-from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Tuple
 
 # Import from our new common modules
-from modules.common import path_manager
+from modules.common import path_manager, page_manifest, dataset_store, analytics_store, segment_store, metrics, schemas
+from modules.process import conduct_rollups, conduct_pages
 
-# --- Helper function (previously a method) ---
+COLUMN_NAMES = schemas.column_names(schemas.CONDUCT_SUMMARY)
 
-def _parse_html_table(html_content: str) -> List[List[str]]:
-    """Parses the HTML table from a raw JSON file's content."""
+# Below this many pages, starting worker processes costs more than it saves. Spawned
+# workers start a fresh interpreter each, so the bar is higher than it would be with fork
+PARALLEL_MIN_FILES = 256
+
+# --- Helper functions ---
+
+def _parse_pages(raw_data_dir: str, entries: List[Dict[str, Any]], workers: int | None = None) -> List[Tuple[str, ...]]:
+    """
+    Reads and parses the given raw JSON pages, returning all extracted records in page order.
+    Pages are spread across a process pool when there are enough of them to be worth it.
+    """
+    locations = [(raw_data_dir, entry) for entry in entries]
+    workers = min(workers or os.cpu_count() or 1, len(locations))
+
+    all_records = []
+    if workers > 1 and len(locations) >= PARALLEL_MIN_FILES:
+        print(f"   > Parsing in parallel with {workers} worker processes...")
+        try:
+            chunksize = max(1, len(locations) // (workers * 4))
+            # Spawned, not forked: this runs in Streamlit and sync worker threads, and a forked
+            # child could inherit a lock some other thread was holding and block on it forever
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                for records in executor.map(conduct_pages.parse_page, locations, chunksize=chunksize):
+                    all_records.extend(records)
+            return all_records
+        except (OSError, BrokenProcessPool) as e:
+            print(f"⚠️ Warning: Parallel parsing unavailable, falling back to serial mode. Error: {e}")
+            all_records = []
+
+    for location in locations:
+        all_records.extend(conduct_pages.parse_page(location))
+    return all_records
+
+
+def _build_dataframe(all_records: List[Tuple[str, ...]]) -> pd.DataFrame:
+    """Converts raw table records into a typed DataFrame."""
+    print("   > Cleaning data and converting types...")
+    df = schemas.convert(pd.DataFrame(all_records, columns=COLUMN_NAMES), schemas.CONDUCT_SUMMARY)
+    return df.dropna(subset=['MatchID', 'SummaryDate'])
+
+
+def _finalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Deduplicates by MatchID (keeping the first occurrence) and sorts newest first."""
+    print("   > Finalizing data structure...")
+    df = df.drop_duplicates(subset=['MatchID'], keep='first')
+    return df.sort_values(by='SummaryDate', ascending=False)
+
+
+def _merge(all_records: List[Tuple[str, ...]], existing_df: pd.DataFrame | None) -> Tuple[pd.DataFrame, pd.DataFrame | None]:
+    """
+    Builds a DataFrame from new records and merges it into the existing dataset, if any.
+    Also returns the merged rows the new records added or replaced (None without an existing dataset).
+    """
+    new_df = _build_dataframe(all_records)
+    if existing_df is None:
+        return _finalize(new_df), None
+    # New rows come first so that rows from refreshed pages win the deduplication
+    print(f"   > Merging into {len(existing_df)} existing records...")
+    df = _finalize(pd.concat([new_df, existing_df], ignore_index=True))
+    return df, df[df['MatchID'].isin(new_df['MatchID'])]
+
+
+def _load_processed(profile_name: str) -> pd.DataFrame | None:
+    """Loads the previously processed dataset, if there is a usable one."""
     try:
-        soup = BeautifulSoup(html_content, "html.parser")
-        table = soup.find("table", class_="generic_kv_table")
-        if not table:
-            return []
-        # Extract text from each cell in each row, skipping the header row
-        data_rows = [[ele.text.strip() for ele in row.find_all('td')] for row in table.find_all("tr")[1:]]
-        return data_rows
+        df = dataset_store.read_dataset(profile_name, dataset_store.CONDUCT_SUMMARY)
     except Exception as e:
-        print(f"⚠️ Warning: Could not parse HTML. Error: {e}")
-        return []
+        print(f"⚠️ Warning: Could not read existing processed data. Error: {e}")
+        return None
+    if df is None or list(df.columns) != COLUMN_NAMES:
+        return None
+    return df
 
-# --- Main public function ---
+# --- Main public functions ---
 
-def process(profile_name: str) -> pd.DataFrame | None:
+def process(profile_name: str, incremental: bool = True, workers: int | None = None) -> pd.DataFrame | None:
     """
-    Processes all raw conduct summary JSONs for a profile into a clean DataFrame.
-    Saves the result to a CSV file.
+    Processes raw conduct summary pages for a profile into a clean DataFrame.
+    Saves the result and its daily/weekly/monthly rollups to the Parquet dataset store.
+
+    In incremental mode only pages that are new or changed since the last run
+    (according to the processed-page manifest) are parsed, and their rows are
+    merged into the existing output. A full rebuild happens when there is no
+    previous output or when raw pages have been removed.
+
+    `workers` sets the number of parsing processes (default: one per CPU);
+    small inputs and workers=1 are always parsed serially.
     """
     print(f"\n✨ Processing Conduct Summary data for '{profile_name}'...")
-    
+
     # Get paths from our centralized path manager
     raw_data_dir = path_manager.get_raw_conduct_summary_dir(profile_name)
-    processed_dir = path_manager.get_processed_dir(profile_name)
-    output_csv_path = path_manager.get_processed_conduct_summary_path(profile_name)
-    
-    # Ensure the output directory exists
-    os.makedirs(processed_dir, exist_ok=True)
-    
-    column_names = [
-        'MatchID', 'SummaryDate', 'Periodic', 'ExcessiveReports', 'ExcessiveAbandons',
-        'MatchCount', 'PositiveMatches', 'ReportedMatches', 'AbandonedMatches', 'Reports',
-        'ReportingParties', 'CommsReports', 'CommsReportingParties', 'Commends', 'BehaviorScore'
-    ]
+    manifest_path = path_manager.get_conduct_summary_manifest_path(profile_name)
 
     if not os.path.exists(raw_data_dir):
         print(f"❌ Directory not found: '{raw_data_dir}'. Please run the downloader first.")
         return None
 
-    json_files = [f for f in os.listdir(raw_data_dir) if f.endswith('.json')]
-    if not json_files:
-        print("❌ No raw data files found to process.")
+    segment_store.migrate_directory(raw_data_dir)
+    index = segment_store.load_index(raw_data_dir)
+    if not index:
+        print("❌ No raw data pages found to process.")
         return None
-        
-    print(f"   > Found {len(json_files)} files to process.")
-    
-    all_records = []
-    for file_name in json_files:
-        file_path = os.path.join(raw_data_dir, file_name)
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            if data.get("html"):
-                all_records.extend(_parse_html_table(data["html"]))
-        except Exception as e:
-            print(f"⚠️ Warning: Could not process file '{file_name}'. Error: {e}")
-    
-    if not all_records:
+
+    existing_df = _load_processed(profile_name) if incremental else None
+    manifest = page_manifest.load_manifest(manifest_path) if existing_df is not None else {}
+    current_pages, changed_pages, removed_pages = page_manifest.diff_entries(index, manifest)
+
+    if removed_pages:
+        print(f"   > {len(removed_pages)} previously processed page(s) are gone. Rebuilding from scratch.")
+        existing_df, changed_pages = None, list(index)
+
+    if existing_df is not None and not changed_pages:
+        print("\n✅ Conduct Summary is already up to date. No new pages to process.")
+        return existing_df
+
+    if existing_df is not None:
+        print(f"   > Found {len(changed_pages)} new or changed page(s) out of {len(index)}.")
+    else:
+        print(f"   > Found {len(index)} pages to process.")
+
+    with metrics.timer("process.parse_pages"):
+        all_records = _parse_pages(raw_data_dir, [index[name] for name in changed_pages], workers)
+    metrics.incr("process.pages", len(changed_pages))
+
+    if not all_records and existing_df is None:
         print("❌ No records were extracted from the raw files.")
         return None
 
     print(f"\n🔧 Processing a total of {len(all_records)} records...")
-    df = pd.DataFrame(all_records, columns=column_names)
+    with metrics.timer("process.dataframe"):
+        df, changed = _merge(all_records, existing_df)
+    metrics.incr("process.rows", len(all_records))
 
-    print("   > Cleaning data and converting types...")
-    df['SummaryDate'] = pd.to_datetime(df['SummaryDate'].str.replace(' GMT', ''), errors='coerce')
-    
-    bool_cols = ['Periodic', 'ExcessiveReports', 'ExcessiveAbandons']
-    for col in bool_cols:
-        df[col] = df[col].apply(lambda x: True if x == 'Yes' else False).astype(bool)
-    
-    numeric_cols = [c for c in column_names if c not in ['SummaryDate'] + bool_cols]
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
-
-    print("   > Finalizing data structure...")
-    df.dropna(subset=['MatchID', 'SummaryDate'], inplace=True)
-    df.drop_duplicates(subset=['MatchID'], keep='first', inplace=True)
-    df.sort_values(by='SummaryDate', ascending=False, inplace=True)
-    
-    # Convert numeric columns to integer type, handling potential NaNs
-    df[numeric_cols] = df[numeric_cols].astype('Int64')
-    
     try:
-        df.to_csv(output_csv_path, index=False)
-        print(f"\n✅ Success! Clean data saved to:\n   {output_csv_path}")
+        with metrics.timer("process.write_parquet"):
+            output_path = dataset_store.write_dataset(profile_name, dataset_store.CONDUCT_SUMMARY, df)
+        with metrics.timer("process.write_sqlite"):
+            analytics_store.write_dataset(profile_name, dataset_store.CONDUCT_SUMMARY, df, changed)
+        conduct_rollups.write(profile_name, df)
+        page_manifest.save_manifest(manifest_path, current_pages)
+        print(f"\n✅ Success! Clean data saved to:\n   {output_path}")
         return df
     except IOError as e:
-        print(f"❌ FATAL: Could not save the final CSV file. Error: {e}")
+        print(f"❌ FATAL: Could not save the processed data file. Error: {e}")
         return None
+
+
+class StreamingWriter:
+    """
+    Collects conduct summary rows as the downloader parses them, so they are never
+    parsed again, and merges them into the processed dataset in one write when the
+    download is over. Pass `add_page` as the downloader's `on_page` callback and call
+    `close()` afterwards. The manifest is only saved along with the dataset, so pages
+    of a download that died before `close()` are left to `process()`.
+    """
+
+    def __init__(self, profile_name: str):
+        self.profile_name = profile_name
+        self.manifest_path = path_manager.get_conduct_summary_manifest_path(profile_name)
+        self.existing_df = _load_processed(profile_name)
+        self.manifest = page_manifest.load_manifest(self.manifest_path) if self.existing_df is not None else {}
+        self.pending_records: List[Tuple[str, ...]] = []
+        self.pending_pages = 0
+
+    def add_page(self, page_name: str, entry: Dict[str, Any], rows: List[Tuple[str, ...]]):
+        """Queues the rows of a freshly stored raw page and records the page in the manifest."""
+        self.pending_records.extend(rows)
+        self.manifest[page_name] = page_manifest.fingerprint_entry(entry)
+        self.pending_pages += 1
+
+    def close(self) -> pd.DataFrame | None:
+        """Writes the queued rows into the processed dataset together with the updated manifest and returns the dataset."""
+        if not self.pending_pages:
+            return self.existing_df
+        if self.pending_records or self.existing_df is not None:
+            with metrics.timer("stream.dataframe"):
+                df, changed = _merge(self.pending_records, self.existing_df)
+            with metrics.timer("stream.write_parquet"):
+                dataset_store.write_dataset(self.profile_name, dataset_store.CONDUCT_SUMMARY, df)
+            with metrics.timer("stream.write_sqlite"):
+                analytics_store.write_dataset(self.profile_name, dataset_store.CONDUCT_SUMMARY, df, changed)
+            conduct_rollups.write(self.profile_name, df)
+            self.existing_df = df
+        page_manifest.save_manifest(self.manifest_path, self.manifest)
+        if self.pending_records:
+            print(f"✅ Streamed {len(self.pending_records)} record(s) into the processed Conduct Summary.")
+        self.pending_records, self.pending_pages = [], 0
+        return self.existing_df
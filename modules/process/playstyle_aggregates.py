@@ -0,0 +1,135 @@
+# modules/process/playstyle_aggregates.py
+
+import pandas as pd
+from typing import Dict
+
+from modules.common import dataset_store, schemas, metrics
+
+# Running sums and counts of the playstyle metrics per hero and window, so the pentagon
+# and hero comparisons read one precomputed row instead of averaging the whole history.
+# All-time totals are carried forward from the stored ones: matches a sync touched have
+# their previous rows taken off and their current rows added.
+# The other windows only ever cover the newest matches (per hero, the hero's newest),
+# so they are recomputed from those rows. Every window also has an ALL_HEROES row.
+
+METRICS = list(schemas.PLAYSTYLE_AGGREGATE_METRICS)
+ALL_HEROES = "All Heroes"
+
+ALL_TIME = "all"
+LAST_30_DAYS = "last_30_days"  # the 30 days up to the newest archived match
+LAST_MATCHES: Dict[str, int] = {"last_10": 10, "last_20": 20, "last_50": 50}
+WINDOWS = [ALL_TIME, *LAST_MATCHES, LAST_30_DAYS]
+
+TOTAL_COLUMNS = ['Matches'] + [f"{metric}{suffix}" for metric in METRICS for suffix in ("Sum", "Count")]
+
+# --- Helper functions ---
+
+def _totals(rows: pd.DataFrame, by_hero: bool) -> pd.DataFrame:
+    """Sums and non-missing counts of every metric, per hero or as a single ALL_HEROES row, indexed by Hero."""
+    values = rows[METRICS].astype('float64')
+    if by_hero:
+        grouped = values.groupby(rows['Hero'], observed=True)
+        matches, sums, counts = grouped.size(), grouped.sum(), grouped.count()
+        matches.index = sums.index = counts.index = matches.index.astype(str)
+    else:
+        matches = pd.Series({ALL_HEROES: len(values)})
+        sums, counts = values.sum().to_frame(ALL_HEROES).T, values.count().to_frame(ALL_HEROES).T
+    out = pd.concat([matches.rename('Matches'), sums.add_suffix('Sum'), counts.add_suffix('Count')], axis=1)
+    out.index.name = 'Hero'
+    return out[TOTAL_COLUMNS]
+
+
+def _window(overall_rows: pd.DataFrame, hero_rows: pd.DataFrame) -> pd.DataFrame:
+    return pd.concat([_totals(overall_rows, by_hero=False), _totals(hero_rows, by_hero=True)])
+
+
+def _to_dataset(windows: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    frames = [totals.reset_index().assign(Window=window) for window, totals in windows.items()]
+    out = pd.concat(frames, ignore_index=True)
+    return schemas.convert(out[schemas.column_names(schemas.PLAYSTYLE_AGGREGATES)], schemas.PLAYSTYLE_AGGREGATES)
+
+
+def _stored_all_time(profile_name: str, expected_matches: int) -> pd.DataFrame | None:
+    """Returns the stored all-time totals if they cover exactly `expected_matches` matches."""
+    try:
+        stored = read(profile_name)
+    except Exception as e:
+        print(f"⚠️ Warning: Could not read the existing playstyle aggregates. Error: {e}")
+        return None
+    if stored is None:
+        return None
+    all_time = stored[stored['Window'] == ALL_TIME].assign(Hero=lambda d: d['Hero'].astype(str)).set_index('Hero')[TOTAL_COLUMNS]
+    if ALL_HEROES not in all_time.index or all_time.at[ALL_HEROES, 'Matches'] != expected_matches:
+        # Out of step with the dataset (e.g. an interrupted run); rebuild instead of drifting
+        return None
+    return all_time.astype('float64')
+
+# --- Main public functions ---
+
+def build(df: pd.DataFrame, all_time: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    Computes the aggregates of a processed playstyle DataFrame (sorted newest first).
+    Pass already known all-time totals to skip recomputing them.
+    """
+    if not df['Timestamp'].is_monotonic_decreasing:
+        df = df.sort_values('Timestamp', ascending=False)
+    windows = {ALL_TIME: all_time if all_time is not None else _window(df, df)}
+    by_hero = df.groupby('Hero', observed=True, sort=False)
+    for window, n in LAST_MATCHES.items():
+        windows[window] = _window(df.head(n), by_hero.head(n))
+    if len(df):
+        recent = df[df['Timestamp'] >= df['Timestamp'].max() - pd.Timedelta(days=30)]
+    else:
+        recent = df
+    windows[LAST_30_DAYS] = _window(recent, recent)
+    return _to_dataset(windows)
+
+
+def write(profile_name: str, df: pd.DataFrame, changed: pd.DataFrame | None = None, replaced: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    Updates and saves a profile's aggregates for its processed playstyle dataset `df`.
+    If `changed` holds the rows added or updated since the last write and `replaced` the
+    rows they superseded, the stored all-time totals are carried forward with just that
+    difference applied; otherwise everything is rebuilt.
+    """
+    with metrics.timer("process.aggregates"):
+        all_time = None
+        if changed is not None:
+            replaced = changed.iloc[:0] if replaced is None else replaced
+            stored = _stored_all_time(profile_name, len(df) - len(changed) + len(replaced))
+            if stored is not None:
+                removed = _window(replaced, replaced).astype('float64')
+                added = _window(changed, changed).astype('float64')
+                all_time = stored.sub(removed, fill_value=0).add(added, fill_value=0)
+                # Heroes whose only matches were replaced by another hero's
+                all_time = all_time[(all_time['Matches'] > 0) | (all_time.index == ALL_HEROES)]
+        aggregates = build(df, all_time)
+        dataset_store.write_dataset(profile_name, dataset_store.PLAYSTYLE_AGGREGATES, aggregates)
+    return aggregates
+
+
+def read(profile_name: str) -> pd.DataFrame | None:
+    """Returns a profile's stored aggregates, or None if there are none yet."""
+    return dataset_store.read_dataset(profile_name, dataset_store.PLAYSTYLE_AGGREGATES)
+
+
+def means(aggregates: pd.DataFrame, window: str, hero: str = ALL_HEROES) -> Dict[str, float] | None:
+    """Returns {metric: average} for one window and hero (None if the hero has no matches in it), plus 'Matches'."""
+    row = aggregates[(aggregates['Window'] == window) & (aggregates['Hero'] == hero)]
+    if row.empty or not row['Matches'].iloc[0]:
+        return None
+    row = row.iloc[0]
+    out = {'Matches': int(row['Matches'])}
+    for metric in METRICS:
+        count = row[f"{metric}Count"]
+        out[metric] = float(row[f"{metric}Sum"] / count) if count else float('nan')
+    return out
+
+
+def hero_table(aggregates: pd.DataFrame, window: str) -> pd.DataFrame:
+    """Returns one row of averages per hero for a window, most played first."""
+    rows = aggregates[(aggregates['Window'] == window) & (aggregates['Hero'] != ALL_HEROES)]
+    table = pd.DataFrame({'Hero': rows['Hero'].astype(str), 'Matches': rows['Matches']})
+    for metric in METRICS:
+        table[metric] = rows[f"{metric}Sum"] / rows[f"{metric}Count"].astype('float64')
+    return table.sort_values(['Matches', 'Hero'], ascending=[False, True]).reset_index(drop=True)
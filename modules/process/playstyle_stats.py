@@ -3,63 +3,115 @@
 import os
 import json
 import pandas as pd
-from bs4 import BeautifulSoup
-from modules.common import path_manager
+from typing import Dict, Any, List, Tuple
+from modules.common import path_manager, page_manifest, dataset_store, analytics_store, html_table, segment_store, metrics, schemas
+from modules.process import playstyle_aggregates
 
-def process(profile_name: str) -> pd.DataFrame | None:
+# Column headers based on the API response
+COLUMN_NAMES = schemas.column_names(schemas.PLAYSTYLE_STATS)
+
+# --- Helper functions ---
+
+def _parse_page(raw_data_dir: str, entry: Dict[str, Any]) -> List[Tuple[str, ...]]:
+    """Reads a raw playstyle JSON page from the segment store and extracts its table rows, skipping the header."""
+    try:
+        data = json.loads(segment_store.read_entry(raw_data_dir, entry))
+        html_content = data.get("html", "")
+        if html_content:
+            return html_table.extract_rows(html_content) or []
+    except Exception as e:
+        print(f"⚠️ Warning: Could not process page '{entry['name']}'. Error: {e}")
+    return []
+
+
+def _build_dataframe(all_records: List[Tuple[str, ...]]) -> pd.DataFrame:
+    """Converts raw table records into a typed DataFrame."""
+    return schemas.convert(pd.DataFrame(all_records, columns=COLUMN_NAMES), schemas.PLAYSTYLE_STATS)
+
+
+def _merge(all_records: List[Tuple[str, ...]], existing_df: pd.DataFrame | None) -> Tuple[pd.DataFrame, pd.DataFrame | None]:
+    """
+    Merges new records into the archived matches, deduplicated by MatchID and sorted newest first.
+    Also returns the merged rows the new records added or replaced (None without archived matches).
+    """
+    new_df = _build_dataframe(all_records)
+    df = new_df
+    if existing_df is not None:
+        # New rows come first so that rows from refreshed pages win the deduplication
+        print(f"   > Merging into {len(existing_df)} archived matches...")
+        # Hero categories differ between the two frames, so concat falls back to object
+        df = schemas.convert(pd.concat([new_df, existing_df], ignore_index=True), schemas.PLAYSTYLE_STATS)
+    df = df.drop_duplicates(subset=['MatchID'], keep='first').sort_values(by='Timestamp', ascending=False)
+    return df, (df[df['MatchID'].isin(new_df['MatchID'])] if existing_df is not None else None)
+
+
+def _load_processed(profile_name: str) -> pd.DataFrame | None:
+    """Loads the previously processed dataset, if there is a usable one."""
+    try:
+        df = dataset_store.read_dataset(profile_name, dataset_store.PLAYSTYLE_STATS)
+    except Exception as e:
+        print(f"⚠️ Warning: Could not read existing processed data. Error: {e}")
+        return None
+    if df is None or list(df.columns) != COLUMN_NAMES:
+        return None
+    return df
+
+# --- Main public function ---
+
+def process(profile_name: str, incremental: bool = True) -> pd.DataFrame | None:
     """
-    Processes all raw playstyle JSONs into a clean DataFrame and saves to a CSV.
+    Processes the raw playstyle archive into a clean DataFrame and saves it to the Parquet dataset store.
+
+    In incremental mode only pages that are new or changed since the last run
+    are parsed and merged into the existing output, so matches that Steam no
+    longer serves stay in the history. A full rebuild from the archive happens
+    when there is no previous output or when raw pages have been removed.
     """
     print(f"\n⚙️ Processing Playstyle Stats for '{profile_name}'...")
 
     raw_data_dir = path_manager.get_raw_playstyle_stats_dir(profile_name)
-    output_csv_path = path_manager.get_processed_playstyle_stats_path(profile_name)
+    manifest_path = path_manager.get_playstyle_stats_manifest_path(profile_name)
 
     if not os.path.exists(raw_data_dir):
         print(f"❌ Directory not found: '{raw_data_dir}'. Please run the downloader first.")
         return None
 
+    segment_store.migrate_directory(raw_data_dir)
+    index = segment_store.load_index(raw_data_dir)
+    existing_df = _load_processed(profile_name) if incremental else None
+    manifest = page_manifest.load_manifest(manifest_path) if existing_df is not None else {}
+    current_pages, changed_pages, removed_pages = page_manifest.diff_entries(index, manifest)
+
+    if removed_pages:
+        print(f"   > {len(removed_pages)} previously processed page(s) are gone. Rebuilding from the archive.")
+        existing_df, changed_pages = None, list(index)
+
+    if existing_df is not None and not changed_pages:
+        print("✅ Playstyle Stats are already up to date. No new pages to process.")
+        return existing_df
+
+    # Newest pages first, so a match seen in several runs keeps its latest version
     all_records = []
-    for file_name in os.listdir(raw_data_dir):
-        if file_name.endswith('.json'):
-            file_path = os.path.join(raw_data_dir, file_name)
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            html_content = data.get("html", "")
-            if html_content:
-                soup = BeautifulSoup(html_content, "html.parser")
-                table = soup.find("table", class_="generic_kv_table")
-                if not table: continue
-                
-                # Extract rows, skipping the header
-                for row in table.find_all("tr")[1:]:
-                    cells = [ele.text.strip() for ele in row.find_all('td')]
-                    all_records.append(cells)
-    
-    if not all_records:
+    for name in reversed(changed_pages):
+        with metrics.timer("process.parse_page"):
+            all_records.extend(_parse_page(raw_data_dir, index[name]))
+    metrics.incr("process.pages", len(changed_pages))
+
+    if not all_records and existing_df is None:
         print("❌ No records were extracted from the raw files.")
         return None
 
-    # Define column headers based on the API response
-    headers = [
-        'MatchID', 'Timestamp', 'Hero', 'FightScore', 'FarmScore', 'PushScore',
-        'Versatility', 'Kills', 'Deaths', 'Assists', 'LastHits', 'Denies',
-        'GPM', 'XPPM', 'NetWorth', 'Damage', 'Heals'
-    ]
-    
-    df = pd.DataFrame(all_records, columns=headers)
-    
-    # Clean and convert data types
-    df['Timestamp'] = pd.to_datetime(df['Timestamp'].str.replace(' GMT', ''), errors='coerce')
-    numeric_cols = [col for col in headers if col not in ['Timestamp', 'Hero']]
-    for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
-
-    df.sort_values(by='Timestamp', ascending=False, inplace=True)
-    
-    os.makedirs(os.path.dirname(output_csv_path), exist_ok=True)
-    df.to_csv(output_csv_path, index=False)
-    
-    print(f"✅ Success! Processed playstyle data saved to:\n   {output_csv_path}")
+    with metrics.timer("process.dataframe"):
+        df, changed = _merge(all_records, existing_df)
+    metrics.incr("process.rows", len(all_records))
+
+    with metrics.timer("process.write_parquet"):
+        output_path = dataset_store.write_dataset(profile_name, dataset_store.PLAYSTYLE_STATS, df)
+    with metrics.timer("process.write_sqlite"):
+        analytics_store.write_dataset(profile_name, dataset_store.PLAYSTYLE_STATS, df, changed)
+    replaced = existing_df[existing_df['MatchID'].isin(changed['MatchID'])] if changed is not None else None
+    playstyle_aggregates.write(profile_name, df, changed, replaced)
+    page_manifest.save_manifest(manifest_path, current_pages)
+
+    print(f"✅ Success! {len(df)} archived matches saved to:\n   {output_path}")
     return df
@@ -2,63 +2,86 @@
 
 import os
 import pandas as pd
-from bs4 import BeautifulSoup
-from modules.common import path_manager
+from modules.common import path_manager, page_manifest, dataset_store, analytics_store, html_table, metrics, schemas
 
-def process(profile_name: str) -> pd.DataFrame | None:
-    """
-    Parses the raw ranked stats HTML file into a clean DataFrame and saves it to a CSV.
-    """
-    print(f"\n⚙️ Processing Ranked Hero Stats for '{profile_name}'...")
-
-    raw_html_path = path_manager.get_raw_ranked_stats_path(profile_name)
-    output_csv_path = path_manager.get_processed_ranked_stats_path(profile_name)
-
-    if not os.path.exists(raw_html_path):
-        print(f"❌ File not found: '{raw_html_path}'. Please run the downloader first.")
+def _load_processed(profile_name: str) -> pd.DataFrame | None:
+    """Loads the previously processed dataset, if there is a usable one."""
+    try:
+        return dataset_store.read_dataset(profile_name, dataset_store.RANKED_HERO_STATS)
+    except Exception as e:
+        print(f"⚠️ Warning: Could not read existing processed data. Error: {e}")
         return None
 
-    with open(raw_html_path, 'r', encoding='utf-8') as f:
-        html_content = f.read()
 
-    soup = BeautifulSoup(html_content, 'html.parser')
-    hero_table = soup.find('table', class_='generic_kv_table')
+def _build_dataframe(html_content: str) -> pd.DataFrame | None:
+    """Parses the hero standings table of a raw page into a typed DataFrame with a WinRate column."""
+    hero_table = html_table.extract_table(html_content, strip_strings=True)
 
     if not hero_table:
         print("❌ Could not find the hero stats table in the HTML file.")
         return None
 
-    # --- Extract Headers ---
-    header_row = hero_table.find('tr')
-    headers = [th.get_text(strip=True) for th in header_row.find_all('th')]
-
-    # --- Extract Data Rows ---
-    data_rows = []
-    for row in hero_table.find_all('tr')[1:]:
-        cells = [td.get_text(strip=True) for td in row.find_all('td')]
-        if len(cells) == len(headers):  # Ensure row is not malformed
-            data_rows.append(dict(zip(headers, cells)))
+    # --- Extract Headers and Data Rows ---
+    headers, rows = hero_table
+    data_rows = [cells for cells in rows if len(cells) == len(headers)]  # Ensure row is not malformed
 
     if not data_rows:
         print("❌ No data rows were extracted from the table.")
         return None
-        
-    df = pd.DataFrame(data_rows)
+
+    df = pd.DataFrame(data_rows, columns=headers)
     
     # Clean up a known bad row if it exists
     df = df[df['Hero'] != '-127']
 
-    # Convert all columns except 'Hero' to numeric types
-    for col in df.columns:
-        if col != 'Hero':
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+    # Hero becomes a category, the rest compact numeric types
+    df = schemas.convert(df, schemas.RANKED_HERO_STATS)
     
-    # Add a Win Rate column for better analysis
-    df['WinRate'] = (df['Wins'] / (df['Wins'] + df['Losses']) * 100).fillna(0)
-    
-    # Save to CSV
-    os.makedirs(os.path.dirname(output_csv_path), exist_ok=True)
-    df.to_csv(output_csv_path, index=False)
+    # Add a Win Rate column for better analysis; heroes without games get 0
+    wins, losses = df['Wins'].astype('float64'), df['Losses'].astype('float64')
+    df['WinRate'] = (wins / (wins + losses) * 100).fillna(0).astype('float32')
+    return df
+
+
+def process(profile_name: str, incremental: bool = True) -> pd.DataFrame | None:
+    """
+    Parses the raw ranked stats HTML file into a clean DataFrame and saves it to the Parquet dataset store.
+    In incremental mode the parse and write are skipped when the raw file is the
+    one that was processed last time.
+    """
+    print(f"\n⚙️ Processing Ranked Hero Stats for '{profile_name}'...")
+
+    raw_html_path = path_manager.get_raw_ranked_stats_path(profile_name)
+    manifest_path = path_manager.get_ranked_stats_manifest_path(profile_name)
+
+    if not os.path.exists(raw_html_path):
+        print(f"❌ File not found: '{raw_html_path}'. Please run the downloader first.")
+        return None
+
+    raw_dir, raw_name = os.path.split(raw_html_path)
+    manifest = page_manifest.load_manifest(manifest_path) if incremental else {}
+    current_pages, changed_files, _ = page_manifest.diff_pages(raw_dir, [raw_name], manifest)
+    if not changed_files:
+        existing_df = _load_processed(profile_name)
+        if existing_df is not None:
+            print("✅ Ranked Hero Stats are already up to date. Nothing to process.")
+            return existing_df
+
+    with open(raw_html_path, 'r', encoding='utf-8') as f:
+        html_content = f.read()
+
+    with metrics.timer("process.dataframe"):
+        df = _build_dataframe(html_content)
+    if df is None:
+        return None
+    metrics.incr("process.rows", len(df))
+
+    # Save to the dataset store
+    with metrics.timer("process.write_parquet"):
+        output_path = dataset_store.write_dataset(profile_name, dataset_store.RANKED_HERO_STATS, df)
+    with metrics.timer("process.write_sqlite"):
+        analytics_store.write_dataset(profile_name, dataset_store.RANKED_HERO_STATS, df)
+    page_manifest.save_manifest(manifest_path, current_pages)
     
-    print(f"✅ Success! Processed data saved to:\n   {output_csv_path}")
+    print(f"✅ Success! Processed data saved to:\n   {output_path}")
     return df
@@ -0,0 +1,7 @@
+"""module to orchestrate downloads and processing across profiles"""
+
+# Dataset names are kept here, away from the downloaders, so the UI can list them cheaply
+CONDUCT = "conduct"
+PLAYSTYLE = "playstyle"
+RANKED = "ranked"
+ALL_DATASETS = [CONDUCT, PLAYSTYLE, RANKED]
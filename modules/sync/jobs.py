@@ -0,0 +1,150 @@
+# modules/sync/jobs.py
+
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List
+
+QUEUED = "queued"
+RUNNING = "running"
+FINISHED_STATUSES = ("ok", "partial", "failed", "cancelled")
+
+# How many finished jobs are kept around so the UI can still show their outcome
+MAX_FINISHED_JOBS = 50
+DEFAULT_MAX_WORKERS = 4
+
+
+class Job:
+    """
+    A sync of one profile's datasets running in the background.
+    Progress is updated from the worker thread and read by the UI through snapshot().
+    """
+
+    def __init__(self, job_id: int, profile_name: str, datasets: List[str]):
+        self.job_id = job_id
+        self.profile_name = profile_name
+        self.datasets = datasets
+        self.status = QUEUED
+        self.progress: Dict[str, Any] = {"dataset": None, "stage": None, "pages": 0, "rows": 0, "fraction": None}
+        self.summary: Dict[str, Any] | None = None
+        self.error: str | None = None
+        self.submitted_at = time.time()
+        self.started_at: float | None = None
+        self.dataset_started_at: float | None = None
+        self.finished_at: float | None = None
+        self.cancel_event = threading.Event()
+        self.lock = threading.Lock()
+
+    def update(self, **fields):
+        """Progress callback handed to the sync steps."""
+        with self.lock:
+            if fields.get("dataset") not in (None, self.progress["dataset"]):
+                self.dataset_started_at = time.time()
+            self.progress.update(fields)
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (QUEUED, RUNNING)
+
+    def eta_seconds(self) -> float | None:
+        """Estimates the time left for the current dataset from its progress fraction, if there is one."""
+        fraction = self.progress.get("fraction")
+        if not fraction or not self.dataset_started_at or self.progress.get("stage") != "downloading":
+            return None
+        elapsed = time.time() - self.dataset_started_at
+        return elapsed * (1 - fraction) / fraction
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns a consistent copy of the job's state for display."""
+        with self.lock:
+            end = self.finished_at or time.time()
+            return {
+                "job_id": self.job_id,
+                "profile_name": self.profile_name,
+                "datasets": list(self.datasets),
+                "status": self.status,
+                "cancel_requested": self.cancel_event.is_set(),
+                "progress": dict(self.progress),
+                "eta_seconds": self.eta_seconds(),
+                "elapsed_seconds": round(end - self.started_at, 1) if self.started_at else 0.0,
+                "summary": self.summary,
+                "error": self.error,
+            }
+
+
+class JobRunner:
+    """
+    Runs sync jobs on a thread pool that lives as long as the app process, so jobs
+    keep going across Streamlit reruns and browser reloads. A dataset of a profile is
+    only synced by one job at a time; submitting it again returns the running job.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sync-job")
+        self.jobs: Dict[int, Job] = {}
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def submit(self, config: Dict[str, Any], profile_name: str, datasets: List[str]) -> Job:
+        """Queues a sync of the given datasets for a profile and returns its job."""
+        with self.lock:
+            for job in self.jobs.values():
+                if job.profile_name == profile_name and job.is_active and set(job.datasets) & set(datasets):
+                    return job
+            job = Job(next(self.ids), profile_name, datasets)
+            self.jobs[job.job_id] = job
+            self._prune()
+        self.executor.submit(self._run, job, config)
+        return job
+
+    def _run(self, job: Job, config: Dict[str, Any]):
+        # Imported here so that checking for jobs doesn't load the downloaders and processors
+        from modules.sync import scheduler
+        job.status, job.started_at = RUNNING, time.time()
+        try:
+            summary = scheduler.sync_profile(job.profile_name, config, job.datasets,
+                                             on_progress=job.update, cancel_event=job.cancel_event)
+            job.summary, job.status, job.error = summary, summary["status"], summary.get("error")
+        except Exception as e:
+            print(f"❌ Background sync for '{job.profile_name}' failed. Error: {e}")
+            job.status, job.error = "failed", str(e)
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self):
+        """Forgets the oldest finished jobs. Caller holds the lock."""
+        finished = [job_id for job_id, job in self.jobs.items() if not job.is_active]
+        for job_id in finished[:-MAX_FINISHED_JOBS]:
+            del self.jobs[job_id]
+
+    def get(self, job_id: int) -> Job | None:
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: int):
+        job = self.jobs.get(job_id)
+        if job:
+            job.cancel()
+
+    def list_jobs(self, profile_name: str | None = None, active_only: bool = False) -> List[Job]:
+        """Returns jobs, newest first, optionally for one profile or only those still running."""
+        with self.lock:
+            jobs = list(self.jobs.values())
+        return [job for job in reversed(jobs)
+                if (profile_name is None or job.profile_name == profile_name) and (job.is_active or not active_only)]
+
+
+_runner: JobRunner | None = None
+_runner_lock = threading.Lock()
+
+
+def get_runner(config: Dict[str, Any] | None = None) -> JobRunner:
+    """Returns the process-wide job runner, sized by `sync_max_workers` when it is first created."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner((config or {}).get('sync_max_workers', DEFAULT_MAX_WORKERS))
+        return _runner
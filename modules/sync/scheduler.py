@@ -0,0 +1,208 @@
+# modules/sync/scheduler.py
+
+import threading
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable
+
+from modules.common import config_manager, session_manager, dataset_store, metrics
+from modules.download import conduct_summary as download_conduct
+from modules.download import playstyle_stats as download_playstyle
+from modules.download import ranked_hero_stats as download_ranked
+from modules.process import conduct_summary as process_conduct
+from modules.process import playstyle_stats as process_playstyle
+from modules.process import ranked_hero_stats as process_ranked
+from modules.sync import CONDUCT, PLAYSTYLE, RANKED, ALL_DATASETS
+
+DEFAULT_MAX_WORKERS = 4
+
+# --- Per-dataset sync steps ---
+# Each step gets an `on_progress(**fields)` callback, a cancel event and a `stats` dict
+# it fills with download counters and stage durations. Without a session the download
+# is skipped and only the processing runs.
+
+def _noop(**_):
+    pass
+
+
+def _timed(stats: Dict[str, Any], stage: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Runs one stage of a step and records its duration as `<stage>_seconds` and in the run metrics."""
+    started = time.monotonic()
+    try:
+        with metrics.timer(f"sync.{stage}"):
+            return func(*args, **kwargs)
+    finally:
+        stats[f"{stage}_seconds"] = round(time.monotonic() - started, 3)
+
+
+def _record_download(stats: Dict[str, Any], fetch_stats: Dict[str, Any] | None):
+    """Copies a downloader's counters into `stats`, plus `download_error` if it stopped early without raising."""
+    fetch_stats = fetch_stats or {}
+    stats.update(pages=fetch_stats.get("pages", 0), bytes=fetch_stats.get("bytes", 0), new_rows=fetch_stats.get("rows", 0))
+    if fetch_stats.get("error"):
+        stats["download_error"] = fetch_stats["error"]
+
+
+def _sync_conduct(session: requests.Session | None, profile: Dict[str, Any], config: Dict[str, Any],
+                  on_progress: Callable[..., None] | None = None, cancel_event: threading.Event | None = None,
+                  stats: Dict[str, Any] | None = None):
+    """Streams new conduct summary pages into the dataset, then processes any leftovers."""
+    on_progress, stats = on_progress or _noop, {} if stats is None else stats
+    profile_name = profile['profile_name']
+    if session is not None:
+        writer = process_conduct.StreamingWriter(profile_name)
+        on_progress(stage="downloading")
+        try:
+            _record_download(stats, _timed(stats, "download", download_conduct.fetch, session, profile, config,
+                                           on_page=writer.add_page, on_progress=on_progress, cancel_event=cancel_event))
+        finally:
+            # Rows of the pages saved so far are written even if the download failed midway
+            df = writer.close()
+        if cancel_event and cancel_event.is_set():
+            # Whatever was streamed is already saved; leftover processing waits for the next run
+            return df
+    on_progress(stage="processing")
+    return _timed(stats, "process", process_conduct.process, profile_name, workers=config.get('process_workers'))
+
+
+def _sync_playstyle(session: requests.Session | None, profile: Dict[str, Any], config: Dict[str, Any],
+                    on_progress: Callable[..., None] | None = None, cancel_event: threading.Event | None = None,
+                    stats: Dict[str, Any] | None = None):
+    """Downloads and processes playstyle stats."""
+    on_progress, stats = on_progress or _noop, {} if stats is None else stats
+    if session is not None:
+        on_progress(stage="downloading")
+        _record_download(stats, _timed(stats, "download", download_playstyle.fetch, session, profile, config, on_progress=on_progress))
+    on_progress(stage="processing")
+    return _timed(stats, "process", process_playstyle.process, profile['profile_name'])
+
+
+def _sync_ranked(session: requests.Session | None, profile: Dict[str, Any], config: Dict[str, Any],
+                 on_progress: Callable[..., None] | None = None, cancel_event: threading.Event | None = None,
+                 stats: Dict[str, Any] | None = None):
+    """Downloads and processes ranked hero stats."""
+    on_progress, stats = on_progress or _noop, {} if stats is None else stats
+    if session is not None:
+        on_progress(stage="downloading")
+        _record_download(stats, _timed(stats, "download", download_ranked.fetch, session, profile, config))
+    on_progress(stage="processing")
+    return _timed(stats, "process", process_ranked.process, profile['profile_name'])
+
+
+# Only the conduct download can stop half way; the others are short and always run to the end
+CANCELLABLE = {CONDUCT}
+
+SYNC_STEPS: Dict[str, Callable[..., Any]] = {
+    CONDUCT: _sync_conduct,
+    PLAYSTYLE: _sync_playstyle,
+    RANKED: _sync_ranked,
+}
+
+# --- Helper functions ---
+
+def _validate_datasets(datasets: List[str]):
+    unknown = [d for d in datasets if d not in SYNC_STEPS]
+    if unknown:
+        raise ValueError(f"Unknown dataset(s): {', '.join(unknown)}. Choose from {', '.join(ALL_DATASETS)}.")
+
+# --- Main public functions ---
+
+def sync_profile(profile_name: str, config: Dict[str, Any], datasets: List[str],
+                 on_progress: Callable[..., None] | None = None, cancel_event: threading.Event | None = None,
+                 download: bool = True) -> Dict[str, Any]:
+    """
+    Runs the requested datasets for one profile on its pooled session and summarizes the outcome,
+    including download and processing times per dataset. Progress fields are reported with the
+    current `dataset` added. Once `cancel_event` is set, the running dataset stops as soon as it
+    safely can and the rest are skipped. With `download=False` the already downloaded raw data
+    is only reprocessed; no session is opened and no credentials are needed.
+    """
+    _validate_datasets(datasets)
+    on_progress = on_progress or _noop
+    started = time.monotonic()
+    summary = {"profile_name": profile_name, "status": "ok", "datasets": {}, "error": None}
+
+    try:
+        if download:
+            profile = config_manager.get_profile(config, profile_name)
+            session = session_manager.get_session(profile, config)
+        else:
+            profile, session = {"profile_name": profile_name}, None
+    except Exception as e:
+        summary.update(status="failed", error=str(e), seconds=round(time.monotonic() - started, 2))
+        return summary
+
+    try:
+        # Processed CSVs of earlier versions; a dataset that is reprocessed before it is read would otherwise keep its CSV
+        dataset_store.migrate_profile(profile_name)
+    except Exception as e:
+        print(f"⚠️ Warning: Could not migrate the legacy processed files of '{profile_name}'. Error: {e}")
+
+    # Datasets of one profile run one after another; they share the account's session and rate limits
+    for dataset in datasets:
+        if cancel_event and cancel_event.is_set():
+            summary["datasets"][dataset] = {"status": "cancelled", "rows": 0, "error": None, "seconds": 0}
+            continue
+        step_started = time.monotonic()
+        result = {"status": "ok", "rows": 0, "error": None}
+        stats: Dict[str, Any] = {}
+        on_progress(dataset=dataset, stage="starting", pages=0, rows=0, fraction=None)
+        with metrics.record_run(profile_name, dataset) as run:
+            try:
+                df = SYNC_STEPS[dataset](session, profile, config,
+                                         on_progress=lambda **fields: on_progress(dataset=dataset, **fields),
+                                         cancel_event=cancel_event, stats=stats)
+                result["rows"] = 0 if df is None else len(df)
+                if dataset in CANCELLABLE and cancel_event and cancel_event.is_set():
+                    result["status"] = "cancelled"
+            except Exception as e:
+                print(f"❌ {dataset} sync failed for '{profile_name}'. Error: {e}")
+                result.update(status="failed", error=str(e))
+            download_error = stats.pop("download_error", None)
+            if download_error and result["status"] != "failed":
+                # Rows saved before the failure were processed, but the download is incomplete
+                print(f"❌ {dataset} download failed for '{profile_name}'. Error: {download_error}")
+                result.update(status="failed", error=download_error)
+            result.update(stats)
+            result["seconds"] = round(time.monotonic() - step_started, 2)
+            run.result.update(result, mode="sync" if download else "process-only")
+        summary["datasets"][dataset] = result
+
+    statuses = [r["status"] for r in summary["datasets"].values()]
+    if "cancelled" in statuses:
+        summary["status"] = "cancelled"
+    elif any(status != "ok" for status in statuses):
+        summary["status"] = "failed" if all(status == "failed" for status in statuses) else "partial"
+    summary["seconds"] = round(time.monotonic() - started, 2)
+    return summary
+
+
+def sync_profiles(config: Dict[str, Any], profile_names: List[str] | None = None,
+                  datasets: List[str] | None = None, max_workers: int | None = None,
+                  cancel_event: threading.Event | None = None, download: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Syncs several profiles concurrently, each on its pooled requests session.
+    Defaults to every profile in the config and every dataset. Returns a
+    summary per profile with a status, duration and row count per dataset.
+    """
+    if profile_names is None:
+        profile_names = [p['profile_name'] for p in config.get('profiles', [])]
+    # A profile listed twice would have two workers writing the same files
+    profile_names = list(dict.fromkeys(profile_names))
+    datasets = datasets or ALL_DATASETS
+    _validate_datasets(datasets)
+    if not profile_names:
+        return {}
+
+    max_workers = max_workers or config.get('sync_max_workers', DEFAULT_MAX_WORKERS)
+    print(f"\n🔁 Syncing {len(profile_names)} profile(s) with up to {max_workers} in parallel...")
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(profile_names))) as executor:
+        futures = {name: executor.submit(sync_profile, name, config, datasets,
+                                         cancel_event=cancel_event, download=download) for name in profile_names}
+        results = {name: future.result() for name, future in futures.items()}
+
+    ok_count = sum(1 for r in results.values() if r["status"] == "ok")
+    print(f"\n✅ Multi-profile sync finished: {ok_count}/{len(results)} profile(s) fully synced.")
+    return results
@@ -18,31 +18,64 @@
 
 import sys
 import os
+import multiprocessing
 import webbrowser
 import threading
 import time
+import urllib.request
+import urllib.error
+
+# Taken before Streamlit is imported, so startup times include the import itself
+LAUNCHED_AT = time.time()
+
 from streamlit.web import cli as stcli
 
+PORT = "8501"
+BASE_URL = "dota2analytics"
+READY_TIMEOUT_SECONDS = 60
+READY_POLL_SECONDS = 0.1
+LAUNCH_TIME_ENV = "DOTA2_ANALYTICS_LAUNCHED_AT"
+
+def wait_until_ready(health_url: str, timeout: float = READY_TIMEOUT_SECONDS) -> bool:
+    """Polls the Streamlit health endpoint until the server answers. Returns False on timeout."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(health_url, timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except (urllib.error.URLError, OSError):
+            pass
+        time.sleep(READY_POLL_SECONDS)
+    return False
+
 def open_browser():
     """
-    Waits a few seconds for the server to initialize, then opens the browser.
+    Waits until the server answers its health check, then opens the browser.
     This function runs in a separate thread.
     """
-    time.sleep(4) # Give the server a moment to start
-    url = "http://localhost:8501/dota2analytics"
+    url = f"http://localhost:{PORT}/{BASE_URL}"
+    if wait_until_ready(f"{url}/_stcore/health"):
+        print(f"🕒 Server ready in {time.time() - LAUNCHED_AT:.2f}s.")
+    else:
+        print(f"⚠️ Server did not report ready within {READY_TIMEOUT_SECONDS}s. Opening the browser anyway.")
     print(f"Opening application in browser: {url}")
     webbrowser.open(url, new=2)
 
 if __name__ == "__main__":
+    # Required for the processing worker pool inside the frozen executable
+    multiprocessing.freeze_support()
+
     # Start the browser-opening function in a background thread.
-    browser_thread = threading.Thread(target=open_browser)
+    os.environ[LAUNCH_TIME_ENV] = str(LAUNCHED_AT)
+    browser_thread = threading.Thread(target=open_browser, daemon=True)
     browser_thread.start()
 
     # --- RUN THE STREAMLIT SERVER IN THE MAIN THREAD ---
     # This is the primary, blocking call that will run until the app is closed.
     app_path = os.path.join(os.path.dirname(__file__), 'app.py')
-    port = "8501"
-    base_url = "dota2analytics"
+    port = PORT
+    base_url = BASE_URL
 
     print("\n" + "="*60)
     print("  Application server is starting...")
@@ -0,0 +1,129 @@
+# sync_cli.py
+# Syncs and processes profiles without starting Streamlit, e.g. from cron.
+# Progress messages go to stderr; a JSON run report goes to stdout (and, with
+# --metrics-file, is appended as one line to that file).
+#
+# Usage: python sync_cli.py [--profiles NAME ...] [--datasets conduct playstyle ranked]
+#                           [--max-workers N] [--config PATH] [--process-only] [--metrics-file PATH]
+#
+# Exit codes: 0 everything synced, 1 every profile failed, 2 bad arguments or config,
+#             3 some profiles or datasets failed, 130 interrupted.
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from modules.sync import ALL_DATASETS
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_PARTIAL = 3
+EXIT_INTERRUPTED = 130
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sync and process Dota 2 profile data without the dashboard.")
+    parser.add_argument("--profiles", nargs="+", metavar="NAME", help="Profiles to sync (default: every profile in the config).")
+    parser.add_argument("--datasets", nargs="+", choices=ALL_DATASETS, default=ALL_DATASETS, help="Datasets to sync (default: all).")
+    parser.add_argument("--max-workers", type=int, help="Profiles synced in parallel (default: sync_max_workers from the config, or 4).")
+    parser.add_argument("--config", default="config.json", help="Path to config.json (default: %(default)s).")
+    parser.add_argument("--process-only", action="store_true", help="Reprocess already downloaded raw data without contacting Steam.")
+    parser.add_argument("--metrics-file", help="Append the JSON run report as one line to this file.")
+    return parser.parse_args(argv)
+
+
+def _exit_code(results) -> int:
+    statuses = [r["status"] for r in results.values()]
+    if all(status == "ok" for status in statuses):
+        return EXIT_OK
+    if all(status == "failed" for status in statuses):
+        return EXIT_FAILED
+    return EXIT_PARTIAL
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    if args.max_workers is not None and args.max_workers < 1:
+        print("❌ --max-workers must be at least 1.", file=sys.stderr)
+        return EXIT_USAGE
+    if not os.path.exists(args.config):
+        print(f"❌ Config file '{args.config}' not found.", file=sys.stderr)
+        return EXIT_USAGE
+
+    # Imported after argument parsing so --help stays instant
+    from modules.common import config_manager
+    from modules.sync import scheduler
+
+    try:
+        config = config_manager.load_config(args.config)
+    except Exception as e:
+        print(f"❌ Could not read config '{args.config}'. Error: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    known = [p['profile_name'] for p in config.get('profiles', [])]
+    profiles = list(dict.fromkeys(args.profiles or known))
+    unknown = [name for name in profiles if name not in known]
+    if unknown:
+        print(f"❌ Unknown profile(s): {', '.join(unknown)}.", file=sys.stderr)
+        return EXIT_USAGE
+    if not profiles:
+        print("❌ No profiles configured.", file=sys.stderr)
+        return EXIT_USAGE
+
+    report = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "mode": "process-only" if args.process_only else "sync",
+        "datasets": args.datasets,
+        "profiles": {},
+    }
+    cancel_event, done = threading.Event(), threading.Event()
+    results, errors = {}, []
+    started = time.monotonic()
+
+    def run():
+        try:
+            results.update(scheduler.sync_profiles(config, profiles, args.datasets, args.max_workers,
+                                                   cancel_event=cancel_event, download=not args.process_only))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            done.set()
+
+    with contextlib.redirect_stdout(sys.stderr):
+        # The sync runs in a worker thread so Ctrl+C reaches this one and can cancel it cleanly
+        threading.Thread(target=run, name="sync-cli").start()
+        try:
+            while not done.wait(0.5):
+                pass
+        except KeyboardInterrupt:
+            print("\n⏹️ Interrupted, stopping at the next safe point...")
+            cancel_event.set()
+            done.wait()
+    if errors:
+        print(f"❌ Sync aborted. Error: {errors[0]}", file=sys.stderr)
+        return EXIT_FAILED
+
+    report["profiles"] = results
+    report["seconds"] = round(time.monotonic() - started, 2)
+    if cancel_event.is_set():
+        report["status"], code = "cancelled", EXIT_INTERRUPTED
+    else:
+        code = _exit_code(results) if results else EXIT_FAILED
+        report["status"] = {EXIT_OK: "ok", EXIT_FAILED: "failed", EXIT_PARTIAL: "partial"}[code]
+
+    line = json.dumps(report, default=str)
+    print(line)
+    if args.metrics_file:
+        with open(args.metrics_file, 'a', encoding='utf-8') as f:
+            f.write(line + "\n")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
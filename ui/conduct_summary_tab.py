@@ -2,72 +2,78 @@
 
 import streamlit as st
 import pandas as pd
-import os
 
-from modules.common import config_manager, path_manager, session_manager
-from modules.download import conduct_summary as download_conduct
-from modules.process import conduct_summary as process_conduct
+from modules.common import config_manager, dataset_store, downsample
+from modules.process import conduct_rollups
+from modules import sync
+from ui import job_status, paged_table
 
-@st.cache_data
-def load_profile_data(profile_name: str) -> pd.DataFrame | None:
-    """Loads the processed CSV data for a given profile."""
-    if not profile_name:
-        return None
-    csv_path = path_manager.get_processed_conduct_summary_path(profile_name)
-    if os.path.exists(csv_path):
-        return pd.read_csv(csv_path, parse_dates=['SummaryDate'])
-    return None
+# The trend chart never gets more points than this, however long the history is
+MAX_CHART_POINTS = 500
+TREND_RESOLUTIONS = {
+    "Every Summary": None,
+    "Daily": conduct_rollups.DAY,
+    "Weekly": conduct_rollups.WEEK,
+    "Monthly": conduct_rollups.MONTH,
+}
 
-def render():
-    """Renders the main dashboard tab for behavior summaries."""
-    config = config_manager.load_config()
-    profile_names = [p['profile_name'] for p in config.get('profiles', [])]
-    
-    if not profile_names:
+@st.cache_data(max_entries=32)
+def load_profile_data(profile_name: str, version: tuple | None) -> pd.DataFrame | None:
+    """Loads the processed data for a given profile. `version` keys the cache, so only a changed dataset is reloaded."""
+    return dataset_store.read_dataset(profile_name, dataset_store.CONDUCT_SUMMARY)
+
+@st.cache_data(max_entries=64)
+def load_trend(profile_name: str, versions: tuple, resolution: str) -> pd.DataFrame | None:
+    """
+    Returns the behavior score trend at a resolution, downsampled to at most MAX_CHART_POINTS.
+    `versions` holds the summary and rollup dataset versions and only keys the cache.
+    """
+    period = TREND_RESOLUTIONS[resolution]
+    if period is None:
+        df = load_profile_data(profile_name, versions[0])
+        if df is None:
+            return None
+        # Stored newest first; reversing is enough, no sort needed
+        trend = df.set_index('SummaryDate')[['BehaviorScore']].iloc[::-1]
+        return downsample.downsample(trend.rename(columns={'BehaviorScore': 'Behavior Score'}), MAX_CHART_POINTS)
+
+    rollups = conduct_rollups.read(profile_name, period)
+    if rollups is None:
+        # Processed before rollups existed; they are written with the next sync
+        df = load_profile_data(profile_name, versions[0])
+        if df is None:
+            return None
+        rollups = conduct_rollups.build(df)
+        rollups = rollups[rollups['Period'] == period]
+    trend = rollups.set_index('PeriodStart').rename(columns={
+        'BehaviorScore': 'Average', 'BehaviorScoreMin': 'Lowest', 'BehaviorScoreMax': 'Highest',
+    })[['Average', 'Lowest', 'Highest', 'Commends', 'Reports']]
+    return downsample.downsample(trend, MAX_CHART_POINTS)
+
+def render(selected_profile: str | None):
+    """Renders the main dashboard tab for behavior summaries of the profile selected in the sidebar."""
+    if not selected_profile:
         st.warning("👋 Welcome! No profiles found.")
         st.info("Please go to the '⚙️ Profile Management' tab to add your first profile.")
         return
 
-    st.sidebar.header("Dashboard Controls")
-    current_active_profile = config.get('active_profile')
-    
-    try:
-        active_profile_index = profile_names.index(current_active_profile)
-    except ValueError:
-        active_profile_index = 0
-
-    selected_profile = st.sidebar.selectbox(
-        "Select Profile", 
-        options=profile_names,
-        index=active_profile_index
-    )
-    
-    if selected_profile != current_active_profile:
-        config['active_profile'] = selected_profile
-        config_manager.save_config(config)
-        st.rerun()
+    config = config_manager.load_config()
 
     col1, col2 = st.columns([2, 1])
     with col1:
         st.header(f"Conduct Summary for: `{selected_profile}`")
     with col2:
         if st.button("Download & Process Data"):
+            # The sync runs in the background; the page stays usable and shows its progress below
             try:
-                active_profile_details = config_manager.get_active_profile(config)
-                with st.spinner("Step 1/2: Downloading new data..."):
-                    session = session_manager.create_session(active_profile_details)
-                    download_conduct.fetch(session, active_profile_details, config)
-                
-                with st.spinner("Step 2/2: Processing local files..."):
-                    process_conduct.process(active_profile_details['profile_name'])
-                
-                st.cache_data.clear()
-                st.success("Data refreshed successfully!")
-                st.rerun()
+                job_status.start_sync(config, [sync.CONDUCT])
             except Exception as e:
                 st.error(f"An error occurred: {e}")
 
-    df = load_profile_data(selected_profile)
+    job_status.render(selected_profile, sync.CONDUCT)
+
+    summary_version = dataset_store.get_dataset_version(selected_profile, dataset_store.CONDUCT_SUMMARY)
+    df = load_profile_data(selected_profile, summary_version)
     if df is not None and not df.empty:
         st.markdown("### Latest Snapshot")
         latest = df.iloc[0]
@@ -77,10 +83,18 @@ def render():
         c3.metric("Average Commends", f"{df['Commends'].mean():.1f}")
         
         st.markdown("### Behavior Score Trend")
-        chart_df = df.sort_values(by='SummaryDate').set_index('SummaryDate')
-        st.line_chart(chart_df['BehaviorScore'])
+        resolution = st.radio("Resolution", list(TREND_RESOLUTIONS), horizontal=True, key="conduct_trend_resolution")
+        versions = (summary_version, dataset_store.get_dataset_version(selected_profile, dataset_store.CONDUCT_ROLLUPS))
+        trend = load_trend(selected_profile, versions, resolution)
+        if trend is not None:
+            if TREND_RESOLUTIONS[resolution] is None:
+                st.line_chart(trend)
+            else:
+                st.line_chart(trend[['Average', 'Lowest', 'Highest']])
+                st.markdown(f"### Commends & Reports per {TREND_RESOLUTIONS[resolution].title()}")
+                st.bar_chart(trend[['Commends', 'Reports']])
         
         st.markdown("### Complete History")
-        st.dataframe(df)
+        paged_table.render(selected_profile, dataset_store.CONDUCT_SUMMARY, key="conduct_history")
     else:
         st.info(f"No data found for '{selected_profile}'. Click 'Download & Process Data' to get started.")
@@ -0,0 +1,97 @@
+# ui/diagnostics_tab.py
+
+import streamlit as st
+import pandas as pd
+from typing import Dict, Any, List
+
+from modules.common import metrics
+from modules import sync
+
+ALL_OPTION = "All datasets"
+
+
+def _runs_table(runs: List[Dict[str, Any]]) -> pd.DataFrame:
+    """One row per recorded run, newest first."""
+    rows = []
+    for run in reversed(runs):
+        result, counters, timings = run.get("result", {}), run.get("counters", {}), run.get("timings", {})
+        rows.append({
+            "Started": pd.to_datetime(run["started_at"]),
+            "Dataset": run["dataset"],
+            "Mode": result.get("mode", "sync"),
+            "Status": result.get("status"),
+            "Seconds": run["seconds"],
+            "Download s": timings.get("sync.download", {}).get("total_seconds"),
+            "Process s": timings.get("sync.process", {}).get("total_seconds"),
+            "Pages": result.get("pages"),
+            "KB": round(counters.get("http.bytes", 0) / 1024, 1),
+            "New Rows": result.get("new_rows"),
+            "Requests": counters.get("http.requests", 0),
+            "Retries": counters.get("http.retries", 0),
+        })
+    return pd.DataFrame(rows)
+
+
+def _stage_table(runs: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Per-stage timings averaged over the given runs, slowest stage first."""
+    rows = {}
+    for run in runs:
+        for name, timing in run.get("timings", {}).items():
+            if name.startswith("sync."):
+                # The download/process totals overlap every other stage
+                continue
+            row = rows.setdefault(name, {"Stage": name, "Runs": 0, "Calls": 0, "Total s": 0.0, "Max s": 0.0})
+            row["Runs"] += 1
+            row["Calls"] += timing["count"]
+            row["Total s"] += timing["total_seconds"]
+            row["Max s"] = max(row["Max s"], timing["max_seconds"])
+    df = pd.DataFrame(list(rows.values()), columns=["Stage", "Runs", "Calls", "Total s", "Max s"])
+    if df.empty:
+        return df
+    df["Avg s / Run"] = df["Total s"] / df["Runs"]
+    df["Avg ms / Call"] = df["Total s"] / df["Calls"] * 1000
+    return df.sort_values("Avg s / Run", ascending=False).round(4)
+
+
+def render(profile_name: str | None):
+    """Renders the sync diagnostics tab for the profile selected in the sidebar."""
+    if not profile_name:
+        st.header("Sync Diagnostics")
+        st.warning("Please select or add a profile in the 'Profile Management' tab first.")
+        return
+
+    st.header(f"Sync Diagnostics for: `{profile_name}`")
+    st.caption("Timings and counters recorded for every sync, whether started here, in the background or from `sync_cli.py`.")
+
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        dataset = st.selectbox("Dataset", [ALL_OPTION] + sync.ALL_DATASETS, key="diagnostics_dataset")
+    with col2:
+        last_n = st.number_input("Last runs", min_value=1, max_value=metrics.MAX_HISTORY_RUNS, value=20, key="diagnostics_last_n")
+
+    runs = metrics.load_history(profile_name, None if dataset == ALL_OPTION else dataset)[-int(last_n):]
+    if not runs:
+        st.info(f"No syncs have been recorded for '{profile_name}' yet.")
+        return
+
+    runs_df = _runs_table(runs)
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Runs", len(runs))
+    c2.metric("Avg Duration", f"{runs_df['Seconds'].mean():.2f}s")
+    c3.metric("Data Transferred", f"{runs_df['KB'].sum() / 1024:.2f} MB")
+    c4.metric("Retries", int(runs_df["Retries"].sum()))
+
+    st.markdown("### Where the Time Goes")
+    stages = _stage_table(runs)
+    if stages.empty:
+        st.info("The selected runs recorded no stage timings.")
+    else:
+        st.bar_chart(stages.set_index("Stage")["Avg s / Run"], horizontal=True)
+        st.dataframe(stages, hide_index=True)
+
+    st.markdown("### Duration Trend")
+    trend = runs_df.pivot_table(index="Started", columns="Dataset", values="Seconds", aggfunc="sum")
+    st.line_chart(trend)
+
+    st.markdown("### Recent Runs")
+    st.dataframe(runs_df, hide_index=True)
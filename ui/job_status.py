@@ -0,0 +1,118 @@
+# ui/job_status.py
+
+import streamlit as st
+from typing import Dict, Any, List
+
+from modules.common import config_manager
+from modules.sync import jobs
+
+STATUS_ICONS = {"queued": "⏳", "running": "🔄", "ok": "✅", "partial": "⚠️", "failed": "❌", "cancelled": "⏹️"}
+
+
+def start_sync(config: Dict[str, Any], datasets: List[str], profile_name: str | None = None):
+    """Queues a background sync for a profile (the active one by default); raises ValueError for unusable profiles."""
+    profile = config_manager.get_profile(config, profile_name) if profile_name else config_manager.get_active_profile(config)
+    jobs.get_runner(config).submit(config, profile['profile_name'], datasets)
+
+
+def _format_seconds(seconds: float | None) -> str:
+    if seconds is None:
+        return "unknown"
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}m {seconds:02d}s" if minutes else f"{seconds}s"
+
+
+def _describe(snapshot: Dict[str, Any]) -> str:
+    """One-line summary of a job's progress."""
+    progress = snapshot["progress"]
+    parts = [f"{STATUS_ICONS.get(snapshot['status'], '')} **{snapshot['profile_name']}**"]
+    if progress["dataset"]:
+        parts.append(f"{progress['dataset']}: {progress['stage'] or 'starting'}")
+    parts.append(f"{progress['pages']} page(s), {progress['rows']} new row(s)")
+    parts.append(f"elapsed {_format_seconds(snapshot['elapsed_seconds'])}")
+    if snapshot["eta_seconds"] is not None:
+        parts.append(f"ETA {_format_seconds(snapshot['eta_seconds'])}")
+    if snapshot["cancel_requested"] and snapshot["status"] == jobs.RUNNING:
+        parts.append("stopping...")
+    return " · ".join(parts)
+
+
+@st.fragment(run_every=1)
+def _live_job(job_id: int, key: str):
+    """Polls a running job without rerunning the rest of the page; reruns the whole app once it finishes."""
+    job = jobs.get_runner().get(job_id)
+    if job is None or not job.is_active:
+        st.rerun()
+    snapshot = job.snapshot()
+    fraction = snapshot["progress"]["fraction"]
+    st.progress(fraction or 0.0, text=_describe(snapshot))
+    if st.button("⏹️ Cancel", key=f"cancel_{key}_{job_id}", disabled=snapshot["cancel_requested"]):
+        job.cancel()
+
+
+def render(profile_name: str, dataset: str):
+    """
+    Shows the background sync of a profile's dataset: live progress while it runs
+    and its outcome once, in the first rerun after it has finished.
+    """
+    if not profile_name:
+        return
+    profile_jobs = [job for job in jobs.get_runner().list_jobs(profile_name) if dataset in job.datasets]
+    if not profile_jobs:
+        return
+    job = profile_jobs[0]
+    if job.is_active:
+        _live_job(job.job_id, dataset)
+        return
+
+    # Report a finished job once per browser session
+    seen = st.session_state.setdefault("seen_sync_jobs", set())
+    if (job.job_id, dataset) in seen:
+        return
+    seen.add((job.job_id, dataset))
+    snapshot = job.snapshot()
+    result = (snapshot["summary"] or {}).get("datasets", {}).get(dataset, {})
+    status = result.get("status", snapshot["status"])
+    if status == "ok":
+        st.success(f"Sync finished in {_format_seconds(result.get('seconds'))}: {result.get('rows', 0)} row(s).")
+    elif status == "cancelled":
+        st.info("Sync was cancelled. Downloaded data has been kept and the next sync continues from there.")
+    else:
+        st.error(f"Sync failed: {result.get('error') or snapshot['error']}")
+
+
+@st.fragment(run_every=1)
+def _live_jobs_table():
+    """Polls every running job; reruns the whole app once none are left."""
+    if not jobs.get_runner().list_jobs(active_only=True):
+        st.rerun()
+    _jobs_table()
+
+
+def _jobs_table():
+    rows = []
+    for job in jobs.get_runner().list_jobs():
+        snapshot = job.snapshot()
+        row = {"Profile": snapshot["profile_name"], "Status": f"{STATUS_ICONS.get(snapshot['status'], '')} {snapshot['status']}",
+               "Seconds": snapshot["elapsed_seconds"]}
+        if job.is_active:
+            row["Progress"] = _describe(snapshot).split(" · ", 1)[-1]
+        for dataset, result in ((snapshot["summary"] or {}).get("datasets") or {}).items():
+            row[dataset.capitalize()] = f"{result['status']} ({result['rows']} rows)"
+        if snapshot["error"]:
+            row["Error"] = snapshot["error"]
+        rows.append(row)
+    if rows:
+        st.dataframe(rows, hide_index=True)
+
+
+def render_all():
+    """Shows every recent background sync, refreshing while any of them is still running."""
+    active = jobs.get_runner().list_jobs(active_only=True)
+    if active:
+        for job in active:
+            if st.button(f"⏹️ Cancel sync of '{job.profile_name}'", key=f"cancel_all_{job.job_id}", disabled=job.cancel_event.is_set()):
+                job.cancel()
+        _live_jobs_table()
+    else:
+        _jobs_table()
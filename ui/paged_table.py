@@ -0,0 +1,120 @@
+# ui/paged_table.py
+
+import math
+import streamlit as st
+import pandas as pd
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Tuple
+
+from modules.common import analytics_store, dataset_store, schemas
+
+# A history table that only ever sends one page of rows to the browser. Sorting,
+# filtering, search and paging are done by SQL against the analytics store, and the
+# table is a fragment, so flipping pages reruns the table and nothing else on the tab.
+
+PAGE_SIZES = [25, 50, 100, 250]
+PERIODS = {"All time": None, "Last 7 days": 7, "Last 30 days": 30, "Last 90 days": 90, "Last year": 365}
+ALL_HEROES = "All heroes"
+NO_FILTER = "None"
+
+# --- Helper functions ---
+
+@st.cache_data(max_entries=256)
+def _count(profile_name: str, dataset: str, version: tuple | None, where: Dict[str, Any]) -> int:
+    return analytics_store.count(profile_name, dataset, **where)
+
+
+@st.cache_data(max_entries=256)
+def _page(profile_name: str, dataset: str, version: tuple | None, where: Dict[str, Any],
+          order_by: str, descending: bool, limit: int, offset: int, after: tuple | None) -> Tuple[pd.DataFrame, tuple | None]:
+    """One page of rows and the next page's cursor. `version` only keys the cache, so a revisited page costs nothing until the data changes."""
+    return analytics_store.page(profile_name, dataset, order_by=order_by, descending=descending,
+                                limit=limit, offset=offset, after=after, **where)
+
+
+@st.cache_data(max_entries=32)
+def _heroes(profile_name: str, version: tuple | None) -> List[str]:
+    return analytics_store.list_heroes(profile_name)
+
+
+def _range_columns(dataset: str) -> List[str]:
+    """Columns that can be filtered by a numeric range."""
+    return [col for col in schemas.column_names(dataset) if schemas.column_kind(dataset, col) in (schemas.COUNT, schemas.SCORE)]
+
+
+def _step_page(page_key: str, delta: int, pages: int):
+    st.session_state[page_key] = min(max(1, st.session_state.get(page_key, 1) + delta), pages)
+
+# --- Main public function ---
+
+@st.fragment
+def render(profile_name: str, dataset: str, key: str):
+    """
+    Renders a paginated view of a profile's dataset with search, period, hero and
+    column filters and server-side sorting. `key` keeps the widgets of several tables apart.
+    """
+    version = dataset_store.get_dataset_version(profile_name, dataset)
+    columns = schemas.column_names(dataset)
+    where: Dict[str, Any] = {}
+
+    c1, c2, c3 = st.columns(3)
+    search = c1.text_input("Search", placeholder=" or ".join(analytics_store.SEARCH_COLUMNS[dataset]), key=f"{key}_search")
+    if search.strip():
+        where["search"] = search.strip()
+    if dataset in analytics_store.DATE_COLUMNS:
+        days = PERIODS[c2.selectbox("Period", list(PERIODS), key=f"{key}_period")]
+        if days:
+            # Whole days, so the query (and its cache entry) stays the same throughout the day
+            where["start"] = datetime.combine(datetime.now().date() - timedelta(days=days), datetime.min.time())
+    if "Hero" in columns:
+        hero = c3.selectbox("Hero", [ALL_HEROES] + _heroes(profile_name, version), key=f"{key}_hero")
+        if hero != ALL_HEROES:
+            where["hero"] = hero
+
+    with st.expander("Column Filter & Sorting"):
+        f1, f2, f3 = st.columns(3)
+        filter_col = f1.selectbox("Filter column", [NO_FILTER] + _range_columns(dataset), key=f"{key}_filter_col")
+        if filter_col != NO_FILTER:
+            low = f2.number_input(f"Min {filter_col}", value=None, key=f"{key}_min_{filter_col}")
+            high = f3.number_input(f"Max {filter_col}", value=None, key=f"{key}_max_{filter_col}")
+            if low is not None or high is not None:
+                where["filters"] = {filter_col: (low, high)}
+
+        s1, s2, s3 = st.columns(3)
+        default_sort = analytics_store.DATE_COLUMNS.get(dataset, analytics_store.PRIMARY_KEYS[dataset][0])
+        order_by = s1.selectbox("Sort by", columns, index=columns.index(default_sort), key=f"{key}_order_by")
+        descending = s2.radio("Order", ["Descending", "Ascending"], horizontal=True, key=f"{key}_order") == "Descending"
+        page_size = s3.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{key}_page_size")
+
+    total = _count(profile_name, dataset, version, where)
+    pages = max(1, math.ceil(total / page_size))
+
+    # Any change to what is shown starts over at the first page. The page is a widget key,
+    # which Streamlit drops while the view is hidden, so a missing page starts over too.
+    page_key = f"{key}_page"
+    signature = repr((version, where, order_by, descending, page_size))
+    if st.session_state.get(f"{key}_signature") != signature or page_key not in st.session_state:
+        st.session_state[f"{key}_signature"] = signature
+        st.session_state[page_key] = 1
+        st.session_state[f"{key}_cursors"] = {}
+
+    if not total:
+        st.info("No rows match the current filters.")
+        return
+
+    # Where the previous page ended, if known; paging on with it skips the OFFSET scan
+    page = st.session_state[page_key]
+    cursors = st.session_state[f"{key}_cursors"]
+    after = cursors.get(page)
+    df, cursor = _page(profile_name, dataset, version, where, order_by, descending, page_size,
+                       0 if after else (page - 1) * page_size, after)
+    if cursor is not None:
+        cursors[page + 1] = cursor
+    first_row = (page - 1) * page_size + 1
+    st.caption(f"Page {page:,} of {pages:,} · rows {first_row:,}–{first_row + len(df) - 1:,} of {total:,}")
+    st.dataframe(df, hide_index=True)
+
+    n1, n2, n3 = st.columns([1, 2, 1])
+    n1.button("◀ Previous", key=f"{key}_prev", disabled=page <= 1, on_click=_step_page, args=(page_key, -1, pages))
+    n2.number_input("Page", min_value=1, max_value=pages, step=1, key=page_key, label_visibility="collapsed")
+    n3.button("Next ▶", key=f"{key}_next", disabled=page >= pages, on_click=_step_page, args=(page_key, 1, pages))
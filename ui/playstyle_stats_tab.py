@@ -2,45 +2,56 @@
 
 import streamlit as st
 import pandas as pd
-import os
-import plotly.graph_objects as go
-
-from modules.common import config_manager, path_manager, session_manager
-from modules.download import playstyle_stats as download_playstyle
-from modules.process import playstyle_stats as process_playstyle
-
-@st.cache_data
-def load_playstyle_data(profile_name: str) -> pd.DataFrame | None:
-    """Loads the processed playstyle stats CSV."""
-    if not profile_name: return None
-    csv_path = path_manager.get_processed_playstyle_stats_path(profile_name)
-    if os.path.exists(csv_path):
-        return pd.read_csv(csv_path)
-    return None
-
-def create_playstyle_pentagon(df: pd.DataFrame) -> go.Figure:
-    """Creates a custom Plotly pentagon chart based on the Dota 2 in-game UI."""
-    
-    # 1. Define the five categories in the correct order
-    categories = ['FIGHTING', 'FARMING', 'SUPPORTING', 'PUSHING', 'VERSATILITY']
-    
-    # 2. Calculate average scores from the data
+
+from typing import Dict
+
+from modules.common import config_manager, dataset_store
+from modules.process import playstyle_aggregates
+from modules import sync
+from ui import job_status, paged_table
+
+WINDOW_LABELS = {
+    playstyle_aggregates.ALL_TIME: "All matches",
+    "last_10": "Last 10 matches",
+    "last_20": "Last 20 matches",
+    "last_50": "Last 50 matches",
+    playstyle_aggregates.LAST_30_DAYS: "Last 30 days",
+}
+
+@st.cache_data(max_entries=32)
+def load_aggregates(profile_name: str, versions: tuple) -> pd.DataFrame | None:
+    """
+    Loads the precomputed per-hero, per-window averages. `versions` (playstyle and
+    aggregates dataset versions) only keys the cache.
+    """
+    aggregates = playstyle_aggregates.read(profile_name)
+    if aggregates is None:
+        # Processed before the aggregates existed; they are written with the next refresh
+        df = dataset_store.read_dataset(profile_name, dataset_store.PLAYSTYLE_STATS)
+        if df is None or df.empty:
+            return None
+        aggregates = playstyle_aggregates.build(df)
+    return aggregates
+
+def _normalize(averages: Dict[str, float]) -> list:
+    """Scales the averages of one selection to the 0-1 pentagon axes."""
+    # 1. Pick the averages the pentagon is built from
     avg_scores = {
-        'FIGHTING': df['FightScore'].mean(),
-        'FARMING': df['FarmScore'].mean(),
-        'PUSHING': df['PushScore'].mean(),
-        'VERSATILITY': df['Versatility'].mean(),
-        'ASSISTS': df['Assists'].mean(),
-        'HEALS': df['Heals'].mean()
+        'FIGHTING': averages['FightScore'],
+        'FARMING': averages['FarmScore'],
+        'PUSHING': averages['PushScore'],
+        'VERSATILITY': averages['Versatility'],
+        'ASSISTS': averages['Assists'],
+        'HEALS': averages['Heals']
     }
 
-    # 3. Create a composite "SUPPORTING" score
+    # 2. Create a composite "SUPPORTING" score
     # We normalize assists and heals against reasonable maximums and average them.
     norm_assists = min(avg_scores['ASSISTS'] / 30, 1.0) # Cap at 30 assists avg
     norm_heals = min(avg_scores['HEALS'] / 8000, 1.0)  # Cap at 8k healing avg
     avg_scores['SUPPORTING'] = (norm_assists + norm_heals) / 2
 
-    # 4. Normalize all scores to a 0-1 scale for plotting
+    # 3. Normalize all scores to a 0-1 scale for plotting
     # These max values are estimates and can be tweaked for better visualization.
     normalized_values = [
         min(avg_scores['FIGHTING'], 1.0),                  # Already 0-1
@@ -49,8 +60,20 @@ def create_playstyle_pentagon(df: pd.DataFrame) -> go.Figure:
         min(avg_scores['PUSHING'] / 20000, 1.0),           # Max estimated at 20k tower damage
         min(avg_scores['VERSATILITY'], 1.0)                # Versatility
     ]
+    return normalized_values
+
+def create_playstyle_pentagon(averages: Dict[str, float], baseline: Dict[str, float] | None = None) -> "go.Figure":
+    """
+    Creates a custom Plotly pentagon chart based on the Dota 2 in-game UI from
+    precomputed averages, optionally over a `baseline` (e.g. all heroes) for comparison.
+    """
+    # Plotly is the slowest import of the app; only load it when the chart is drawn
+    import plotly.graph_objects as go
     
-    # 5. Create the Plotly figure
+    # 1. Define the five categories in the correct order
+    categories = ['FIGHTING', 'FARMING', 'SUPPORTING', 'PUSHING', 'VERSATILITY']
+    
+    # 2. Create the Plotly figure
     fig = go.Figure()
 
     # Add the grey background pentagon (maximum values)
@@ -63,9 +86,19 @@ def create_playstyle_pentagon(df: pd.DataFrame) -> go.Figure:
         name='Max Range'
     ))
 
+    if baseline is not None:
+        fig.add_trace(go.Scatterpolar(
+            r=_normalize(baseline),
+            theta=categories,
+            fill='toself',
+            fillcolor='rgba(52, 152, 219, 0.25)',
+            name='All Heroes',
+            line=dict(color='rgba(52, 152, 219, 0.9)', dash='dot')
+        ))
+
     # Add the player's actual data trace
     fig.add_trace(go.Scatterpolar(
-        r=normalized_values,
+        r=_normalize(averages),
         theta=categories,
         fill='toself',
         fillcolor='rgba(230, 126, 34, 0.5)',
@@ -80,7 +113,7 @@ def create_playstyle_pentagon(df: pd.DataFrame) -> go.Figure:
             radialaxis=dict(visible=False, range=[0, 1]),
             angularaxis=dict(showline=False, tickfont=dict(size=14))
         ),
-        showlegend=False,
+        showlegend=baseline is not None,
         template='plotly_dark',
         paper_bgcolor='rgba(0,0,0,0)', # Transparent background
         plot_bgcolor='rgba(0,0,0,0)'
@@ -88,43 +121,61 @@ def create_playstyle_pentagon(df: pd.DataFrame) -> go.Figure:
 
     return fig
 
-def render():
-    """Renders the User Playstyle Statistics tab."""
-    config = config_manager.load_config()
-    active_profile_name = config.get("active_profile")
-
+def render(active_profile_name: str | None):
+    """Renders the User Playstyle Statistics tab for the profile selected in the sidebar."""
     if not active_profile_name:
         st.warning("Please select or add a profile first.")
         return
+    config = config_manager.load_config()
 
     col1, col2 = st.columns([2, 1])
     with col1:
         st.header(f"Playstyle Stats for: `{active_profile_name}`")
-        st.caption("Based on your last 50 games(ranked + unranked + turbo).")
+        st.caption("Based on every archived game (ranked + unranked + turbo). Steam only shows your last 50, so each refresh adds the new ones to your history.")
     with col2:
         if st.button("🔄 Refresh Playstyle Stats"):
-            # ... (button logic is unchanged) ...
             try:
-                active_profile = config_manager.get_active_profile(config)
-                with st.spinner("Fetching and processing playstyle stats..."):
-                    session = session_manager.create_session(active_profile)
-                    download_playstyle.fetch(session, active_profile)
-                    process_playstyle.process(active_profile['profile_name'])
-                st.cache_data.clear()
-                st.success("Playstyle stats refreshed successfully!")
-                st.rerun()
+                job_status.start_sync(config, [sync.PLAYSTYLE])
             except Exception as e:
                 st.error(f"An error occurred: {e}")
 
-    df = load_playstyle_data(active_profile_name)
-    if df is not None and not df.empty:
+    job_status.render(active_profile_name, sync.PLAYSTYLE)
+
+    versions = (dataset_store.get_dataset_version(active_profile_name, dataset_store.PLAYSTYLE_STATS),
+                dataset_store.get_dataset_version(active_profile_name, dataset_store.PLAYSTYLE_AGGREGATES))
+    aggregates = load_aggregates(active_profile_name, versions)
+    if aggregates is not None:
         st.markdown("### Playstyle Pentagon")
-        
-        # --- NEW: Call the function to create the custom chart ---
-        pentagon_fig = create_playstyle_pentagon(df)
-        st.plotly_chart(pentagon_fig, use_container_width=True)
+        c1, c2 = st.columns(2)
+        window = c1.selectbox("Window", list(WINDOW_LABELS), format_func=WINDOW_LABELS.get, key="playstyle_window")
+        hero_stats = playstyle_aggregates.hero_table(aggregates, window)
+        hero = c2.selectbox("Hero", [playstyle_aggregates.ALL_HEROES] + hero_stats['Hero'].tolist(), key="playstyle_hero")
+
+        # Every average comes precomputed from the aggregates; nothing here scans the match history
+        averages = playstyle_aggregates.means(aggregates, window, hero)
+        if averages is None:
+            st.info(f"No matches with {hero} in this window.")
+        else:
+            baseline = playstyle_aggregates.means(aggregates, window) if hero != playstyle_aggregates.ALL_HEROES else None
+            pentagon_fig = create_playstyle_pentagon(averages, baseline)
+            st.plotly_chart(pentagon_fig, use_container_width=True)
+            st.caption(f"Averages over {averages['Matches']} match(es).")
+
+        st.markdown("### Hero Comparison")
+        st.dataframe(hero_stats.round(2), hide_index=True)
 
         st.markdown("### Full Match History")
-        st.dataframe(df)
+        paged_table.render(active_profile_name, dataset_store.PLAYSTYLE_STATS, key="playstyle_history")
+
+        st.markdown("### Match Lookup")
+        match_id = st.number_input("MatchID", min_value=0, step=1, value=0, format="%d")
+        if match_id:
+            from modules.common import analytics_store
+            found = analytics_store.get_match(active_profile_name, int(match_id))
+            if not found:
+                st.info(f"Match {match_id} is not in your conduct summaries or playstyle history.")
+            for dataset, row in found.items():
+                st.markdown(f"**{dataset.replace('_', ' ').title()}**")
+                st.dataframe(pd.DataFrame([row]), hide_index=True)
     else:
         st.info("No playstyle stats found. Click 'Refresh Playstyle Stats' to download them.")
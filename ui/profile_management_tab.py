@@ -3,9 +3,11 @@
 import streamlit as st
 import os
 from modules.common import config_manager, path_manager
+from modules import sync
+from ui import job_status
 
-def render():
-    """Renders the profile management tab."""
+def render(active_profile_name: str | None):
+    """Renders the profile management tab, with the profile selected in the sidebar ready to edit."""
     st.header("Manage Your Profiles")
     st.error(
         """
@@ -25,7 +27,8 @@ def render():
     profile_names = [p['profile_name'] for p in profiles]
     
     selection_options = ["-- Add New Profile --"] + profile_names
-    selected_profile_to_edit = st.selectbox("Select or add a profile", options=selection_options)
+    selected_profile_to_edit = st.selectbox("Select or add a profile", options=selection_options,
+                                            index=selection_options.index(active_profile_name) if active_profile_name in profile_names else 0)
     st.markdown("---")
     
     current_data = {"profile_name": "", "custom_url": "", "cookies": {"sessionid": "", "steamLoginSecure": "", "browserid": "", "steamCountry": "", "steamparental": ""}}
@@ -91,10 +94,32 @@ def render():
         st.warning(f"⚠️ This is permanent and will delete all data in 'data/{selected_profile_to_edit}'.")
         if st.checkbox(f"I want to permanently delete '{selected_profile_to_edit}'"):
             if st.button("❌ Delete Profile Permanently"):
+                from modules.common import analytics_store, session_manager
                 path_manager.delete_profile_data_dir(selected_profile_to_edit)
+                analytics_store.delete_profile(selected_profile_to_edit)
+                session_manager.discard_session(selected_profile_to_edit)
                 config['profiles'] = [p for p in profiles if p['profile_name'] != selected_profile_to_edit]
                 if config['active_profile'] == selected_profile_to_edit:
                     config['active_profile'] = config['profiles'][0]['profile_name'] if config['profiles'] else ""
                 config_manager.save_config(config)
                 st.success(f"Deleted profile: '{selected_profile_to_edit}'")
                 st.rerun()
+
+    if profile_names:
+        st.markdown("---")
+        st.subheader("Sync Multiple Profiles")
+        st.caption("Downloads and processes data for several accounts at once.")
+        profiles_to_sync = st.multiselect("Profiles to sync", options=profile_names, default=profile_names)
+        datasets_to_sync = st.multiselect(
+            "Datasets", options=sync.ALL_DATASETS, default=sync.ALL_DATASETS,
+            format_func=lambda d: d.capitalize()
+        )
+        if st.button("🔁 Sync Selected Profiles", disabled=not (profiles_to_sync and datasets_to_sync)):
+            # Each profile gets its own background job; this page keeps updating while they run
+            for name in profiles_to_sync:
+                try:
+                    job_status.start_sync(config, datasets_to_sync, profile_name=name)
+                except ValueError as e:
+                    st.error(str(e))
+
+        job_status.render_all()
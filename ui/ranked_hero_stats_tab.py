@@ -2,30 +2,22 @@
 
 import streamlit as st
 import pandas as pd
-import os
 
-from modules.common import config_manager, path_manager, session_manager
-from modules.download import ranked_hero_stats as download_ranked
-from modules.process import ranked_hero_stats as process_ranked
+from modules.common import config_manager, dataset_store
+from modules import sync
+from ui import job_status
 
-@st.cache_data
-def load_ranked_data(profile_name: str) -> pd.DataFrame | None:
-    """Loads the processed ranked hero stats CSV."""
-    if not profile_name:
-        return None
-    csv_path = path_manager.get_processed_ranked_stats_path(profile_name)
-    if os.path.exists(csv_path):
-        return pd.read_csv(csv_path)
-    return None
-
-def render():
-    """Renders the Ranked Hero Statistics tab."""
-    config = config_manager.load_config()
-    active_profile_name = config.get("active_profile")
+@st.cache_data(max_entries=32)
+def load_ranked_data(profile_name: str, version: tuple | None) -> pd.DataFrame | None:
+    """Loads the processed ranked hero stats, cached per dataset version."""
+    return dataset_store.read_dataset(profile_name, dataset_store.RANKED_HERO_STATS)
 
+def render(active_profile_name: str | None):
+    """Renders the Ranked Hero Statistics tab for the profile selected in the sidebar."""
     if not active_profile_name:
         st.warning("Please select or add a profile in the 'Profile Management' tab first.")
         return
+    config = config_manager.load_config()
 
     col1, col2 = st.columns([2, 1])
     with col1:
@@ -33,22 +25,13 @@ def render():
     with col2:
         if st.button("🔄 Refresh Hero Stats"):
             try:
-                active_profile = config_manager.get_active_profile(config)
-                with st.spinner("Fetching and processing hero stats..."):
-                    # Step 1: Download
-                    session = session_manager.create_session(active_profile)
-                    download_ranked.fetch(session, active_profile)
-                    
-                    # Step 2: Process
-                    process_ranked.process(active_profile['profile_name'])
-                
-                st.cache_data.clear()
-                st.success("Hero stats refreshed successfully!")
-                st.rerun()
+                job_status.start_sync(config, [sync.RANKED])
             except Exception as e:
                 st.error(f"An error occurred: {e}")
 
-    df = load_ranked_data(active_profile_name)
+    job_status.render(active_profile_name, sync.RANKED)
+
+    df = load_ranked_data(active_profile_name, dataset_store.get_dataset_version(active_profile_name, dataset_store.RANKED_HERO_STATS))
     if df is not None and not df.empty:
         st.markdown("### Hero Performance Overview")
         